@@ -0,0 +1,912 @@
+""" Two functions is implemented:
+        for eliminating unreachable states of a deterministic finite state machine
+        for reducing a deterministic finite state machine
+    Language operations are implemented: intersection, union, difference (product constructions),
+    complement and the equivalence check with a shortest counterexample.
+"""
+
+import random
+from array import array
+from bisect import bisect_right
+from collections import deque
+
+from . import instrumentation
+from .charClasses import MAX_CODE, CharClass, split_labels
+
+# NumPy is imported on the first use by _get_numpy (it takes most of the time of import of the package),
+# False means that it is not imported yet
+_numpy = False
+
+
+def _get_numpy():
+    """ The function returns the module numpy or None if NumPy is not available """
+    global _numpy
+    if _numpy is False:
+        try:
+            import numpy
+        except ImportError:
+            numpy = None
+        _numpy = numpy
+    return _numpy
+
+
+class DFSM:
+    """ Class representing deterministic finite state machine.
+        Constructor parameters are
+            1.alphabet: list -- list of symbols of the alphabet.
+                A symbol is a character (str) or the CharClass, any character of which is the symbol.
+                Symbols are disjoint: a character is the symbol itself or belongs to at most one class.
+            2.number_states: int -- the number of states of the DFSM
+            3.transitions_between_states: list -- adjacency list of state transition.
+                transitions_between_states[i] -- list of possible transitions from state i.
+                    List items are tuples containing two items (s,a).
+                    s -- number of the state to which it is possible to go from state i.
+                    a -- the alphabet symbol corresponding to the transition from state i to state s.
+            4.initial_state: int -- number of the initial state of the DFSM.
+            5.acceptable_states: list -- list of acceptable states.
+        States are numbered starting at 0  and ending with number_states - 1
+    """
+
+    def __init__(self, alphabet: list, number_states: int, transitions_between_states: list,
+                 initial_state: int, acceptable_states: list):
+        self.alphabet = alphabet
+        self.number_states = number_states
+        self.transitions_between_states = transitions_between_states
+        self.initial_state = initial_state
+        self.acceptable_states = acceptable_states
+
+    def _transition(self, state: int, char: str) -> int:
+        for (s, c) in self.transitions_between_states[state]:
+            if c == char:
+                return s
+        for (s, c) in self.transitions_between_states[state]:
+            if isinstance(c, CharClass) and char in c:
+                return s
+        return -1
+
+    def accept(self, expr: str) -> bool:
+        """ The function distinguishes acceptable and non-acceptable input strings
+            :param expr: str -- input string
+            :return: acceptable and non-acceptable input strings
+        """
+        stats = instrumentation.active
+        if stats is not None:
+            expr = stats.count_steps('dfsm', expr)
+        state = self.initial_state
+        for char in expr:
+            state = self._transition(state, char)
+            if state == -1:
+                return False
+        return self.acceptable_states.__contains__(state)
+
+    def accept_many(self, strings: list):
+        """ The function distinguishes acceptable and non-acceptable input strings of the batch
+            (see CompiledDFSM.accept_many).
+            :param strings: list -- input strings
+            :return: acceptable and non-acceptable input strings
+        """
+        return self.compile().accept_many(strings)
+
+    def compile(self, compress_alphabet: bool = True):
+        """ The function returns the compiled representation of the DFSM with the dense transition table.
+            The compiled DFSM does not change when the DFSM is changed.
+            :param compress_alphabet: bool -- if True, equivalent symbols share one column of the table
+                (see get_symbol_classes)
+            :return: CompiledDFSM -- compiled deterministic finite state machine
+        """
+        return CompiledDFSM.from_dfsm(self, compress_alphabet)
+
+    def eliminate_unreachable_states(self):
+        """ The function eliminate unreachable states of
+            the deterministic finite state machine
+        """
+
+        used = [False] * self.number_states
+
+        q = deque()
+        q.append(self.initial_state)
+        used[self.initial_state] = True
+
+        while q:
+            state = q.popleft()
+            for (s, c) in self.transitions_between_states[state]:
+                if not used[s]:
+                    used[s] = True
+                    q.append(s)
+
+        # The dictionary contains pairs:
+        # the old number of state, not including unreachable states and
+        # the new number of state in the resulting DFSM
+        new_state_numbers = {}
+        # new_state_numbers is being filled (renumbering of states of DFSM)
+        new_number = 0
+        for s in range(self.number_states):
+            if used[s]:
+                new_state_numbers[s] = new_number
+                new_number += 1
+
+        new_transitions_between_states = []
+        for i in range(new_number):
+            new_transitions_between_states.append([])
+        for s in range(self.number_states):
+            if used[s]:
+                for (state, char) in self.transitions_between_states[s]:
+                    if used[state]:
+                        new_transitions_between_states[new_state_numbers[s]].append((new_state_numbers[state], char))
+        self.transitions_between_states = new_transitions_between_states
+
+        self.number_states = new_number
+
+        self.initial_state = new_state_numbers[self.initial_state]
+
+        new_acceptable_states = []
+        for s in self.acceptable_states:
+            if used[s]:
+                new_acceptable_states.append(new_state_numbers[s])
+        self.acceptable_states = new_acceptable_states
+
+    def intersection(self, other):
+        """ The function returns the DFSM accepting exactly words accepted by both DFSMs.
+            The product construction creates only pairs of states reachable from the pair of initial states.
+            :param other: DFSM -- the second deterministic finite state machine
+            :return: DFSM -- the product deterministic finite state machine
+        """
+        return self._product(other, lambda fst, snd: fst and snd, True, True)
+
+    def union(self, other):
+        """ The function returns the DFSM accepting exactly words accepted by any of the DFSMs
+            (the product construction, see intersection)
+            :param other: DFSM -- the second deterministic finite state machine
+            :return: DFSM -- the product deterministic finite state machine
+        """
+        return self._product(other, lambda fst, snd: fst or snd, False, False)
+
+    def difference(self, other):
+        """ The function returns the DFSM accepting exactly words accepted by the DFSM and not accepted
+            by the DFSM 'other' (the product construction, see intersection)
+            :param other: DFSM -- the second deterministic finite state machine
+            :return: DFSM -- the product deterministic finite state machine
+        """
+        return self._product(other, lambda fst, snd: fst and not snd, True, False)
+
+    def complement(self, alphabet: list = None):
+        """ The function returns the DFSM accepting exactly words over the symbols, which are not accepted
+            by the DFSM. Missing transitions are replaced by transitions to the explicit dead state.
+            :param alphabet: list -- additional symbols of the alphabet (disjoint with the symbols of the DFSM)
+            :return: DFSM -- the complement deterministic finite state machine
+        """
+        symbols = self._get_symbols()
+        if alphabet is not None:
+            known_symbols = set(symbols)
+            symbols.extend(c for c in alphabet if c not in known_symbols)
+        dead_state = self.number_states
+
+        transitions_between_states = []
+        for s in range(self.number_states):
+            transitions = list(self.transitions_between_states[s])
+            present = set(char for (state, char) in transitions)
+            transitions.extend((dead_state, c) for c in symbols if c not in present)
+            transitions_between_states.append(transitions)
+        transitions_between_states.append([(dead_state, c) for c in symbols])
+
+        acceptable_set = set(self.acceptable_states)
+        acceptable_states = [s for s in range(self.number_states + 1) if s not in acceptable_set]
+        return DFSM(symbols, self.number_states + 1, transitions_between_states,
+                    self.initial_state, acceptable_states)
+
+    def is_equivalent(self, other) -> bool:
+        """ The function checks whether the DFSMs accept the same words (see find_counterexample)
+            :param other: DFSM -- the second deterministic finite state machine
+        """
+        return self.find_counterexample(other) is None
+
+    def find_counterexample(self, other):
+        """ The function checks equivalence of the DFSMs by the Hopcroft-Karp algorithm: pairs of states
+            reachable from the pair of initial states are merged by union-find, so the check takes
+            near-linear time and the DFSMs are not reduced. The check stops at the first pair
+            of states, one of which is acceptable and the other one is not.
+            If the DFSMs are not equivalent, the shortest word accepted by exactly one of them
+            is found by breadth-first search over pairs of states.
+            :param other: DFSM -- the second deterministic finite state machine
+            :return: str -- the shortest word accepted by exactly one of the DFSMs or None if they are equivalent
+        """
+        symbols, fst_table, snd_table = _get_product_tables(self, other)
+        fst_acceptable = set(self.acceptable_states)
+        snd_acceptable = set(other.acceptable_states)
+        # Elements of union-find are states of both DFSMs with their dead states (the last state of every DFSM).
+        # The elements of the DFSM 'other' are numbered after the elements of the DFSM.
+        offset = self.number_states + 1
+        fst_dead_state = self.number_states
+        snd_dead_state = other.number_states
+
+        parents = list(range(offset + other.number_states + 1))
+
+        def find(state: int) -> int:
+            while parents[state] != state:
+                parents[state] = parents[parents[state]]
+                state = parents[state]
+            return state
+
+        pairs = [(self.initial_state, other.initial_state)]
+        parents[find(self.initial_state)] = find(offset + other.initial_state)
+        equivalent = True
+        while pairs and equivalent:
+            fst, snd = pairs.pop()
+            if (fst in fst_acceptable) != (snd in snd_acceptable):
+                equivalent = False
+                break
+            for symbol in symbols:
+                fst_to = fst_table[fst].get(symbol, -1) if fst != -1 else -1
+                snd_to = snd_table[snd].get(symbol, -1) if snd != -1 else -1
+                fst_root = find(fst_to if fst_to != -1 else fst_dead_state)
+                snd_root = find(offset + (snd_to if snd_to != -1 else snd_dead_state))
+                if fst_root != snd_root:
+                    parents[fst_root] = snd_root
+                    pairs.append((fst_to, snd_to))
+        if equivalent:
+            return None
+
+        # the dictionary contains pairs: the pair of states and the pair (the previous pair, the symbol)
+        previous = {(self.initial_state, other.initial_state): None}
+        q = deque()
+        q.append((self.initial_state, other.initial_state))
+        while q:
+            pair = q.popleft()
+            fst, snd = pair
+            if (fst in fst_acceptable) != (snd in snd_acceptable):
+                word = []
+                while previous[pair] is not None:
+                    pair, symbol = previous[pair]
+                    word.append(chr(symbol.ranges[0][0]) if isinstance(symbol, CharClass) else symbol)
+                return ''.join(reversed(word))
+            for symbol in symbols:
+                fst_to = fst_table[fst].get(symbol, -1) if fst != -1 else -1
+                snd_to = snd_table[snd].get(symbol, -1) if snd != -1 else -1
+                if (fst_to, snd_to) not in previous:
+                    previous[(fst_to, snd_to)] = (pair, symbol)
+                    q.append((fst_to, snd_to))
+        return None
+
+    def _product(self, other, operation, need_fst: bool, need_snd: bool):
+        """ The function returns the product DFSM, whose states are reachable pairs of states of the DFSMs.
+            The pair is acceptable if operation(acceptable in the first DFSM, acceptable in the second DFSM).
+            -1 is the dead state of a DFSM, a pair is not created if it can not lead to an acceptable pair:
+            both states are dead, the state of the first DFSM is dead and need_fst is True
+            or the state of the second DFSM is dead and need_snd is True.
+        """
+        symbols, fst_table, snd_table = _get_product_tables(self, other)
+        fst_acceptable = set(self.acceptable_states)
+        snd_acceptable = set(other.acceptable_states)
+
+        initial_pair = (self.initial_state, other.initial_state)
+        # The dictionary contains pairs: the pair of states and the number of state in the resulting DFSM
+        numbers = {initial_pair: 0}
+        pairs = [initial_pair]
+        transitions_between_states = [[]]
+
+        q = deque()
+        q.append(initial_pair)
+        while q:
+            pair = q.popleft()
+            fst, snd = pair
+            for symbol in symbols:
+                fst_to = fst_table[fst].get(symbol, -1) if fst != -1 else -1
+                snd_to = snd_table[snd].get(symbol, -1) if snd != -1 else -1
+                if (fst_to == -1 and (need_fst or snd_to == -1)) or (snd_to == -1 and need_snd):
+                    continue
+                to_state = numbers.get((fst_to, snd_to))
+                if to_state is None:
+                    to_state = len(pairs)
+                    numbers[(fst_to, snd_to)] = to_state
+                    pairs.append((fst_to, snd_to))
+                    transitions_between_states.append([])
+                    q.append((fst_to, snd_to))
+                transitions_between_states[numbers[pair]].append((to_state, symbol))
+
+        acceptable_states = [i for i, (fst, snd) in enumerate(pairs)
+                             if operation(fst in fst_acceptable, snd in snd_acceptable)]
+        return DFSM(symbols, len(pairs), transitions_between_states, 0, acceptable_states)
+
+    def reduce_dfsm(self, classes: list = None, cross_check: bool = False) -> list:
+        """ The function reduce a deterministic finite state machine
+            by Hopcroft's partition refinement algorithm in O(n log n) time.
+            :param classes: list -- initial splitting of the set of states (list of lists of states),
+                by default it is the class of acceptable states and the class of not acceptable states
+            :param cross_check: bool -- if True, the result is verified against
+                the reference (quadratic) partition refinement algorithm
+            :return: list -- new_state_numbers[i] is the number of state i in the resulting DFSM
+        """
+        if classes is None:
+            # list of not acceptable states
+            acceptable_set = set(self.acceptable_states)
+            not_acceptable_states = [i for i in range(self.number_states) if i not in acceptable_set]
+            classes = [self.acceptable_states, not_acceptable_states]
+        classes = [list(c) for c in classes if len(c) > 0]
+
+        number_states = self.number_states
+        new_state_numbers = self._refine_classes(classes)
+        if cross_check:
+            reference_state_numbers = self._refine_classes_reference(classes)
+            if new_state_numbers != reference_state_numbers:
+                raise AssertionError("Hopcroft's algorithm and the reference algorithm split states differently: "
+                                     + str(new_state_numbers) + " and " + str(reference_state_numbers))
+
+        self._merge_states(new_state_numbers)
+        stats = instrumentation.active
+        if stats is not None:
+            stats.add('reduce.calls')
+            stats.add('reduce.states_before', number_states)
+            stats.add('reduce.states_after', self.number_states)
+        return new_state_numbers
+
+    def _get_symbols(self) -> list:
+        """ The function returns the symbols of the alphabet and all symbols used by transitions """
+        symbols = list(self.alphabet)
+        known_symbols = set(symbols)
+        for transitions in self.transitions_between_states:
+            for (s, c) in transitions:
+                if c not in known_symbols:
+                    known_symbols.add(c)
+                    symbols.append(c)
+        return symbols
+
+    def get_symbol_classes(self) -> tuple:
+        """ The function splits the symbols into classes of equivalent symbols:
+            symbols are equivalent if every state goes to the same state with them
+            (or has no transition with any of them).
+            Classes are refined state by state in O(number_states * number_symbols) time.
+            :return: tuple (list, list) -- symbols (see _get_symbols) and the list,
+                whose i-th item is the number of the class of the i-th symbol,
+                classes are numbered in order of the first symbol belonging to them
+        """
+        symbols = self._get_symbols()
+        symbol_numbers = {c: i for i, c in enumerate(symbols)}
+        symbol_classes = [0] * len(symbols)
+        for s in range(self.number_states):
+            targets = [-1] * len(symbols)
+            for (state, char) in self.transitions_between_states[s]:
+                targets[symbol_numbers[char]] = state
+            # the dictionary contains pairs: (the old class, the target state) and the new class
+            new_classes = {}
+            symbol_classes = [new_classes.setdefault((symbol_classes[a], targets[a]), len(new_classes))
+                              for a in range(len(symbols))]
+        return symbols, symbol_classes
+
+    def _refine_classes(self, classes: list) -> list:
+        """ Hopcroft's algorithm. The function returns the coarsest splitting of states refining 'classes'
+            such that equivalent states go to equivalent states with every symbol.
+            A missing transition is a transition to an extra dead state, which is never merged with other states.
+            :param classes: list -- initial splitting of the set of states (list of non-empty lists of states)
+            :return: list -- the number of class of every state,
+                classes are numbered in order of the first state belonging to them
+        """
+        symbols = self._get_symbols()
+        symbol_numbers = {c: i for i, c in enumerate(symbols)}
+        dead_state = self.number_states
+
+        # inverse_transitions[a][state] -- list of states from which it is possible to go to 'state'
+        # with the symbol number a
+        inverse_transitions = [{} for _ in symbols]
+        for s in range(self.number_states):
+            missing = [True] * len(symbols)
+            for (state, char) in self.transitions_between_states[s]:
+                a = symbol_numbers[char]
+                missing[a] = False
+                inverse_transitions[a].setdefault(state, []).append(s)
+            for a in range(len(symbols)):
+                if missing[a]:
+                    inverse_transitions[a].setdefault(dead_state, []).append(s)
+        for a in range(len(symbols)):
+            inverse_transitions[a].setdefault(dead_state, []).append(dead_state)
+
+        blocks = [set(c) for c in classes]
+        blocks.append({dead_state})
+        block_of = [0] * (self.number_states + 1)
+        for i, block in enumerate(blocks):
+            for state in block:
+                block_of[state] = i
+
+        # the pairs (block, symbol) splitting other blocks, all blocks but the largest one are enough
+        largest = max(range(len(blocks)), key=lambda i: len(blocks[i]))
+        waiting = set()
+        for i in range(len(blocks)):
+            if i != largest:
+                for a in range(len(symbols)):
+                    waiting.add((i, a))
+
+        # the number of splitters taken from the waiting set
+        rounds = 0
+        number_blocks = len(blocks)
+        while waiting:
+            rounds += 1
+            splitter, a = waiting.pop()
+            inverse = inverse_transitions[a]
+            # states going to the splitter with the symbol a grouped by their blocks
+            touched = {}
+            for state in blocks[splitter]:
+                for s in inverse.get(state, ()):
+                    touched.setdefault(block_of[s], []).append(s)
+
+            for b, states in touched.items():
+                if len(states) == len(blocks[b]):
+                    continue
+                new_block = set(states)
+                blocks[b].difference_update(new_block)
+                new_b = len(blocks)
+                blocks.append(new_block)
+                for state in new_block:
+                    block_of[state] = new_b
+                # process the smaller half: if (b, c) is waiting, both halves have to be waiting,
+                # otherwise the smaller one is enough
+                for c in range(len(symbols)):
+                    if (b, c) in waiting or len(new_block) <= len(blocks[b]):
+                        waiting.add((new_b, c))
+                    else:
+                        waiting.add((b, c))
+
+        stats = instrumentation.active
+        if stats is not None:
+            stats.add('reduce.rounds', rounds)
+            # every split adds one block
+            stats.add('reduce.splits', len(blocks) - number_blocks)
+        return self._renumber_classes(block_of[:self.number_states])
+
+    def _refine_classes_reference(self, classes: list) -> list:
+        """ The reference algorithm for checking _refine_classes (Moore's algorithm).
+            Every round splits classes by signatures of states: the class of the state and the classes
+            of the states to which it is possible to go with every symbol (-1 if there is no transition),
+            rounds are repeated until the number of classes does not change.
+            :param classes: list -- initial splitting of the set of states (list of non-empty lists of states)
+            :return: list -- the number of class of every state,
+                classes are numbered in order of the first state belonging to them
+        """
+        symbols = self._get_symbols()
+        class_numbers = [0] * self.number_states
+        for i, s in enumerate(classes):
+            for state in s:
+                class_numbers[state] = i
+        class_numbers = self._renumber_classes(class_numbers)
+        number_classes = max(class_numbers, default=-1) + 1
+
+        while True:
+            signatures = []
+            for state in range(self.number_states):
+                to_states = [self._transition(state, char) for char in symbols]
+                signatures.append((class_numbers[state],)
+                                  + tuple(class_numbers[s] if s != -1 else -1 for s in to_states))
+            class_numbers = self._renumber_classes(signatures)
+            if max(class_numbers, default=-1) + 1 == number_classes:
+                return class_numbers
+            number_classes = max(class_numbers) + 1
+
+    @staticmethod
+    def _renumber_classes(class_numbers: list) -> list:
+        """ The function renumbers classes in order of the first state belonging to them """
+        new_numbers = {}
+        for number in class_numbers:
+            if number not in new_numbers:
+                new_numbers[number] = len(new_numbers)
+        return [new_numbers[number] for number in class_numbers]
+
+    def _merge_states(self, new_state_numbers: list):
+        """ The function replaces every class of equivalent states by one state
+            :param new_state_numbers: list -- new_state_numbers[i] is the number of state i in the resulting DFSM
+        """
+        new_number = max(new_state_numbers, default=-1) + 1
+
+        new_transitions_between_states = []
+        for i in range(new_number):
+            new_transitions_between_states.append([])
+        # equivalent states have the same transitions, so the transitions of one state of the class are enough
+        merged = [False] * new_number
+        for s in range(self.number_states):
+            if not merged[new_state_numbers[s]]:
+                merged[new_state_numbers[s]] = True
+                for (state, char) in self.transitions_between_states[s]:
+                    new_transitions_between_states[new_state_numbers[s]].append((new_state_numbers[state], char))
+        self.transitions_between_states = new_transitions_between_states
+
+        self.number_states = new_number
+
+        self.initial_state = new_state_numbers[self.initial_state]
+
+        # acceptable states of a class are marked in the list indexed by new numbers of states,
+        # so duplicates are removed in O(number_states) time
+        acceptable = [False] * new_number
+        for s in self.acceptable_states:
+            acceptable[new_state_numbers[s]] = True
+        self.acceptable_states = [s for s in range(new_number) if acceptable[s]]
+
+
+class CompiledDFSM:
+    """ Class representing deterministic finite state machine with the dense transition table.
+        Constructor parameters are
+            1.symbols: list -- list of symbols of the alphabet.
+            2.number_states: int -- the number of states of the DFSM
+            3.table -- flat array of integers ('i') of size number_states * number_columns.
+                table[state * number_columns + i] is the state to which it is possible to go from 'state'
+                with the symbols of column i or DEAD_STATE if there is no such transition.
+            4.initial_state: int -- number of the initial state of the DFSM.
+            5.acceptable -- bitmap of acceptable states: acceptable[state] is 1 if 'state' is acceptable else 0.
+            6.symbol_columns: list -- symbol_columns[i] is the column of the symbol symbols[i],
+                equivalent symbols share one column. By default the symbol symbols[i] corresponds to column i.
+                Characters belonging to the CharClass symbols[i] correspond to the column of the class.
+        The table and the bitmap are read-only, so one compiled DFSM can be shared by all matchers.
+        byte_columns[b] is the column of the symbol chr(b) or -1 if it is not a symbol (the lookup for bytes).
+    """
+
+    DEAD_STATE = -1
+    # the maximal number of cells of the padded matrix of one batch of accept_many
+    BATCH_CELLS = 1 << 22
+    # batches of fewer strings are matched by accept, the loop over columns costs more for them
+    MIN_BATCH = 16
+
+    def __init__(self, symbols: list, number_states: int, table, initial_state: int, acceptable,
+                 symbol_columns: list = None):
+        self.symbols = tuple(symbols)
+        if symbol_columns is None:
+            symbol_columns = range(len(self.symbols))
+        self.symbol_columns = tuple(symbol_columns)
+        # symbol_numbers[c] is the column of the symbol c
+        self.symbol_numbers = dict(zip(self.symbols, self.symbol_columns))
+        self.number_symbols = len(self.symbols)
+        self.number_columns = max(self.symbol_columns, default=-1) + 1
+        self.number_states = number_states
+        self.table = memoryview(table).cast('B').cast('i').toreadonly()
+        self.initial_state = initial_state
+        self.acceptable = memoryview(acceptable).cast('B').toreadonly()
+        # ranges of code points of character classes sorted by the first code point:
+        # the first code points and the pairs (the last code point, the number of the column)
+        class_ranges = sorted((first, last, i) for c, i in self.symbol_numbers.items() if isinstance(c, CharClass)
+                              for (first, last) in c.ranges)
+        self._range_firsts = [first for (first, last, i) in class_ranges]
+        self._range_columns = [(last, i) for (first, last, i) in class_ranges]
+        self.byte_columns = memoryview(array('i', [self.column(chr(b)) for b in range(256)])).toreadonly()
+        # the NumPy form of the DFSM, it is built on the first call of accept_many
+        self._extended_table = None
+
+    @staticmethod
+    def from_dfsm(machine: DFSM, compress_alphabet: bool = True):
+        """ Static function that returned compiled representation of the DFSM
+            :param machine: DFSM -- deterministic finite state machine
+            :param compress_alphabet: bool -- if True, equivalent symbols share one column of the table,
+                so the table of a DFSM over a large alphabet (bytes, Unicode) is much smaller
+            :return: CompiledDFSM -- compiled deterministic finite state machine
+        """
+        if compress_alphabet:
+            symbols, symbol_columns = machine.get_symbol_classes()
+        else:
+            symbols = machine._get_symbols()
+            symbol_columns = list(range(len(symbols)))
+        symbol_numbers = dict(zip(symbols, symbol_columns))
+        number_columns = max(symbol_columns, default=-1) + 1
+
+        table = array('i', [CompiledDFSM.DEAD_STATE]) * (machine.number_states * number_columns)
+        for s in range(machine.number_states):
+            row = s * number_columns
+            for (state, char) in machine.transitions_between_states[s]:
+                table[row + symbol_numbers[char]] = state
+
+        acceptable = bytearray(machine.number_states)
+        for s in machine.acceptable_states:
+            acceptable[s] = 1
+
+        return CompiledDFSM(symbols, machine.number_states, table, machine.initial_state, acceptable, symbol_columns)
+
+    def to_dfsm(self) -> DFSM:
+        """ The function converts the compiled DFSM to the representation by the adjacency list
+            :return: DFSM -- deterministic finite state machine
+        """
+        transitions_between_states = []
+        for s in range(self.number_states):
+            row = s * self.number_columns
+            transitions_between_states.append([(self.table[row + i], c) for c, i in self.symbol_numbers.items()
+                                               if self.table[row + i] != CompiledDFSM.DEAD_STATE])
+        acceptable_states = [s for s in range(self.number_states) if self.acceptable[s]]
+        return DFSM(list(self.symbols), self.number_states, transitions_between_states,
+                    self.initial_state, acceptable_states)
+
+    def column(self, char: str) -> int:
+        """ The function returns the number of the column of the symbol 'char' or -1 if it is not a symbol.
+            A character belonging to a character class gets the column of the class.
+        """
+        i = self.symbol_numbers.get(char)
+        if i is not None:
+            return i
+        if self._range_firsts and isinstance(char, str) and len(char) == 1:
+            code = ord(char)
+            k = bisect_right(self._range_firsts, code) - 1
+            if k >= 0 and code <= self._range_columns[k][0]:
+                return self._range_columns[k][1]
+        return -1
+
+    def transition(self, state: int, char: str) -> int:
+        """ The function returns the state to which it is possible to go from 'state' with the symbol 'char'
+            or DEAD_STATE if there is no such transition
+        """
+        i = self.column(char)
+        if i == -1 or state == CompiledDFSM.DEAD_STATE:
+            return CompiledDFSM.DEAD_STATE
+        return self.table[state * self.number_columns + i]
+
+    def accept(self, expr: str) -> bool:
+        """ The function distinguishes acceptable and non-acceptable input strings
+            :param expr: str -- input string
+            :return: acceptable and non-acceptable input strings
+        """
+        stats = instrumentation.active
+        if stats is not None:
+            expr = stats.count_steps('compiled_dfsm', expr)
+        table = self.table
+        symbol_numbers = self.symbol_numbers
+        number_columns = self.number_columns
+        dead_state = CompiledDFSM.DEAD_STATE
+        state = self.initial_state
+        for char in expr:
+            i = symbol_numbers.get(char)
+            if i is None:
+                i = self.column(char)
+                if i == -1:
+                    return False
+            state = table[state * number_columns + i]
+            if state == dead_state:
+                return False
+        return self.acceptable[state] == 1
+
+    def get_final_state(self, expr: str) -> int:
+        """ The function returns the state reached by the input string
+            :param expr: str -- input string
+            :return: int -- the state or DEAD_STATE if the string leads to the dead state
+        """
+        stats = instrumentation.active
+        if stats is not None:
+            expr = stats.count_steps('compiled_dfsm', expr)
+        table = self.table
+        symbol_numbers = self.symbol_numbers
+        number_columns = self.number_columns
+        dead_state = CompiledDFSM.DEAD_STATE
+        state = self.initial_state
+        for char in expr:
+            i = symbol_numbers.get(char)
+            if i is None:
+                i = self.column(char)
+                if i == -1:
+                    return dead_state
+            state = table[state * number_columns + i]
+            if state == dead_state:
+                return dead_state
+        return state
+
+    def accept_many(self, strings: list, batch_size: int = 65536):
+        """ The function distinguishes acceptable and non-acceptable input strings of the batch
+            by their final states (see get_final_states).
+            :param strings: list -- input strings (str, or bytes matched as the symbols chr(byte))
+            :param batch_size: int -- the maximal number of strings encoded into one matrix
+            :return: numpy.ndarray of bool if NumPy is available, otherwise list of bool
+        """
+        states = self.get_final_states(strings, batch_size)
+        if _get_numpy() is None:
+            return [state != CompiledDFSM.DEAD_STATE and self.acceptable[state] == 1 for state in states]
+        # the last item of the extended bitmap is the dead state, so DEAD_STATE (-1) selects it
+        return self._get_extended_table()[2][states]
+
+    def get_final_states(self, strings: list, batch_size: int = 65536):
+        """ The function returns the states reached by the input strings of the batch.
+            If NumPy is available and all symbols are single characters or character classes, strings of similar
+            lengths are encoded into a padded matrix of symbol numbers and all of them are moved forward together,
+            one column of the matrix at a time. Otherwise every string is matched separately.
+            Symbols out of the alphabet lead to the dead state.
+            :param strings: list -- input strings (str, or bytes matched as the symbols chr(byte))
+            :param batch_size: int -- the maximal number of strings encoded into one matrix
+            :return: numpy.ndarray of int if NumPy is available, otherwise list of int --
+                the states, DEAD_STATE for strings leading to the dead state
+        """
+        if not set(map(type, strings)) <= {str}:
+            strings = [s if isinstance(s, str) else bytes(s).decode('latin-1') for s in strings]
+        numpy = _get_numpy()
+        if numpy is None:
+            return [self.get_final_state(s) for s in strings]
+        if any(isinstance(c, str) and len(c) != 1 for c in self.symbols):
+            return numpy.fromiter((self.get_final_state(s) for s in strings), dtype=numpy.intp, count=len(strings))
+
+        # strings are grouped by the bit length of their lengths, so the padding of a group is less than
+        # its total length, and a batch of a group has at most BATCH_CELLS cells, so one long string
+        # does not set the width of the matrix for all strings
+        lengths = numpy.fromiter(map(len, strings), dtype=numpy.intp, count=len(strings))
+        groups = numpy.frexp(lengths)[1]
+        order = numpy.argsort(groups, kind='stable')
+        bounds = numpy.flatnonzero(numpy.diff(groups[order])) + 1
+        result = numpy.empty(len(strings), dtype=numpy.intp)
+        for group in numpy.split(order, bounds):
+            if len(group) == 0:
+                continue
+            rows = min(batch_size, max(self.BATCH_CELLS >> int(groups[group[0]]), 1))
+            for start in range(0, len(group), rows):
+                indexes = group[start:start + rows]
+                if len(indexes) < self.MIN_BATCH:
+                    result[indexes] = [self.get_final_state(strings[i]) for i in indexes]
+                else:
+                    result[indexes] = self._get_final_states_batch([strings[i] for i in indexes])
+        return result
+
+    def _get_extended_table(self) -> tuple:
+        """ The function returns the NumPy form of the DFSM used by get_final_states: (columns, table, acceptable).
+            columns -- columns[code] is the number of the column of the symbol with the code point 'code',
+                the last item is used for all code points greater than the code points of the symbols
+                and the finite ends of ranges of character classes.
+            table -- flat form of the matrix of size (number_states + 1) x (number_columns + 2),
+                the last row is the dead state, the column number_columns is used for symbols out of the alphabet
+                (it leads to the dead state), the last column is used for padding (it leads to the same state).
+                A state is stored as the offset of its row, state * (number_columns + 2).
+            acceptable -- acceptable[state] is True if 'state' is acceptable, the dead state is not acceptable.
+        """
+        if self._extended_table is None:
+            numpy = _get_numpy()
+            width = self.number_columns + 2
+            dead_state = self.number_states
+            table = numpy.full((self.number_states + 1, width), dead_state, dtype=numpy.intp)
+            if self.number_columns > 0:
+                dense = numpy.frombuffer(self.table, dtype=numpy.int32).reshape(self.number_states,
+                                                                                self.number_columns)
+                table[:-1, :-2] = numpy.where(dense == CompiledDFSM.DEAD_STATE, dead_state, dense)
+            table[:, -1] = numpy.arange(self.number_states + 1)
+
+            codes = [ord(c) for c in self.symbols if isinstance(c, str)]
+            limit = max(codes + self._range_firsts
+                        + [last for (last, i) in self._range_columns if last < MAX_CODE], default=-1)
+            columns = numpy.full(limit + 2, self.number_columns, dtype=numpy.intp)
+            for first, (last, i) in zip(self._range_firsts, self._range_columns):
+                columns[first:min(last, limit + 1) + 1] = i
+            columns[codes] = [self.symbol_numbers[c] for c in self.symbols if isinstance(c, str)]
+
+            acceptable = numpy.zeros(self.number_states + 1, dtype=bool)
+            acceptable[:-1] = numpy.frombuffer(self.acceptable, dtype=numpy.uint8) == 1
+            self._extended_table = (columns, (table * width).ravel(), acceptable)
+        return self._extended_table
+
+    def _get_final_states_batch(self, strings: list):
+        """ The function returns the states reached by the batch of strings by the NumPy form of the DFSM.
+            Strings are sorted by length in descending order, so at every position
+            only the prefix of the batch consisting of strings not shorter than the position is moved forward.
+        """
+        numpy = _get_numpy()
+        columns, table, _ = self._get_extended_table()
+        width = self.number_columns + 2
+        lengths = numpy.fromiter(map(len, strings), dtype=numpy.intp, count=len(strings))
+        order = numpy.argsort(-lengths, kind='stable')
+        lengths = lengths[order]
+        max_length = int(lengths[0]) if len(strings) > 0 else 0
+
+        states = numpy.full(len(strings), self.initial_state * width, dtype=numpy.intp)
+        if max_length > 0:
+            # padded matrix of code points, one string per column
+            chars = numpy.array(strings, dtype='<U' + str(max_length))[order].view(numpy.uint32)
+            chars = chars.reshape(len(strings), max_length).T
+            # code points are replaced by numbers of columns of the table
+            symbols = columns[numpy.minimum(chars, len(columns) - 1)]
+            # active[j] -- the number of strings longer than j
+            active = numpy.searchsorted(-lengths, -numpy.arange(max_length), side='left')
+
+            for j in range(max_length):
+                n = active[j]
+                states[:n] = table[states[:n] + symbols[j, :n]]
+
+        states //= width
+        states[states == self.number_states] = CompiledDFSM.DEAD_STATE
+        result = numpy.empty(len(strings), dtype=numpy.intp)
+        result[order] = states
+        return result
+
+
+def _get_product_tables(fst: DFSM, snd: DFSM) -> tuple:
+    """ The function splits the symbols of both DFSMs into disjoint pieces (see charClasses.split_labels)
+        and returns the pieces and the transitions of the DFSMs by pieces:
+        table[state] -- dict, mapping a piece to the state to which it is possible to go from 'state'.
+    """
+    fst_symbols = fst._get_symbols()
+    snd_symbols = snd._get_symbols()
+    pieces = split_labels(fst_symbols + snd_symbols)
+    symbols = list(dict.fromkeys(piece for c in fst_symbols + snd_symbols for piece in pieces[c]))
+
+    tables = []
+    for machine in (fst, snd):
+        table = []
+        for s in range(machine.number_states):
+            transitions = {}
+            for (state, char) in machine.transitions_between_states[s]:
+                for piece in pieces[char]:
+                    transitions[piece] = state
+            table.append(transitions)
+        tables.append(table)
+    return symbols, tables[0], tables[1]
+
+
+def get_random_dfsm(number_states: int, alphabet: list, rng: random.Random,
+                    transition_probability: float = 0.9, acceptable_probability: float = 0.3) -> DFSM:
+    """ The function generates a random deterministic finite state machine with the initial state 0.
+        :param number_states: int -- the number of states
+        :param alphabet: list -- list of symbols of the alphabet
+        :param rng: random.Random -- the source of random numbers
+        :param transition_probability: float -- the probability of a transition from a state with a symbol
+        :param acceptable_probability: float -- the probability of a state to be acceptable
+        :return: DFSM -- random deterministic finite state machine
+    """
+    transitions_between_states = []
+    for s in range(number_states):
+        transitions_between_states.append([(rng.randrange(number_states), c) for c in alphabet
+                                           if rng.random() < transition_probability])
+    acceptable_states = [s for s in range(number_states) if rng.random() < acceptable_probability]
+    return DFSM(list(alphabet), number_states, transitions_between_states, 0, acceptable_states)
+
+
+def cross_check_reduce_dfsm(number_tests: int = 500, max_states: int = 30, alphabet: list = None, seed: int = 0):
+    """ The function verifies reduce_dfsm against the reference algorithm on random DFSMs:
+        dense and sparse random DFSMs and DFSMs built by the subset construction of random regular expressions
+        (they have many states without transitions by some symbols).
+        AssertionError is raised on the first DFSM, for which the results are different.
+        :param number_tests: int -- the number of random DFSMs of every kind
+        :param max_states: int -- the maximal number of states of a random DFSM
+        :param alphabet: list -- list of symbols of the alphabet, by default ['a', 'b', 'c']
+        :param seed: int -- seed of the random number generator
+    """
+    from .EilenbergMachine import EilenbergMachine
+    from .benchmarks import get_random_reg_expr
+    from .determinization import determinize
+
+    if alphabet is None:
+        alphabet = ['a', 'b', 'c']
+    rng = random.Random(seed)
+    for i in range(number_tests):
+        for transition_probability in (0.9, 0.4):
+            machine = get_random_dfsm(rng.randint(1, max_states), alphabet, rng, transition_probability)
+            machine.reduce_dfsm(cross_check=True)
+        reg_expr = get_random_reg_expr(rng.randint(1, 12), alphabet, rng, star_probability=0.4)
+        determinize(EilenbergMachine.get_Eilenberg_machine(reg_expr)).reduce_dfsm(cross_check=True)
+
+
+if __name__ == '__main__':
+    """ 
+        Testing class DFSM
+    """
+
+    machine = DFSM(['a', 'b', 'c'], 5, [[(1, 'a'), (3, 'b')], [(4, 'c')], [(1, 'b')], [(4, 'c')], []], 0, [4])
+
+    machine.eliminate_unreachable_states()
+
+    print(machine.number_states)
+    print(machine.transitions_between_states)
+    print(machine.initial_state)
+    print(machine.acceptable_states)
+
+    print("=======================")
+    machine.reduce_dfsm()
+    print(machine.number_states)
+    print(machine.transitions_between_states)
+    print(machine.initial_state)
+    print(machine.acceptable_states)
+
+    cross_check_reduce_dfsm()
+
+    # the DFSM of (b*|c.a*).c: states 2 and 4 are not equivalent, 4 goes to the acceptable state 3 with 'c'
+    machine = DFSM(['b', 'c', 'a'], 5,
+                   [[(1, 'b'), (2, 'c')], [(1, 'b'), (3, 'c')], [(4, 'a')], [], [(4, 'a'), (3, 'c')]], 0, [3])
+    print(machine.reduce_dfsm(cross_check=True))  # [0, 1, 2, 3, 4]
+
+    # all bytes but digits are equivalent symbols, they share one column of the compiled DFSM
+    alphabet = [chr(b) for b in range(256)]
+    machine = DFSM(alphabet, 2, [[(1, c) for c in '0123456789'], [(1, c) for c in alphabet]], 0, [1])
+    compiled_machine = machine.compile()
+    print(compiled_machine.number_symbols, compiled_machine.number_columns)  # 256 2
+    print(compiled_machine.accept("7 bytes"), compiled_machine.accept("bytes 7"))  # True False
+
+    # strings of mixed lengths: the long string is matched separately and does not widen the matrix of short ones
+    strings = ["7", "x7", "", "12 bytes"] * 1000 + ["9" * 100000]
+    results = compiled_machine.accept_many(strings)
+    print(list(results) == [compiled_machine.accept(s) for s in strings], int(sum(results)))  # True 2001
+
+    # (a|b)*.c and the DFSM accepting the same words without 'b' after 'a'
+    fst_machine = DFSM(['a', 'b', 'c'], 2, [[(0, 'a'), (0, 'b'), (1, 'c')], []], 0, [1])
+    snd_machine = DFSM(['a', 'b', 'c'], 3, [[(1, 'a'), (0, 'b'), (2, 'c')], [(1, 'a'), (2, 'c')], []], 0, [2])
+    print(fst_machine.find_counterexample(snd_machine))  # abc
+    print(fst_machine.difference(snd_machine).accept("abc"), snd_machine.is_equivalent(snd_machine))  # True True
+    print(fst_machine.complement().accept("ca"), fst_machine.complement().accept("bc"))  # True False
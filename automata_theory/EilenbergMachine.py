@@ -0,0 +1,567 @@
+""" Developed the function that constructs an Eilenberg machine accepting exactly words corresponding
+    to the input regular expression
+"""
+from . import instrumentation
+from .charClasses import CharClass, get_atom_label
+
+
+class EilenbergMachine:
+    """ Class representing Eilenberg machine.
+        Constructor parameters are
+            1.number_states: int -- the number of states of the Eilenberg machine
+            2.transitions_between_states: list -- adjacency list of state transition.
+                transitions_between_states[i] -- list of possible transitions from state i.
+                    List items are tuples containing two items (s,a).
+                    s -- number of the state to which it is possible to go from state i.
+                    a -- the alphabet symbol corresponding to the transition from state i to state s
+                        or the CharClass, any character of which corresponds to the transition.
+            3.initial_states: list -- list of initial states.
+            4.acceptable_states: list -- list of acceptable states.
+        States are numbered starting at 0  and ending with number_states-1
+    """
+
+    def __init__(self, number_states: int, transitions_between_states: list,
+                 initial_states: list, acceptable_states: list):
+        self.number_states = number_states
+        self.transitions_between_states = transitions_between_states
+        self.initial_states = initial_states
+        self.acceptable_states = acceptable_states
+        self._symbol_index = None
+        self._class_index = None
+        self._acceptable_set = None
+        self._inverse_index = None
+        # transitions to acceptable states, triples (s, state, a), kept by the builders (see _get_accepting_edges)
+        self._accepting_edges = None
+
+    def accept(self, expr: str) -> bool:
+        """ The function distinguishes acceptable and non-acceptable input strings.
+            The set of active states is moved forward one symbol at a time,
+            so the running time is O(len(expr) * number_states).
+            :param expr: str -- input string
+            :return: acceptable and non-acceptable input strings
+        """
+        stats = instrumentation.active
+        if stats is not None:
+            return self._accept_instrumented(expr, stats)
+        states = set(self.initial_states)
+        for char in expr:
+            states = self._step(states, char)
+            if not states:
+                return False
+        return not states.isdisjoint(self._get_acceptable_set())
+
+    def _accept_instrumented(self, expr: str, stats) -> bool:
+        """ The function accept recording steps and the peak number of active states (see instrumentation) """
+        states = set(self.initial_states)
+        peak_active = len(states)
+        for char in stats.count_steps('eilenberg', expr):
+            states = self._step(states, char)
+            peak_active = max(peak_active, len(states))
+            if not states:
+                break
+        stats.peak('match.eilenberg.peak_active', peak_active)
+        return not states.isdisjoint(self._get_acceptable_set())
+
+    def search(self, text: str, pos: int = 0):
+        """ The function finds the leftmost-longest substring of the text accepted by the Eilenberg machine
+            :param text: str -- the text
+            :param pos: int -- the position of the text, from which the search starts
+            :return: tuple (start, end) -- the bounds of the found substring text[start:end] or None
+        """
+        return self._search_leftmost_longest(text, pos)
+
+    def finditer(self, text: str, pos: int = 0):
+        """ The generator of non-overlapping leftmost-longest substrings of the text
+            accepted by the Eilenberg machine. The next search starts at the end of the previous substring.
+            The text is read twice whatever the number of substrings: the backward pass finds live states
+            of every position (see _get_live_states), a substring starts at the leftmost position, where
+            an initial state is live, and the forward pass from it follows only live states, so it stops
+            right after the longest substring. The running time is O(len(text) * number_states).
+            :param text: str -- the text
+            :param pos: int -- the position of the text, from which the search starts
+            :return: generator of tuples (start, end) -- the bounds of the found substrings text[start:end]
+        """
+        if pos > len(text):
+            return
+        live = self._get_live_states(text, pos)
+        offset = pos
+        initial_set = frozenset(self.initial_states)
+        acceptable_set = self._get_acceptable_set()
+        while pos <= len(text):
+            start = pos
+            while live[start - offset].isdisjoint(initial_set):
+                start += 1
+                if start > len(text):
+                    return
+            active = initial_set & live[start - offset]
+            end = start if not active.isdisjoint(acceptable_set) else None
+            for i in range(start, len(text)):
+                active = self._step(active, text[i]) & live[i + 1 - offset]
+                if not active:
+                    break
+                if not active.isdisjoint(acceptable_set):
+                    end = i + 1
+            yield start, end
+            pos = end if end > start else end + 1
+
+    def _get_live_states(self, text: str, pos: int) -> list:
+        """ The function returns the list, whose item i is the set of live states of the position pos + i:
+            states, from which an acceptable state is reachable by reading text[pos + i:j] for some j.
+            The sets are found by one backward pass over the text by inverse transitions,
+            equal sets are shared and the step from a set with a symbol is computed once.
+        """
+        inverse_symbol_index, inverse_class_index = self._get_inverse_index()
+        acceptable_set = self._get_acceptable_set()
+        # the dictionary contains pairs: (the set of live states, the symbol) and the set of the previous position
+        steps = {}
+        live = [acceptable_set] * (len(text) - pos + 1)
+        states = acceptable_set
+        for i in range(len(text) - 1, pos - 1, -1):
+            char = text[i]
+            previous = steps.get((states, char))
+            if previous is None:
+                previous = set(acceptable_set)
+                for state in states:
+                    previous.update(inverse_symbol_index[state].get(char, ()))
+                    for char_class, sources in inverse_class_index[state]:
+                        if char in char_class:
+                            previous.update(sources)
+                previous = steps.setdefault((states, char), frozenset(previous))
+            states = previous
+            live[i - pos] = states
+        return live
+
+    def _get_inverse_index(self) -> tuple:
+        """ The function returns indexes of inverse transitions (see _get_symbol_index):
+            inverse_symbol_index[i] -- dict, mapping a symbol to the tuple of states,
+                from which it is possible to go to state i with this symbol;
+            inverse_class_index[i] -- tuple of pairs (CharClass, tuple of states) for transitions to state i.
+            Indexes are built on the first call, the machine must not be changed after it.
+        """
+        if self._inverse_index is None:
+            sources = [{} for _ in range(self.number_states)]
+            for s in range(self.number_states):
+                for (state, character) in self.transitions_between_states[s]:
+                    sources[state].setdefault(character, set()).add(s)
+            self._inverse_index = ([{c: tuple(t) for c, t in d.items() if not isinstance(c, CharClass)}
+                                    for d in sources],
+                                   [tuple((c, tuple(t)) for c, t in d.items() if isinstance(c, CharClass))
+                                    for d in sources])
+        return self._inverse_index
+
+    def _search_leftmost_longest(self, text: str, pos: int):
+        """ The function finds the leftmost-longest accepted substring by one pass over the text.
+            The initial states are added at every position (as if the machine started with the loop Σ*),
+            and every active state keeps the leftmost position, at which the path to it started.
+            When an acceptable state is reached, new paths are not started any more,
+            the pass stops when there are no active paths starting not later than the found substring.
+        """
+        symbol_index = self._get_symbol_index()
+        class_index = self._class_index
+        acceptable_set = self._get_acceptable_set()
+
+        # the dictionary contains pairs: the active state and the leftmost start of paths to it
+        active = {}
+        match = None
+        for i in range(pos, len(text) + 1):
+            if match is None:
+                for state in self.initial_states:
+                    # paths to the state started earlier are preferred
+                    active.setdefault(state, i)
+            for state, start in active.items():
+                if state in acceptable_set and (match is None or start < match[0]
+                                                or (start == match[0] and i > match[1])):
+                    match = (start, i)
+            if i == len(text) or (match is not None and not active):
+                break
+
+            next_active = {}
+            for state, start in active.items():
+                if match is not None and start > match[0]:
+                    continue
+                for to_state in symbol_index[state].get(text[i], ()):
+                    if next_active.get(to_state, i + 1) > start:
+                        next_active[to_state] = start
+                for char_class, targets in class_index[state] if class_index is not None else ():
+                    if text[i] in char_class:
+                        for to_state in targets:
+                            if next_active.get(to_state, i + 1) > start:
+                                next_active[to_state] = start
+            active = next_active
+        return match
+
+    def _step(self, states: set, char: str) -> set:
+        """ The function returns the set of states reachable from the set 'states'
+            by one transition with the symbol 'char'
+        """
+        symbol_index = self._get_symbol_index()
+        class_index = self._class_index
+        next_states = set()
+        for state in states:
+            targets = symbol_index[state].get(char)
+            if targets is not None:
+                next_states.update(targets)
+        if class_index is not None:
+            for state in states:
+                for char_class, targets in class_index[state]:
+                    if char in char_class:
+                        next_states.update(targets)
+        return next_states
+
+    def _get_symbol_index(self) -> list:
+        """ The function returns the index of transitions by symbol.
+            symbol_index[i] -- dict, mapping a symbol to the tuple of states
+                to which it is possible to go from state i with this symbol.
+            Transitions labelled by character classes are in the index self._class_index:
+            class_index[i] -- tuple of pairs (CharClass, tuple of states) for transitions from state i,
+            class_index is None if there are no such transitions.
+            Indexes are built on the first call, the machine must not be changed after it.
+        """
+        if self._symbol_index is None:
+            symbol_index = []
+            class_index = []
+            for s in range(self.number_states):
+                targets = {}
+                for (state, character) in self.transitions_between_states[s]:
+                    targets.setdefault(character, set()).add(state)
+                symbol_index.append({c: tuple(t) for c, t in targets.items() if not isinstance(c, CharClass)})
+                class_index.append(tuple((c, tuple(t)) for c, t in targets.items() if isinstance(c, CharClass)))
+            self._class_index = class_index if any(class_index) else None
+            self._symbol_index = symbol_index
+        return self._symbol_index
+
+    def _get_acceptable_set(self) -> frozenset:
+        """ The function returns acceptable states as a set """
+        if self._acceptable_set is None:
+            self._acceptable_set = frozenset(self.acceptable_states)
+        return self._acceptable_set
+
+    def copy(self):
+        """ The function returns a copy of the Eilenberg machine, which can be changed independently
+            :return: EilenbergMachine -- the copy of the Eilenberg machine
+        """
+        return EilenbergMachine(self.number_states, [list(t) for t in self.transitions_between_states],
+                                list(self.initial_states), list(self.acceptable_states))
+
+    def freeze(self):
+        """ The function makes the Eilenberg machine immutable: lists are replaced by tuples,
+            so the machine can be shared safely. Use copy() to get a machine which can be changed.
+            :return: EilenbergMachine -- the Eilenberg machine itself
+        """
+        self.transitions_between_states = tuple(tuple(t) for t in self.transitions_between_states)
+        self.initial_states = tuple(self.initial_states)
+        self.acceptable_states = tuple(self.acceptable_states)
+        self._get_symbol_index()
+        self._get_acceptable_set()
+        return self
+
+    @staticmethod
+    def get_Eilenberg_machine(reg_expr: dict, memo: dict = None):
+        """ Static function that returned Eilenberg machine
+            accepting exactly words corresponding to the input regular expression.
+            The expression is traversed in postorder with an explicit stack,
+            so its depth is not limited by the recursion limit.
+            A chain of operations '.' (or '|') is built from left to right,
+            so the machine of a long chain is built in linear time whatever the shape of the chain.
+            :param reg_expr: dict - the regular expression represented in JSON format in dict.
+            :param memo: dict -- Eilenberg machines of sub-expressions, whose ids are keys of memo,
+                are memoized in it (the initial value is None), so a sub-expression shared
+                by several parents is built once.
+            :returns: EilenbergMachine -- resulting Eilenberg machine
+        """
+        stats = instrumentation.active
+        # Eilenberg machines of built sub-expressions, arguments of an operation are on the top
+        machines = []
+        # The stack contains pairs: the sub-expression and the number of its arguments,
+        # the number is None if the arguments are not put on the stack yet.
+        stack = [(reg_expr, None)]
+        while stack:
+            node, number_arguments = stack.pop()
+            key = node['key']
+            value = node['val']
+
+            if key == 'atm':
+                label = get_atom_label(value)
+                e_machine = EilenbergMachine(2, [[(1, label)], []], [0], [1])
+                e_machine._accepting_edges = [(0, 1, label)]
+                machines.append(e_machine)
+                if stats is not None:
+                    _record_build(stats, 'atom', 2, 1)
+                continue
+
+            memoized = memo is not None and id(node) in memo
+            if number_arguments is None:
+                if memoized and memo[id(node)] is not None:
+                    # builders change machines of arguments, so the memoized machine is copied
+                    machines.append(memo[id(node)].copy())
+                    continue
+                if key == '*':
+                    arguments = [value]
+                elif key == '.' or key == '|':
+                    arguments = EilenbergMachine._get_chain_arguments(node, memo)
+                else:
+                    return None
+                stack.append((node, len(arguments)))
+                for argument in reversed(arguments):
+                    stack.append((argument, None))
+                continue
+
+            if key == '*':
+                e_machine = EilenbergMachine._build_Eilenberg_machine_oper_asterisk(machines.pop())
+            else:
+                arguments_machines = machines[len(machines) - number_arguments:]
+                del machines[len(machines) - number_arguments:]
+                e_machine = arguments_machines[0]
+                for machine_snd in arguments_machines[1:]:
+                    if key == '.':
+                        e_machine = EilenbergMachine._build_Eilenberg_machine_oper_concat(e_machine, machine_snd)
+                    else:
+                        e_machine = EilenbergMachine._build_Eilenberg_machine_oper_or(e_machine, machine_snd)
+
+            if memoized:
+                memo[id(node)] = e_machine.copy()
+            machines.append(e_machine)
+        return machines.pop()
+
+    @staticmethod
+    def _get_chain_arguments(reg_expr: dict, memo: dict = None) -> list:
+        """ This private static function returns arguments of the chain of the same binary operations
+            from left to right. For example, arguments of "a.(b.c)" and "(a.b).c" are a, b and c.
+            Memoized sub-expressions are not split.
+            :param reg_expr: dict -- the regular expression, whose key is '.' or '|'
+            :return: list of sub-expressions
+        """
+        key = reg_expr['key']
+        arguments = []
+        stack = [reg_expr['val']['snd'], reg_expr['val']['fst']]
+        while stack:
+            node = stack.pop()
+            if node['key'] == key and (memo is None or id(node) not in memo):
+                stack.append(node['val']['snd'])
+                stack.append(node['val']['fst'])
+            else:
+                arguments.append(node)
+        return arguments
+
+    @staticmethod
+    def _build_Eilenberg_machine_oper_asterisk(e_machine):
+        """ This private static function return the Eilenberg machine accepting exactly words
+            corresponding to the regular expression "reg_expr*"
+            :param e_machine: EilenbergMachine -- Eilenberg machine for the argument of a unary operation *,
+                it is changed by the function
+            :return: EilenbergMachine -- resulting Eilenberg machine accepting exactly words
+                corresponding to the regular expression "reg_expr*"
+        """
+        stats = instrumentation.active
+        number_edges = _count_edges(e_machine) if stats is not None else 0
+
+        # for all transitions leading to acceptable states (only they are visited, so nested stars
+        # take linear time), we add transitions to the initial states with the corresponding symbol.
+        # Initial states are not acceptable, so the added transitions do not change the index.
+        for (s, state, character) in _get_accepting_edges(e_machine):
+            for init_state in e_machine.initial_states:
+                e_machine.transitions_between_states[s].append((init_state, character))
+        if stats is not None:
+            _record_build(stats, 'asterisk', 0, _count_edges(e_machine) - number_edges)
+        return e_machine
+
+    @staticmethod
+    def _build_Eilenberg_machine_oper_concat(machine_fst, machine_snd):
+        """ This private static function return the Eilenberg machine accepting exactly words
+            corresponding to the regular expression "reg_expr_left.reg_expr_right"
+            :param machine_fst: EilenbergMachine -- Eilenberg machine for the first argument of a binary operation .,
+                it is changed by the function
+            :param machine_snd: EilenbergMachine -- Eilenberg machine for the second argument of a binary operation .
+            :return: EilenbergMachine -- resulting Eilenberg machine accepting exactly words
+                corresponding to the regular expression "reg_expr_left.reg_expr_right"
+        """
+        stats = instrumentation.active
+        number_edges = _count_edges(machine_fst) if stats is not None else 0
+        accepting_edges_snd = _get_accepting_edges(machine_snd)
+        # initial states of the machine_snd as a set
+        initial_states_snd = set(machine_snd.initial_states)
+
+        # the number of states of resulting Eilenberg machine
+        number_states = \
+            machine_fst.number_states + machine_snd.number_states - len(machine_snd.initial_states)
+
+        # The dictionary contains pairs:
+        # the old number of state (not including initial states) in the Eilenberg machine_snd and
+        # the new number of state in the resulting Eilenberg machine
+        new_state_numbers = {}
+        # new_state_numbers is being filled (renumbering of states of Eilenberg machine_snd)
+        new_number = machine_fst.number_states
+        for s in range(machine_snd.number_states):
+            if s not in initial_states_snd:
+                new_state_numbers[s] = new_number
+                new_number += 1
+
+        # adjacency list of state transition of resulting Eilenberg machine
+        transitions_between_states = machine_fst.transitions_between_states
+        for i in range(machine_snd.number_states - len(machine_snd.initial_states)):
+            transitions_between_states.append([])
+
+        # Adding renumbered transitions between the states of the second machine to the resulting Eilenberg machine.
+        # All transitions containing the initial states of the second machine are replaced by transitions containing,
+        # instead of the initial state, the acceptable states of the first machine.
+        for s in range(machine_snd.number_states):
+            for (state, character) in machine_snd.transitions_between_states[s]:
+                # the transition corresponding to a transition between an initial state and a non-initial state
+                if s in initial_states_snd and state not in initial_states_snd:
+                    for act_s in machine_fst.acceptable_states:
+                        transitions_between_states[act_s].append((new_state_numbers[state], character))
+                # the transition corresponding to a transition between an initial state and an initial one
+                elif s in initial_states_snd and state in initial_states_snd:
+                    for act_s in machine_fst.acceptable_states:
+                        transitions_between_states[act_s].append((act_s, character))
+                # the transition corresponding to a transition between a non-initial state and an initial state.
+                elif s not in initial_states_snd and state in initial_states_snd:
+                    for act_s in machine_fst.acceptable_states:
+                        transitions_between_states[new_state_numbers[s]].append((act_s, character))
+                # the transition corresponding to a transition between a non-initial state and a non-initial state.
+                elif s not in initial_states_snd and state not in initial_states_snd:
+                    transitions_between_states[new_state_numbers[s]].append((new_state_numbers[state], character))
+
+        # the list of initial states of resulting Eilenberg machine
+        initial_states = machine_fst.initial_states
+
+        # the list of acceptable states of resulting Eilenberg machine
+        acceptable_states = []
+        # add all renumbered acceptable states of the machine_snd
+        for s in machine_snd.acceptable_states:
+            acceptable_states.append(new_state_numbers[s])
+
+        e_machine = EilenbergMachine(number_states, transitions_between_states, initial_states, acceptable_states)
+        # acceptable states are the ones of the machine_snd, transitions to them are renumbered as above
+        accepting_edges = []
+        for (s, state, character) in accepting_edges_snd:
+            if s in initial_states_snd:
+                accepting_edges.extend((act_s, new_state_numbers[state], character)
+                                       for act_s in machine_fst.acceptable_states)
+            else:
+                accepting_edges.append((new_state_numbers[s], new_state_numbers[state], character))
+        e_machine._accepting_edges = accepting_edges
+        if stats is not None:
+            _record_build(stats, 'concat', number_states - machine_fst.number_states,
+                          _count_edges(e_machine) - number_edges)
+        return e_machine
+
+    @staticmethod
+    def _build_Eilenberg_machine_oper_or(machine_fst, machine_snd):
+        """ This private static function return the Eilenberg machine accepting exactly words
+            corresponding to the regular expression "reg_expr_left|reg_expr_right"
+            :param machine_fst: EilenbergMachine -- Eilenberg machine for the first argument of a binary operation |,
+                it is changed by the function
+            :param machine_snd: EilenbergMachine -- Eilenberg machine for the second argument of a binary operation |
+            :return: EilenbergMachine -- resulting Eilenberg machine accepting exactly words
+                corresponding to the regular expression "reg_expr_left|reg_expr_right"
+        """
+        stats = instrumentation.active
+        accepting_edges = _get_accepting_edges(machine_fst)
+        accepting_edges.extend((s + machine_fst.number_states, state + machine_fst.number_states, character)
+                               for (s, state, character) in _get_accepting_edges(machine_snd))
+        # the number of states of resulting Eilenberg machine
+        number_states = \
+            machine_fst.number_states + machine_snd.number_states
+
+        # adjacency list of state transition of resulting Eilenberg machine
+        transitions_between_states = machine_fst.transitions_between_states
+        for i in range(machine_snd.number_states):
+            transitions_between_states.append([])
+
+        # Adding renumbered transitions between the states of the second machine to the resulting Eilenberg machine.
+        for s in range(machine_snd.number_states):
+            for (state, character) in machine_snd.transitions_between_states[s]:
+                transitions_between_states[s + machine_fst.number_states] \
+                    .append((state + machine_fst.number_states, character))
+
+        # the list of initial states of resulting Eilenberg machine
+        initial_states = machine_fst.initial_states
+        # add all renumbered initial states of the machine_snd
+        for s in machine_snd.initial_states:
+           initial_states.append(s + machine_fst.number_states)
+
+        # the list of acceptable states of resulting Eilenberg machine
+        acceptable_states = machine_fst.acceptable_states
+        # add all renumbered acceptable states of the machine_snd
+        for s in machine_snd.acceptable_states:
+            acceptable_states.append(s + machine_fst.number_states)
+
+        if stats is not None:
+            _record_build(stats, 'or', machine_snd.number_states, _count_edges(machine_snd))
+        e_machine = EilenbergMachine(number_states, transitions_between_states, initial_states, acceptable_states)
+        e_machine._accepting_edges = accepting_edges
+        return e_machine
+
+
+def _get_accepting_edges(e_machine: EilenbergMachine) -> list:
+    """ The function returns the list of transitions to acceptable states of the Eilenberg machine,
+        triples (s, state, a). Machines made by the builders keep the list, for other machines
+        (for example, copies of memoized machines) it is found by one pass over all transitions.
+    """
+    if e_machine._accepting_edges is None:
+        acceptable_states = set(e_machine.acceptable_states)
+        e_machine._accepting_edges = [(s, state, character)
+                                      for s in range(e_machine.number_states)
+                                      for (state, character) in e_machine.transitions_between_states[s]
+                                      if state in acceptable_states]
+    return e_machine._accepting_edges
+
+
+def _count_edges(e_machine: EilenbergMachine) -> int:
+    """ The function returns the number of transitions of the Eilenberg machine """
+    return sum(len(transitions) for transitions in e_machine.transitions_between_states)
+
+
+def _record_build(stats, operation: str, number_states: int, number_edges: int):
+    """ The function records states and transitions added by the builder operation (see instrumentation) """
+    stats.add('build.' + operation + '.calls')
+    stats.add('build.' + operation + '.states', number_states)
+    stats.add('build.' + operation + '.edges', number_edges)
+
+
+def get_data_from_json_file(name_file: str) -> dict:
+    """ The function reads the regular expression represented in JSON format.
+        :param name_file: str -- the name of the file
+        :return: decoded regular expression
+    """
+    # json is imported here, it is not needed for importing the module
+    import json
+    with open(name_file, "r") as read_file:
+        return json.load(read_file)
+
+
+if __name__ == '__main__':
+    """ 
+        Testing of Eilenberg machine
+        Testing regular expression is ((a|b*)*.((d*.e)|c)).(b|a)*
+    """
+    reg_expr_test = get_data_from_json_file("reg_expr.json")
+    machine = EilenbergMachine.get_Eilenberg_machine(reg_expr_test)
+
+    print(machine.accept("ac"))  # False
+    print(machine.accept("bbbda"))  # False
+    print(machine.accept(""))  # False
+    print(machine.accept("bbabbda"))  # False
+    print(machine.accept("abab"))  # False
+    print(machine.accept("addeca"))  # False
+    print(machine.accept("abbddeaaab"))  # True
+    print(machine.accept("aca"))  # True
+    print(machine.accept("bdea"))  # True
+    print(machine.accept("bbcbb"))  # True
+
+    print(machine.search("xxabbdeaxx"))  # (2, 8)
+    print(list(machine.finditer("ac bdea bbcbb")))  # [(3, 7), (8, 13)]
+
+    # the path started by every 'a' is alive up to the end of the text, but the text is read only twice,
+    # so the time of finditer grows linearly with the length of the text
+    import time
+    from .regexConversions import conversion_reg_expr_to_json
+
+    machine = EilenbergMachine.get_Eilenberg_machine(conversion_reg_expr_to_json("(a.(c|a)*.b)|c"))
+    times = []
+    for n in (4000, 32000):
+        start_time = time.perf_counter()
+        number_matches = sum(1 for _ in machine.finditer("ac" * n))
+        times.append(time.perf_counter() - start_time)
+    print(number_matches, times[1] / times[0] < 20)  # 32000 True
@@ -0,0 +1,70 @@
+""" Finite state machines of regular expressions: Eilenberg machines, DFSMs, their construction,
+    reduction, compilation and matching.
+    Importing the package does no work: modules are imported on the first access to their names.
+    The modules DFSM and EilenbergMachine have the names of their classes, the import system sets
+    the attributes of the package to the modules, so these names are properties of the package returning
+    the classes whatever is imported before.
+    NumPy is imported only by the batch matching (CompiledDFSM.accept_many).
+    Counters of the engines are recorded inside "with profile() as stats:" (see instrumentation).
+    The command line interface: python -m automata_theory --help
+"""
+import sys
+import types
+from importlib import import_module
+
+# the dictionary contains pairs: the public name and the module defining it
+_names = {
+    'DFSM': 'DFSM', 'CompiledDFSM': 'DFSM', 'get_random_dfsm': 'DFSM',
+    'EilenbergMachine': 'EilenbergMachine', 'get_data_from_json_file': 'EilenbergMachine',
+    'CharClass': 'charClasses', 'parse_char_class': 'charClasses',
+    'DerivativeDFSM': 'derivatives',
+    'determinize': 'determinization', 'subset_construction': 'determinization', 'LazyDFSM': 'determinization',
+    'GlushkovMachine': 'glushkovMachine',
+    'run_load': 'loadGenerator',
+    'MatchingService': 'matchingService', 'run_service': 'matchingService',
+    'reduce_Eilenberg_machine': 'nfaReduction',
+    'Stats': 'instrumentation', 'profile': 'instrumentation',
+    'save_machine': 'machineSerialization', 'load_machine': 'machineSerialization',
+    'ParallelMatcher': 'parallelMatching',
+    'PatternSet': 'patternSet',
+    'RegexCache': 'regexCache', 'compile_reg_expr': 'regexCache',
+    'conversion_reg_expr_to_json': 'regexConversions', 'conversion_reg_expr_to_str': 'regexConversions',
+    'StreamMatcher': 'streamMatching', 'match_file': 'streamMatching',
+}
+
+__all__ = list(_names)
+
+
+def __getattr__(name: str):
+    module_name = _names.get(name)
+    if module_name is None:
+        raise AttributeError("module " + repr(__name__) + " has no attribute " + repr(name))
+    value = getattr(import_module('.' + module_name, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list:
+    return sorted(set(globals()) | set(__all__))
+
+
+def _get_class_property(name: str) -> property:
+    """ The function returns the property of the package returning the class 'name' of the module 'name' """
+    def get_class(package):
+        return getattr(import_module('.' + name, package.__name__), name)
+
+    def set_class(package, value):
+        # the import system sets the attribute to the module, the name keeps the class
+        if not isinstance(value, types.ModuleType):
+            raise AttributeError("can't set attribute " + repr(name))
+
+    return property(get_class, set_class)
+
+
+class _Package(types.ModuleType):
+    """ Class of the package, whose properties are the names of modules having the names of their classes """
+    DFSM = _get_class_property('DFSM')
+    EilenbergMachine = _get_class_property('EilenbergMachine')
+
+
+sys.modules[__name__].__class__ = _Package
@@ -0,0 +1,6 @@
+""" The entry point of the command line interface: python -m automata_theory COMMAND ... (see cli) """
+import sys
+
+from .cli import main
+
+sys.exit(main())
@@ -0,0 +1,293 @@
+""" Benchmarks of construction, reduction and matching of finite state machines.
+    Every benchmark returns a dict with timings in seconds, which can be printed in JSON format.
+    run_suite measures the main operations on seeded random inputs of increasing sizes and on adversarial
+    regular expressions, it reports scaling curves: the best time and the peak of allocated memory
+    for every size, and the exponent k of the fitted curve time ~ size^k.
+    Results of two runs (for example, before and after a change) are compared by compare_results.
+"""
+import json
+import math
+import random
+import time
+import tracemalloc
+
+from .DFSM import DFSM, get_random_dfsm
+from .EilenbergMachine import EilenbergMachine
+from .regexConversions import conversion_reg_expr_to_json, conversion_reg_expr_to_str
+
+
+def get_random_strings(number_strings: int, max_length: int, alphabet: list, rng: random.Random) -> list:
+    """ The function generates random strings of symbols of the alphabet
+        :param number_strings: int -- the number of strings
+        :param max_length: int -- the maximal length of a string
+        :param alphabet: list -- list of symbols of the alphabet
+        :param rng: random.Random -- the source of random numbers
+        :return: list of random strings
+    """
+    return [''.join(rng.choice(alphabet) for _ in range(rng.randint(0, max_length)))
+            for _ in range(number_strings)]
+
+
+def _best_time(function, repeat: int) -> float:
+    """ The function returns the best running time of 'function' in 'repeat' runs """
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def bench_accept_many(machine: DFSM, strings: list, repeat: int = 3) -> dict:
+    """ The function compares matching of the batch of strings by accept_many
+        and matching of every string separately by DFSM.accept and CompiledDFSM.accept.
+        :param machine: DFSM -- deterministic finite state machine
+        :param strings: list -- input strings
+        :param repeat: int -- the number of runs of every benchmark, the best time is reported
+        :return: dict -- timings in seconds and the speedup of accept_many
+    """
+    compiled_machine = machine.compile()
+
+    expected = [compiled_machine.accept(s) for s in strings]
+    if list(compiled_machine.accept_many(strings)) != expected:
+        raise AssertionError("accept_many and accept give different results")
+
+    result = {
+        'number_strings': len(strings),
+        'number_states': machine.number_states,
+        'dfsm_accept': _best_time(lambda: [machine.accept(s) for s in strings], repeat),
+        'compiled_accept': _best_time(lambda: [compiled_machine.accept(s) for s in strings], repeat),
+        'accept_many': _best_time(lambda: compiled_machine.accept_many(strings), repeat),
+    }
+    result['speedup'] = result['compiled_accept'] / max(result['accept_many'], 1e-9)
+    return result
+
+
+def bench_parallel_matching(machine: DFSM, data: bytes, worker_counts: list = None,
+                            chunk_size: int = 1 << 20, repeat: int = 3) -> dict:
+    """ The function measures the speedup of ParallelMatcher against the number of worker processes.
+        :param machine: DFSM -- deterministic finite state machine
+        :param data: bytes -- the input
+        :param worker_counts: list -- numbers of worker processes, by default 1, 2 and 4
+        :param chunk_size: int -- the number of bytes in one chunk
+        :param repeat: int -- the number of runs of every benchmark, the best time is reported
+        :return: dict -- the time of the serial run and the time and the speedup for every number of workers
+    """
+    # the pool of processes is imported only by this benchmark
+    from .parallelMatching import ParallelMatcher
+
+    if worker_counts is None:
+        worker_counts = [1, 2, 4]
+    compiled_machine = machine.compile()
+
+    with ParallelMatcher(compiled_machine, processes=1, chunk_size=chunk_size,
+                         min_parallel_size=len(data) + 1) as matcher:
+        expected = matcher.final_state(data)
+        serial = _best_time(lambda: matcher.final_state(data), repeat)
+
+    result = {'size': len(data), 'number_states': machine.number_states, 'serial': serial, 'parallel': {}}
+    for processes in worker_counts:
+        with ParallelMatcher(compiled_machine, processes=processes, chunk_size=chunk_size,
+                             min_parallel_size=0) as matcher:
+            if matcher.final_state(data) != expected:
+                raise AssertionError("parallel and serial matching give different states")
+            parallel = _best_time(lambda: matcher.final_state(data), repeat)
+        result['parallel'][processes] = {'time': parallel, 'speedup': serial / max(parallel, 1e-9)}
+    return result
+
+
+def get_random_reg_expr(number_atoms: int, alphabet: list, rng: random.Random, star_probability: float = 0.2) -> dict:
+    """ The function generates the random regular expression. The expression is built as a random postfix
+        expression: atoms are pushed to the stack, operations '.' and '|' join the top items of the stack
+        at random moments, so the depth and the shape of the expression are random.
+        :param number_atoms: int -- the number of atoms of the expression
+        :param alphabet: list -- list of symbols of the alphabet
+        :param rng: random.Random -- the source of random numbers
+        :param star_probability: float -- the probability of the operation '*' over a new item of the stack
+        :return: dict -- the regular expression represented in JSON format in dict
+    """
+    stack = []
+    for i in range(number_atoms):
+        stack.append({'key': 'atm', 'val': rng.choice(alphabet)})
+        while True:
+            if rng.random() < star_probability and stack[-1]['key'] != '*':
+                stack[-1] = {'key': '*', 'val': stack[-1]}
+            if len(stack) < 2 or (i + 1 < number_atoms and rng.random() < 0.5):
+                break
+            snd = stack.pop()
+            fst = stack.pop()
+            stack.append({'key': rng.choice('.|'), 'val': {'fst': fst, 'snd': snd}})
+    return stack[0]
+
+
+def get_nested_stars_reg_expr(depth: int) -> dict:
+    """ The function returns the adversarial regular expression ((a*.b)*.b)*... with 'depth' nested stars
+        :param depth: int -- the number of stars
+        :return: dict -- the regular expression represented in JSON format in dict
+    """
+    reg_expr = {'key': 'atm', 'val': 'a'}
+    for _ in range(depth):
+        reg_expr = {'key': '.', 'val': {'fst': {'key': '*', 'val': reg_expr}, 'snd': {'key': 'atm', 'val': 'b'}}}
+    return {'key': '*', 'val': reg_expr}
+
+
+def get_alternation_blowup_reg_expr(number_alternations: int) -> dict:
+    """ The function returns the adversarial regular expression (a|a)*.(a|a)*...(a|a)*,
+        every state of its Eilenberg machine is reached by many paths, so the number of active states
+        of the simulation and the number of subsets of the subset construction grow with the expression
+        :param number_alternations: int -- the number of alternations (a|a)*
+        :return: dict -- the regular expression represented in JSON format in dict
+    """
+    alternation = {'key': '*', 'val': {'key': '|', 'val': {'fst': {'key': 'atm', 'val': 'a'},
+                                                          'snd': {'key': 'atm', 'val': 'a'}}}}
+    reg_expr = alternation
+    for _ in range(number_alternations - 1):
+        reg_expr = {'key': '.', 'val': {'fst': alternation, 'snd': reg_expr}}
+    return reg_expr
+
+
+def _measure(function, repeat: int, setup=None) -> dict:
+    """ The function returns the best running time of 'function' in 'repeat' runs and the peak
+        of memory allocated by it (measured by tracemalloc in a separate run, it is not timed).
+        :param setup: function returning the argument of 'function', it is called before every run
+            and is not timed (for operations changing their argument)
+    """
+    best = float('inf')
+    for _ in range(repeat):
+        argument = setup() if setup is not None else None
+        start = time.perf_counter()
+        function(argument)
+        best = min(best, time.perf_counter() - start)
+
+    argument = setup() if setup is not None else None
+    tracing = tracemalloc.is_tracing()
+    if not tracing:
+        tracemalloc.start()
+    tracemalloc.reset_peak()
+    base = tracemalloc.get_traced_memory()[0]
+    function(argument)
+    peak = tracemalloc.get_traced_memory()[1] - base
+    if not tracing:
+        tracemalloc.stop()
+    return {'time': best, 'peak_bytes': peak}
+
+
+def _get_exponent(points: list) -> float:
+    """ The function returns the exponent k of the curve time ~ size^k fitted by least squares
+        in logarithmic scale or None if there are less than two points
+    """
+    points = [(math.log(point['size']), math.log(max(point['time'], 1e-9))) for point in points]
+    if len(points) < 2:
+        return None
+    mean_x = sum(x for x, y in points) / len(points)
+    mean_y = sum(y for x, y in points) / len(points)
+    variance = sum((x - mean_x) ** 2 for x, y in points)
+    if variance == 0:
+        return None
+    return sum((x - mean_x) * (y - mean_y) for x, y in points) / variance
+
+
+def run_suite(sizes: list = None, seed: int = 0, repeat: int = 3, number_strings: int = 200,
+              alphabet: list = None) -> dict:
+    """ The function runs the benchmark suite. For every size the inputs are generated with the seed,
+        so runs with the same arguments measure the same work. Operations are measured on
+            random regular expressions with 'size' atoms: conversion_reg_expr_to_json (of the string form),
+                get_Eilenberg_machine and EilenbergMachine.accept of random strings;
+            random DFSMs with 'size' states: DFSM.accept, eliminate_unreachable_states and reduce_dfsm;
+            adversarial regular expressions of the size: nested stars and (a|a)* alternations.
+        :param sizes: list -- increasing sizes, by default 100, 200, 400, 800
+        :param seed: int -- seed of the random number generator
+        :param repeat: int -- the number of runs of every measurement, the best time is reported
+        :param number_strings: int -- the number of input strings matched by accept
+        :param alphabet: list -- list of symbols of the alphabet, by default ['a', 'b', 'c', 'd']
+        :return: dict -- the parameters of the run and curves: curves[name] is the dict
+            {'points': list of dicts {'size', 'time', 'peak_bytes'}, 'exponent': float}
+    """
+    if sizes is None:
+        sizes = [100, 200, 400, 800]
+    if alphabet is None:
+        alphabet = ['a', 'b', 'c', 'd']
+    # the dictionary contains pairs: the name of the curve and the list of its points
+    curves = {}
+
+    def add_point(name: str, size: int, function, setup=None):
+        point = {'size': size}
+        point.update(_measure(function, repeat, setup))
+        curves.setdefault(name, []).append(point)
+
+    for size in sizes:
+        rng = random.Random(seed * 1000003 + size)
+        reg_expr_str = conversion_reg_expr_to_str(get_random_reg_expr(size, alphabet, rng))
+        strings = get_random_strings(number_strings, 32, alphabet, rng)
+        reg_expr = conversion_reg_expr_to_json(reg_expr_str)
+        e_machine = EilenbergMachine.get_Eilenberg_machine(reg_expr)
+        add_point('conversion_reg_expr_to_json', size, lambda _: conversion_reg_expr_to_json(reg_expr_str))
+        add_point('get_Eilenberg_machine', size, lambda _: EilenbergMachine.get_Eilenberg_machine(reg_expr))
+        add_point('EilenbergMachine.accept', size, lambda _: [e_machine.accept(s) for s in strings])
+
+        # the DFSM matching strings has all transitions, so strings are not rejected at the beginning
+        machine = get_random_dfsm(size, alphabet, rng, transition_probability=1.0)
+        machine_seed = rng.random()
+        add_point('DFSM.accept', size, lambda _: [machine.accept(s) for s in strings])
+        add_point('eliminate_unreachable_states', size, DFSM.eliminate_unreachable_states,
+                  lambda: get_random_dfsm(size, alphabet, random.Random(machine_seed)))
+        add_point('reduce_dfsm', size, DFSM.reduce_dfsm,
+                  lambda: get_random_dfsm(size, alphabet, random.Random(machine_seed)))
+
+        # adversarial expressions and the symbols of their input strings
+        for name, adversarial_reg_expr, symbols in (('nested_stars', get_nested_stars_reg_expr(size), 'ab'),
+                                                    ('alternation_blowup', get_alternation_blowup_reg_expr(size),
+                                                     'a')):
+            adversarial_machine = EilenbergMachine.get_Eilenberg_machine(adversarial_reg_expr)
+            adversarial_strings = get_random_strings(number_strings, 32, list(symbols), rng)
+            add_point('get_Eilenberg_machine/' + name, size,
+                      lambda _: EilenbergMachine.get_Eilenberg_machine(adversarial_reg_expr))
+            add_point('EilenbergMachine.accept/' + name, size,
+                      lambda _: [adversarial_machine.accept(s) for s in adversarial_strings])
+
+    return {
+        'seed': seed,
+        'sizes': list(sizes),
+        'repeat': repeat,
+        'number_strings': number_strings,
+        'curves': {name: {'points': points, 'exponent': _get_exponent(points)} for name, points in curves.items()},
+    }
+
+
+def compare_results(baseline: dict, current: dict, threshold: float = 1.5) -> list:
+    """ The function compares two results of run_suite with the same parameters and finds regressions:
+        points, whose time or peak of memory grew more than 'threshold' times.
+        :param baseline: dict -- the result of the previous run
+        :param current: dict -- the result of the new run
+        :param threshold: float -- the allowed ratio of the new value to the old value
+        :return: list of dicts {'curve', 'size', 'measure', 'baseline', 'current', 'ratio'}
+    """
+    regressions = []
+    for name, curve in current['curves'].items():
+        if name not in baseline['curves']:
+            continue
+        baseline_points = {point['size']: point for point in baseline['curves'][name]['points']}
+        for point in curve['points']:
+            baseline_point = baseline_points.get(point['size'])
+            if baseline_point is None:
+                continue
+            for measure in ('time', 'peak_bytes'):
+                ratio = point[measure] / max(baseline_point[measure], 1e-9)
+                if ratio > threshold:
+                    regressions.append({'curve': name, 'size': point['size'], 'measure': measure,
+                                        'baseline': baseline_point[measure], 'current': point[measure],
+                                        'ratio': ratio})
+    return regressions
+
+
+if __name__ == '__main__':
+    print(json.dumps(run_suite(sizes=[50, 100, 200]), indent=2))
+
+    rng = random.Random(0)
+    alphabet = ['a', 'b', 'c', 'd']
+    machine = get_random_dfsm(100, alphabet, rng, transition_probability=1.0)
+    strings = get_random_strings(100000, 32, alphabet, rng)
+    print(json.dumps(bench_accept_many(machine, strings), indent=2))
+
+    data = ''.join(rng.choice(alphabet) for _ in range(1 << 22)).encode()
+    print(json.dumps(bench_parallel_matching(machine, data, chunk_size=1 << 21), indent=2))
@@ -0,0 +1,260 @@
+""" Character classes of regular expressions: [a-z], negated classes [^0-9] and escaped literals \\* .
+    An atom of a regular expression is a token, which is turned into the label of transitions:
+        a single character -- the character itself
+        an escaped character \\c -- the character c (operators and brackets are written so)
+        a class [...] -- the CharClass, the set of ranges of code points
+    Transitions of machines are labelled by classes as they are, classes are not expanded into characters,
+    so the size of a machine is proportional to the size of the regular expression.
+"""
+from bisect import bisect_right
+
+# the greatest code point
+MAX_CODE = 0x10FFFF
+
+# characters, which are written escaped in atoms of regular expressions
+SPECIAL_CHARACTERS = frozenset('()*.|[]\\ ')
+
+# characters, which are written escaped in character classes
+_CLASS_SPECIAL_CHARACTERS = frozenset(']\\^-')
+
+
+class CharClass:
+    """ Class representing set of characters given by ranges of code points.
+        Constructor parameters are
+            1.ranges -- iterable of pairs (first, last) of code points, a range includes both ends.
+        Ranges are sorted and merged, so equal sets of characters give equal classes.
+        The class is immutable and hashable, so it can be used as a symbol of the alphabet.
+    """
+
+    __slots__ = ('ranges', '_firsts')
+
+    def __init__(self, ranges=()):
+        merged = []
+        for first, last in sorted(ranges):
+            if merged and first <= merged[-1][1] + 1:
+                if last > merged[-1][1]:
+                    merged[-1] = (merged[-1][0], last)
+            else:
+                merged.append((first, last))
+        self.ranges = tuple(merged)
+        self._firsts = [first for first, last in merged]
+
+    def __contains__(self, char) -> bool:
+        if not isinstance(char, str) or len(char) != 1:
+            return False
+        code = ord(char)
+        i = bisect_right(self._firsts, code) - 1
+        return i >= 0 and code <= self.ranges[i][1]
+
+    def __eq__(self, other) -> bool:
+        return isinstance(other, CharClass) and self.ranges == other.ranges
+
+    def __hash__(self) -> int:
+        return hash(self.ranges)
+
+    def __repr__(self) -> str:
+        if self.ranges and self.ranges[-1][1] == MAX_CODE:
+            return '[^' + self.complement()._get_ranges_str() + ']'
+        return '[' + self._get_ranges_str() + ']'
+
+    def is_empty(self) -> bool:
+        """ The function checks whether the class contains no characters """
+        return not self.ranges
+
+    def complement(self):
+        """ The function returns the class of all characters, which are not in the class
+            :return: CharClass -- the complement of the class
+        """
+        ranges = []
+        first = 0
+        for start, last in self.ranges:
+            if start > first:
+                ranges.append((first, start - 1))
+            first = last + 1
+        if first <= MAX_CODE:
+            ranges.append((first, MAX_CODE))
+        return CharClass(ranges)
+
+    def _get_ranges_str(self) -> str:
+        """ The function returns the ranges written as in the string format of the class without brackets """
+        parts = []
+        for first, last in self.ranges:
+            parts.append(_escape_class_character(chr(first)))
+            if last > first + 1:
+                parts.append('-')
+            if last > first:
+                parts.append(_escape_class_character(chr(last)))
+        return ''.join(parts)
+
+
+def _escape_class_character(char: str) -> str:
+    """ The function escapes the character written in a character class """
+    return '\\' + char if char in _CLASS_SPECIAL_CHARACTERS else char
+
+
+def get_atom_label(token: str):
+    """ The function turns the token of an atom into the label of transitions.
+        :param token: str -- the atom: a character, an escaped character or a character class
+        :return: str or CharClass -- the label. A class containing one character is turned into the character.
+    """
+    if len(token) == 1:
+        return token
+    if token[0] == '\\' and len(token) == 2:
+        return token[1]
+    if token[0] == '[':
+        char_class = parse_char_class(token)
+        if len(char_class.ranges) == 1 and char_class.ranges[0][0] == char_class.ranges[0][1]:
+            return chr(char_class.ranges[0][0])
+        return char_class
+    # other multi-character tokens are symbols themselves
+    return token
+
+
+def get_atom_token(label) -> str:
+    """ The function returns the token of the atom, whose label of transitions is 'label' (see get_atom_label)
+        :param label: str or CharClass -- the label
+        :return: str -- the token
+    """
+    if isinstance(label, CharClass):
+        return repr(label)
+    if len(label) == 1 and label in SPECIAL_CHARACTERS:
+        return '\\' + label
+    return label
+
+
+def parse_char_class(token: str) -> CharClass:
+    """ The function parses the character class written in string format.
+        [abc] -- any of the characters, [a-z] -- the range of characters,
+        [^...] -- any character not in the class, \\c -- the character c (for writing ] \\ ^ -).
+        The character - at the beginning or at the end of the class is the character itself.
+        :param token: str -- the character class in string format
+        :return: CharClass -- the character class
+    """
+    if len(token) < 2 or token[0] != '[' or token[-1] != ']':
+        raise ValueError("Invalid character class: " + token)
+    i = 1
+    negated = token.startswith('[^')
+    if negated:
+        i = 2
+    end = len(token) - 1
+
+    # characters of the class, escaped characters are marked by True
+    chars = []
+    while i < end:
+        if token[i] == '\\' and i + 1 < end:
+            chars.append((token[i + 1], True))
+            i += 2
+        else:
+            chars.append((token[i], False))
+            i += 1
+
+    ranges = []
+    j = 0
+    while j < len(chars):
+        char = chars[j][0]
+        if j + 2 < len(chars) and chars[j + 1] == ('-', False):
+            first, last = ord(char), ord(chars[j + 2][0])
+            if first > last:
+                raise ValueError("Invalid range in character class: " + token)
+            ranges.append((first, last))
+            j += 3
+        else:
+            ranges.append((ord(char), ord(char)))
+            j += 1
+
+    char_class = CharClass(ranges)
+    return char_class.complement() if negated else char_class
+
+
+def split_labels(labels) -> dict:
+    """ The function splits labels of transitions into disjoint pieces, so every label is the union
+        of some pieces and a character belongs to at most one piece.
+        A piece containing one character is the character itself, other pieces are CharClasses.
+        Labels, which are not classes or single characters, are pieces themselves.
+        The number of pieces is proportional to the number of labels, not to the number of characters.
+        :param labels: iterable of labels (str or CharClass)
+        :return: dict -- mapping every label to the list of its pieces
+    """
+    labels = list(dict.fromkeys(labels))
+    if not any(isinstance(label, CharClass) for label in labels):
+        return {label: [label] for label in labels}
+
+    pieces = {}
+    # events of the sweep over code points: (code point, 1 for the beginning of a range or 0 for the end, label)
+    events = []
+    for label in labels:
+        if isinstance(label, CharClass):
+            ranges = label.ranges
+        elif len(label) == 1:
+            ranges = ((ord(label), ord(label)),)
+        else:
+            pieces[label] = [label]
+            continue
+        pieces[label] = []
+        for first, last in ranges:
+            events.append((first, 1, label))
+            events.append((last + 1, 0, label))
+    events.sort(key=lambda event: event[:2])
+
+    # the dictionary contains pairs: the set of labels containing the elementary range and the list of such ranges
+    ranges_by_labels = {}
+    active = {}
+    for k, (code, is_beginning, label) in enumerate(events):
+        if is_beginning:
+            active[label] = active.get(label, 0) + 1
+        else:
+            active[label] -= 1
+            if active[label] == 0:
+                del active[label]
+        if k + 1 < len(events) and events[k + 1][0] > code and active:
+            ranges_by_labels.setdefault(frozenset(active), []).append((code, events[k + 1][0] - 1))
+
+    for covering_labels, ranges in ranges_by_labels.items():
+        if len(ranges) == 1 and ranges[0][0] == ranges[0][1]:
+            piece = chr(ranges[0][0])
+        else:
+            piece = CharClass(ranges)
+        for label in covering_labels:
+            pieces[label].append(piece)
+    return pieces
+
+
+def get_tokens(reg_expr: str):
+    """ The generator of tokens of the regular expression in string format:
+        operators, brackets and atoms (a character, an escaped character \\c or a character class [...]).
+        Spaces out of character classes are skipped.
+        :param reg_expr: str -- the regular expression represented in string format
+    """
+    i = 0
+    n = len(reg_expr)
+    while i < n:
+        char = reg_expr[i]
+        if char == '\\' and i + 1 < n:
+            yield reg_expr[i:i + 2]
+            i += 2
+        elif char == '[':
+            # the end of the class is the first ']' which is not escaped
+            j = i + 2 if reg_expr.startswith('[^', i) else i + 1
+            while j < n and reg_expr[j] != ']':
+                j += 2 if reg_expr[j] == '\\' else 1
+            if j >= n:
+                raise ValueError("Unterminated character class: " + reg_expr[i:])
+            yield reg_expr[i:j + 1]
+            i = j + 1
+        else:
+            if char != ' ':
+                yield char
+            i += 1
+
+
+if __name__ == '__main__':
+    """
+        Testing of character classes
+    """
+    letters = parse_char_class('[a-z_]')
+    print('q' in letters, 'Q' in letters, '_' in letters)  # True False True
+    print(parse_char_class('[^0-9]'), '5' in parse_char_class('[^0-9]'))  # [^0-9] False
+    print(get_atom_label('\\*'), get_atom_label('[x]'), get_atom_token('|'))  # * x \|
+    print(list(get_tokens('[a-c]*.\\[|[^\\]] . x')))  # ['[a-c]', '*', '.', '\\[', '|', '[^\\]]', '.', 'x']
+    print(split_labels([parse_char_class('[a-z]'), 'q', parse_char_class('[^a-m]')]))
+    # {[a-z]: [[a-m], [n-pr-z], 'q'], 'q': ['q'], [^a-m]: [[^a-z], [n-pr-z], 'q']}
@@ -0,0 +1,310 @@
+""" Command line interface: python -m automata_theory COMMAND ...
+    compile  -- compiles regular expressions into the binary file of the DFSM (see machineSerialization)
+    match    -- prints input lines accepted by the DFSM as whole lines
+    minimize -- prints the numbers of states of DFSMs of regular expressions before and after the reduction,
+                with --nfa the Eilenberg machine is reduced before the subset construction (see nfaReduction)
+    bench    -- runs benchmarks of matching or the suite of scaling curves (see benchmarks.run_suite)
+                and prints timings in JSON format
+    serve    -- runs the asyncio matching service of the binary file (see matchingService)
+    load     -- sends requests to the matching service and prints latencies and throughput in JSON format
+    Regular expressions are given by -e or read one per line from files (-f, '-' is stdin),
+    a file with the extension .json contains one regular expression in JSON format.
+    Input lines are read from files or stdin. Modules are imported by the commands using them,
+    so the tool starts fast and can be used in shell pipelines.
+    The option --stats (before the command) prints counters of the engines to stderr (see instrumentation).
+"""
+import argparse
+import os
+import sys
+
+
+def main(argv: list = None) -> int:
+    """ The function runs the command given by the arguments of the command line
+        :param argv: list -- arguments of the command line without the name of the program
+        :return: int -- the exit status (for match: 0 if some line is selected, 1 otherwise)
+    """
+    parser = _get_parser()
+    args = parser.parse_args(argv)
+    if args.command is None:
+        parser.print_help()
+        return 2
+    try:
+        if not args.stats:
+            return args.function(args)
+        import json
+        from .instrumentation import profile
+        with profile() as stats:
+            status = args.function(args)
+        print(json.dumps(stats.as_dict(), indent=2), file=sys.stderr)
+        return status
+    except BrokenPipeError:
+        # the reader of the output is closed (for example, head in a pipeline), the rest of the output is dropped
+        devnull = os.open(os.devnull, os.O_WRONLY)
+        os.dup2(devnull, sys.stdout.fileno())
+        return 1
+    except (OSError, ValueError) as error:
+        print("automata_theory " + args.command + ": " + str(error), file=sys.stderr)
+        return 2
+
+
+def _get_parser() -> argparse.ArgumentParser:
+    """ The function returns the parser of arguments of the command line """
+    parser = argparse.ArgumentParser(prog='python -m automata_theory',
+                                     description="Finite state machines of regular expressions")
+    parser.add_argument('--stats', action='store_true',
+                        help="print counters of the engines in JSON format to stderr")
+    commands = parser.add_subparsers(dest='command', metavar='COMMAND')
+
+    def add_patterns(command_parser):
+        command_parser.add_argument('-e', '--regexp', dest='patterns', action='append', default=[],
+                                    metavar='PATTERN', help="regular expression in string format")
+        command_parser.add_argument('-f', '--file', dest='pattern_files', action='append', default=[],
+                                    metavar='FILE', help="file of regular expressions, one per line")
+
+    compile_parser = commands.add_parser('compile', help="compile regular expressions into a binary file")
+    add_patterns(compile_parser)
+    compile_parser.add_argument('-o', '--output', required=True, help="the binary file of the DFSM")
+    compile_parser.add_argument('--no-minimize', dest='minimize', action='store_false',
+                                help="do not reduce the DFSM")
+    compile_parser.set_defaults(function=_compile)
+
+    match_parser = commands.add_parser('match', help="print input lines accepted by regular expressions")
+    add_patterns(match_parser)
+    match_parser.add_argument('-m', '--machine', help="the binary file made by compile")
+    match_parser.add_argument('-v', '--invert', action='store_true', help="print lines which are not accepted")
+    match_parser.add_argument('-c', '--count', action='store_true', help="print only the number of lines")
+    match_parser.add_argument('--ids', action='store_true',
+                              help="print numbers of accepting patterns after every accepted line")
+    match_parser.add_argument('inputs', nargs='*', metavar='INPUT', help="input files, stdin by default")
+    match_parser.set_defaults(function=_match)
+
+    minimize_parser = commands.add_parser('minimize', help="print numbers of states of DFSMs")
+    add_patterns(minimize_parser)
+    minimize_parser.add_argument('--nfa', action='store_true',
+                                 help="reduce the Eilenberg machine first and print its numbers of states "
+                                      "and transitions before and after the reduction")
+    minimize_parser.set_defaults(function=_minimize)
+
+    bench_parser = commands.add_parser('bench', help="run benchmarks of matching")
+    bench_parser.add_argument('--states', type=int, default=100, help="the number of states of the random DFSM")
+    bench_parser.add_argument('--strings', type=int, default=100000, help="the number of input strings")
+    bench_parser.add_argument('--length', type=int, default=32, help="the maximal length of input strings")
+    bench_parser.add_argument('--seed', type=int, default=0, help="the seed of random numbers")
+    bench_parser.add_argument('--parallel', type=int, default=0, metavar='SIZE',
+                              help="also benchmark parallel matching of the input of SIZE bytes")
+    bench_parser.add_argument('--suite', action='store_true',
+                              help="run the suite of scaling curves of construction, reduction and matching")
+    bench_parser.add_argument('--sizes', type=int, nargs='+', help="sizes of inputs of the suite")
+    bench_parser.add_argument('--repeat', type=int, default=3, help="the number of runs of every measurement")
+    bench_parser.add_argument('-o', '--output', help="the file for the result in JSON format")
+    bench_parser.add_argument('--compare', metavar='BASELINE',
+                              help="compare the suite with the result of the previous run, "
+                                   "the exit status is 1 if there are regressions")
+    bench_parser.add_argument('--threshold', type=float, default=1.5,
+                              help="the allowed ratio of times and memory peaks for --compare")
+    bench_parser.set_defaults(function=_bench)
+
+    def add_address(command_parser):
+        command_parser.add_argument('--host', default='127.0.0.1', help="the host of the TCP server")
+        command_parser.add_argument('--port', type=int, default=8765, help="the port of the TCP server")
+        command_parser.add_argument('--unix', dest='path', metavar='PATH',
+                                    help="the path of the Unix socket used instead of TCP")
+
+    serve_parser = commands.add_parser('serve', help="run the matching service")
+    serve_parser.add_argument('-m', '--machine', required=True, help="the binary file made by compile")
+    add_address(serve_parser)
+    serve_parser.add_argument('--max-batch-size', type=int, default=256,
+                              help="the maximal number of requests in a batch")
+    serve_parser.add_argument('--max-latency', type=float, default=2.0, metavar='MS',
+                              help="the maximal time in milliseconds, for which a request waits for a batch")
+    serve_parser.add_argument('--executor', choices=['thread', 'process'], default='thread',
+                              help="the pool matching batches")
+    serve_parser.add_argument('--workers', type=int, default=2, help="the number of workers of the pool")
+    serve_parser.set_defaults(function=_serve)
+
+    load_parser = commands.add_parser('load', help="send requests to the matching service")
+    add_address(load_parser)
+    load_parser.add_argument('--connections', type=int, default=8, help="the number of concurrent connections")
+    load_parser.add_argument('--requests', type=int, default=100000, help="the total number of requests")
+    load_parser.add_argument('--pipeline', type=int, default=16,
+                             help="the maximal number of requests without responses on a connection")
+    load_parser.add_argument('--length', type=int, default=32, help="the maximal length of random input strings")
+    load_parser.add_argument('--seed', type=int, default=0, help="the seed of random numbers")
+    load_parser.add_argument('inputs', nargs='*', metavar='INPUT',
+                             help="files of input lines, random strings over 'abcd' by default")
+    load_parser.set_defaults(function=_load)
+    return parser
+
+
+def _open_input(name_file: str):
+    """ The function opens the file of lines, '-' is stdin """
+    if name_file == '-':
+        return open(sys.stdin.fileno(), 'r', encoding='utf-8', errors='surrogateescape', closefd=False)
+    return open(name_file, 'r', encoding='utf-8', errors='surrogateescape')
+
+
+def _read_patterns(args) -> list:
+    """ The function returns regular expressions given by -e and -f (stdin if there are none) """
+    from .EilenbergMachine import get_data_from_json_file
+
+    patterns = list(args.patterns)
+    pattern_files = args.pattern_files
+    if not patterns and not pattern_files:
+        pattern_files = ['-']
+    for name_file in pattern_files:
+        if name_file.endswith('.json'):
+            patterns.append(get_data_from_json_file(name_file))
+            continue
+        with _open_input(name_file) as read_file:
+            patterns.extend(line.rstrip('\r\n') for line in read_file if line.strip())
+    if not patterns:
+        raise ValueError("no regular expressions")
+    return patterns
+
+
+def _compile(args) -> int:
+    """ The command compile: the DFSM of the regular expressions with their numbers is saved to the file """
+    from .patternSet import PatternSet
+
+    patterns = _read_patterns(args)
+    pattern_set = PatternSet(patterns, minimize=args.minimize)
+    pattern_set.save(args.output)
+    print("patterns: " + str(len(patterns)) + ", states: " + str(pattern_set.number_states), file=sys.stderr)
+    return 0
+
+
+def _match(args) -> int:
+    """ The command match: input lines accepted by the DFSM are printed """
+    from .patternSet import PatternSet
+
+    if args.machine is not None:
+        from .machineSerialization import read_machine_file
+        machine, state_patterns = read_machine_file(args.machine)
+        pattern_set = PatternSet.load(args.machine) if state_patterns is not None else None
+    else:
+        pattern_set = PatternSet(_read_patterns(args))
+        machine = pattern_set.compiled_machine
+    if args.ids and pattern_set is None:
+        raise ValueError("the machine file contains no numbers of patterns")
+
+    accept = machine.accept
+    invert = args.invert
+    output = sys.stdout
+    number_selected = 0
+    for name_file in args.inputs or ['-']:
+        with _open_input(name_file) as read_file:
+            for line in read_file:
+                expr = line[:-1] if line.endswith('\n') else line
+                if args.ids and not invert:
+                    ids = pattern_set.match(expr)
+                    selected = len(ids) > 0
+                    if selected and not args.count:
+                        output.write(expr + '\t' + ','.join(map(str, sorted(ids))) + '\n')
+                else:
+                    selected = accept(expr) != invert
+                    if selected and not args.count:
+                        output.write(expr + '\n')
+                number_selected += selected
+    if args.count:
+        output.write(str(number_selected) + '\n')
+    return 0 if number_selected > 0 else 1
+
+
+def _minimize(args) -> int:
+    """ The command minimize: for every regular expression the numbers of states of its DFSM
+        before and after the reduction are printed. With --nfa the Eilenberg machine is reduced
+        before the subset construction, the numbers of its states and transitions are printed too.
+    """
+    from .EilenbergMachine import EilenbergMachine
+    from .determinization import determinize
+    from .regexConversions import conversion_reg_expr_to_json, conversion_reg_expr_to_str
+
+    for reg_expr in _read_patterns(args):
+        if isinstance(reg_expr, str):
+            reg_expr_str, reg_expr = reg_expr, conversion_reg_expr_to_json(reg_expr)
+        else:
+            reg_expr_str = conversion_reg_expr_to_str(reg_expr)
+        e_machine = EilenbergMachine.get_Eilenberg_machine(reg_expr)
+        columns = [reg_expr_str]
+        if args.nfa:
+            from .nfaReduction import reduce_Eilenberg_machine
+            e_machine, report = reduce_Eilenberg_machine(e_machine)
+            columns += [report['states_before'], report['states_after'], report['edges_before'],
+                        report['edges_after']]
+        machine = determinize(e_machine)
+        columns.append(machine.number_states)
+        machine.reduce_dfsm()
+        columns.append(machine.number_states)
+        print('\t'.join(map(str, columns)))
+    return 0
+
+
+def _bench(args) -> int:
+    """ The command bench: benchmarks of matching on a random DFSM or the suite of scaling curves
+        (see benchmarks.run_suite), which can be compared with the result of the previous run
+    """
+    import json
+    import random
+
+    from .DFSM import get_random_dfsm
+    from .benchmarks import (bench_accept_many, bench_parallel_matching, compare_results, get_random_strings,
+                             run_suite)
+
+    if args.suite:
+        result = run_suite(args.sizes, seed=args.seed, repeat=args.repeat)
+    else:
+        rng = random.Random(args.seed)
+        alphabet = ['a', 'b', 'c', 'd']
+        machine = get_random_dfsm(args.states, alphabet, rng, transition_probability=1.0)
+        result = {'accept_many': bench_accept_many(machine, get_random_strings(args.strings, args.length,
+                                                                               alphabet, rng), args.repeat)}
+        if args.parallel > 0:
+            data = ''.join(rng.choice(alphabet) for _ in range(args.parallel)).encode()
+            result['parallel_matching'] = bench_parallel_matching(machine, data, repeat=args.repeat)
+
+    status = 0
+    if args.compare is not None:
+        if not args.suite:
+            raise ValueError("--compare needs --suite")
+        with open(args.compare, 'r') as read_file:
+            result['regressions'] = compare_results(json.load(read_file), result, args.threshold)
+        status = 1 if result['regressions'] else 0
+
+    text = json.dumps(result, indent=2)
+    if args.output is not None:
+        with open(args.output, 'w') as write_file:
+            write_file.write(text + '\n')
+    else:
+        print(text)
+    return status
+
+
+def _serve(args) -> int:
+    """ The command serve: the matching service runs until it is interrupted """
+    from .matchingService import run_service
+
+    run_service(args.machine, args.host, args.port, args.path, max_batch_size=args.max_batch_size,
+                max_latency=args.max_latency / 1000, executor=args.executor, workers=args.workers)
+    return 0
+
+
+def _load(args) -> int:
+    """ The command load: requests are sent to the matching service, the report is printed """
+    import asyncio
+    import json
+    import random
+
+    from .benchmarks import get_random_strings
+    from .loadGenerator import run_load
+
+    if args.inputs:
+        strings = []
+        for name_file in args.inputs:
+            with _open_input(name_file) as read_file:
+                strings.extend(line[:-1] if line.endswith('\n') else line for line in read_file)
+    else:
+        strings = get_random_strings(10000, args.length, ['a', 'b', 'c', 'd'], random.Random(args.seed))
+    report = asyncio.run(run_load(strings, args.host, args.port, args.path, connections=args.connections,
+                                  requests=args.requests, pipeline=args.pipeline))
+    print(json.dumps(report, indent=2))
+    return 0
@@ -0,0 +1,383 @@
+""" Deterministic finite state machine built by Brzozowski derivatives of a regular expression.
+    Regular expressions are represented by interned immutable nodes: equal expressions are one object,
+    so identical sub-expressions of generated patterns are stored once and nodes can be compared
+    and hashed by identity. Smart constructors normalize expressions:
+        '|' is associative, commutative and idempotent, the empty language is its identity;
+        '.' is associative (chains are nested to the right), ε is its identity, the empty language is its zero;
+        (r*)* = r*, ε* = ∅* = ε.
+    The derivative of r by the symbol a is the expression of words w such that aw is matched by r.
+    Every distinct derivative is a state of the DFSM, the normalization makes the number of them finite
+    and usually close to the number of states of the minimal DFSM.
+    The operation '*' of the regular expression in JSON format means one or more repetitions
+    (as in EilenbergMachine), it is represented as r.r* with the Kleene star.
+"""
+import weakref
+from itertools import count
+
+from . import instrumentation
+from .DFSM import DFSM
+from .charClasses import CharClass, get_atom_label, split_labels
+
+# the dictionary contains pairs: the description of the node (key, arguments) and the node
+_nodes = weakref.WeakValueDictionary()
+# the source of numbers of nodes, arguments of '|' are sorted by them
+_numbers = count()
+
+
+class RegexNode:
+    """ Class representing immutable interned node of a regular expression.
+        Nodes are created by the smart constructors (atom, star, plus, concat, union), not by the constructor.
+        Attributes are
+            key: str -- 'empty' (the empty language), 'eps' (the empty word), 'atm', '*' (the Kleene star),
+                '.' or '|'
+            args: tuple -- the label of transitions (str or CharClass) for 'atm', the arguments for operations:
+                one argument of '*', two arguments of '.', two or more sorted arguments of '|'
+            nullable: bool -- True if the expression matches the empty word
+    """
+
+    __slots__ = ('key', 'args', 'nullable', 'number', '__weakref__')
+
+    def __init__(self, key: str, args: tuple, nullable: bool):
+        set_attribute = object.__setattr__
+        set_attribute(self, 'key', key)
+        set_attribute(self, 'args', args)
+        set_attribute(self, 'nullable', nullable)
+        set_attribute(self, 'number', next(_numbers))
+
+    def __setattr__(self, name, value):
+        raise AttributeError("RegexNode is immutable")
+
+    def __lt__(self, other) -> bool:
+        return self.number < other.number
+
+
+def _make_node(key: str, args: tuple, nullable: bool) -> RegexNode:
+    """ The function returns the interned node, it is created if there is no equal node """
+    node = _nodes.get((key, args))
+    if node is None:
+        node = RegexNode(key, args, nullable)
+        _nodes[(key, args)] = node
+    return node
+
+
+# the empty language and the language of the empty word
+EMPTY = _make_node('empty', (), False)
+EPSILON = _make_node('eps', (), True)
+
+
+def atom(label) -> RegexNode:
+    """ The function returns the node of the atom
+        :param label: str or CharClass -- the label of transitions (see charClasses.get_atom_label)
+    """
+    return _make_node('atm', (label,), False)
+
+
+def star(node: RegexNode) -> RegexNode:
+    """ The function returns the node of the Kleene star: zero or more repetitions of 'node' """
+    if node.key == '*':
+        return node
+    if node is EMPTY or node is EPSILON:
+        return EPSILON
+    return _make_node('*', (node,), True)
+
+
+def plus(node: RegexNode) -> RegexNode:
+    """ The function returns the node of one or more repetitions of 'node', r.r* """
+    return concat(node, star(node))
+
+
+def concat(fst: RegexNode, snd: RegexNode) -> RegexNode:
+    """ The function returns the node of the concatenation, chains of '.' are nested to the right """
+    if fst is EMPTY or snd is EMPTY:
+        return EMPTY
+    if fst is EPSILON:
+        return snd
+    if snd is EPSILON:
+        return fst
+    # the arguments of the chain fst are joined to snd from the right end
+    arguments = []
+    while fst.key == '.':
+        arguments.append(fst.args[0])
+        fst = fst.args[1]
+    arguments.append(fst)
+    result = snd
+    for argument in reversed(arguments):
+        result = _make_node('.', (argument, result), argument.nullable and result.nullable)
+    return result
+
+
+def union(fst: RegexNode, snd: RegexNode) -> RegexNode:
+    """ The function returns the node of the union, its arguments are the distinct arguments
+        of both nodes sorted by numbers (so a|b and b|a, a|a and a, (a|b)|c and a|(b|c) are the same nodes)
+    """
+    return union_all((fst, snd))
+
+
+def union_all(nodes) -> RegexNode:
+    """ The function returns the node of the union of all nodes (see union).
+        Arguments are sorted once, so the union of n nodes takes O(n log n) time.
+        :param nodes: iterable of RegexNode -- the nodes
+        :return: RegexNode -- the node of the union
+    """
+    arguments = set()
+    for node in nodes:
+        if node.key == '|':
+            arguments.update(node.args)
+        elif node is not EMPTY:
+            arguments.add(node)
+    if not arguments:
+        return EMPTY
+    if len(arguments) == 1:
+        return arguments.pop()
+    arguments = tuple(sorted(arguments))
+    return _make_node('|', arguments, any(node.nullable for node in arguments))
+
+
+def from_json(reg_expr: dict) -> RegexNode:
+    """ The function converts the regular expression in JSON format to the interned node.
+        The expression is traversed in postorder with an explicit stack.
+        A chain of operations '|' (or '.') is converted at once: the union of its arguments is built
+        by one sort, the concatenation is built from the right end, so long chains take O(n log n) time.
+        :param reg_expr: dict -- the regular expression represented in JSON format in dict.
+        :return: RegexNode -- the node of the regular expression
+    """
+    # nodes of converted sub-expressions, arguments of an operation are on the top
+    nodes = []
+    # items of the stack: (the sub-expression, None) to convert it
+    # or (the sub-expression, the number of arguments of its chain) to build it from converted arguments
+    stack = [(reg_expr, None)]
+    while stack:
+        item, number_arguments = stack.pop()
+        key = item['key']
+        value = item['val']
+        if key == 'atm':
+            nodes.append(atom(get_atom_label(value)))
+        elif number_arguments is None:
+            if key == '*':
+                stack.append((item, 1))
+                stack.append((value, None))
+                continue
+            # arguments of the chain of operations 'key' in order from left to right
+            arguments = []
+            chain = [item]
+            while chain:
+                element = chain.pop()
+                if element['key'] == key:
+                    chain.append(element['val']['snd'])
+                    chain.append(element['val']['fst'])
+                else:
+                    arguments.append(element)
+            stack.append((item, len(arguments)))
+            stack.extend((argument, None) for argument in reversed(arguments))
+        elif key == '*':
+            nodes.append(plus(nodes.pop()))
+        else:
+            arguments = nodes[-number_arguments:]
+            del nodes[-number_arguments:]
+            if key == '|':
+                nodes.append(union_all(arguments))
+            else:
+                result = arguments.pop()
+                while arguments:
+                    result = concat(arguments.pop(), result)
+                nodes.append(result)
+    return nodes.pop()
+
+
+def get_labels(node: RegexNode) -> list:
+    """ The function returns distinct labels of atoms of the expression in order of their first appearance """
+    labels = {}
+    visited = set()
+    stack = [node]
+    while stack:
+        node = stack.pop()
+        if node in visited:
+            continue
+        visited.add(node)
+        if node.key == 'atm':
+            labels.setdefault(node.args[0], None)
+        else:
+            stack.extend(reversed(node.args))
+    return list(labels)
+
+
+def derivative(node: RegexNode, symbol, cache: dict = None) -> RegexNode:
+    """ The function returns the derivative of the expression by the symbol.
+        Sub-expressions are traversed in postorder with an explicit stack,
+        so the depth of the expression is not limited by the recursion limit.
+        :param node: RegexNode -- the expression
+        :param symbol: str or CharClass -- the symbol. A CharClass symbol is a piece of split_labels:
+            it is contained in the label of an atom or does not intersect it.
+        :param cache: dict -- derivatives of sub-expressions by the symbol, keys are nodes
+        :return: RegexNode -- the derivative
+    """
+    if cache is None:
+        cache = {}
+    char = chr(symbol.ranges[0][0]) if isinstance(symbol, CharClass) else symbol
+    stack = [node]
+    while stack:
+        current = stack[-1]
+        if current in cache:
+            stack.pop()
+            continue
+        key = current.key
+        # the derivative of '.' depends on the derivative of the second argument only if the first one is nullable
+        if key == '.' and not current.args[0].nullable:
+            arguments = current.args[:1]
+        elif key in ('*', '.', '|'):
+            arguments = current.args
+        else:
+            arguments = ()
+        missing = [argument for argument in arguments if argument not in cache]
+        if missing:
+            stack.extend(missing)
+            continue
+        stack.pop()
+
+        if key == 'atm':
+            label = current.args[0]
+            matched = label == char or (isinstance(label, CharClass) and char in label)
+            result = EPSILON if matched else EMPTY
+        elif key == '*':
+            result = concat(cache[current.args[0]], current)
+        elif key == '.':
+            fst, snd = current.args
+            result = concat(cache[fst], snd)
+            if fst.nullable:
+                result = union(result, cache[snd])
+        elif key == '|':
+            result = union_all(cache[argument] for argument in current.args)
+        else:
+            result = EMPTY
+        cache[current] = result
+    return cache[node]
+
+
+class DerivativeDFSM:
+    """ Class representing deterministic finite state machine, whose states are derivatives
+        of the regular expression. States are created lazily: when matching first reaches them
+        or when the full DFSM is built by to_dfsm().
+        Constructor parameters are
+            1.reg_expr -- the regular expression represented in JSON format in dict or RegexNode
+        States are numbered starting at 0 in order of their creation, 0 is the initial state (the expression).
+        Symbols of the DFSM are the disjoint pieces of labels of atoms (see charClasses.split_labels).
+    """
+
+    def __init__(self, reg_expr):
+        if not isinstance(reg_expr, RegexNode):
+            reg_expr = from_json(reg_expr)
+        pieces = split_labels(get_labels(reg_expr))
+        self.symbols = list(dict.fromkeys(piece for label_pieces in pieces.values() for piece in label_pieces))
+
+        # states[i] -- the derivative corresponding to state i
+        self.states = []
+        # The dictionary contains pairs: the derivative and the number of state
+        self._numbers = {}
+        # transitions[i] -- dict, mapping a symbol to the state to which it is possible to go from state i,
+        # -1 corresponds to the empty language (the dead state)
+        self._transitions = []
+        # derivatives of sub-expressions by every symbol
+        self._caches = {symbol: {} for symbol in self.symbols}
+        self.initial_state = self._get_state(reg_expr)
+
+        # the dictionary contains pairs: the character and the symbol containing it (None if there is no symbol)
+        self._char_symbols = {symbol: symbol for symbol in self.symbols if not isinstance(symbol, CharClass)}
+        self._class_symbols = [symbol for symbol in self.symbols if isinstance(symbol, CharClass)]
+
+    @property
+    def number_states(self) -> int:
+        """ The number of states created so far """
+        return len(self.states)
+
+    def accept(self, expr: str) -> bool:
+        """ The function distinguishes acceptable and non-acceptable input strings
+            :param expr: str -- input string
+            :return: acceptable and non-acceptable input strings
+        """
+        stats = instrumentation.active
+        if stats is not None:
+            expr = stats.count_steps('derivative_dfsm', expr)
+        state = self.initial_state
+        for char in expr:
+            symbol = self._get_symbol(char)
+            if symbol is None:
+                return False
+            to_state = self._transitions[state].get(symbol)
+            if to_state is None:
+                to_state = self._add_transition(state, symbol)
+            if to_state == -1:
+                return False
+            state = to_state
+        return self.states[state].nullable
+
+    def to_dfsm(self) -> DFSM:
+        """ The function creates all states reachable from the initial state and returns the DFSM
+            :return: DFSM -- deterministic finite state machine accepting words matched by the expression
+        """
+        state = 0
+        while state < len(self.states):
+            for symbol in self.symbols:
+                if symbol not in self._transitions[state]:
+                    self._add_transition(state, symbol)
+            state += 1
+
+        transitions_between_states = []
+        for transitions in self._transitions:
+            transitions_between_states.append([(to_state, symbol) for symbol, to_state in transitions.items()
+                                               if to_state != -1])
+        acceptable_states = [i for i, node in enumerate(self.states) if node.nullable]
+        return DFSM(list(self.symbols), len(self.states), transitions_between_states,
+                    self.initial_state, acceptable_states)
+
+    def _get_symbol(self, char: str):
+        """ The function returns the symbol containing the character or None """
+        if char in self._char_symbols:
+            return self._char_symbols[char]
+        symbol = None
+        for char_class in self._class_symbols:
+            if char in char_class:
+                symbol = char_class
+                break
+        self._char_symbols[char] = symbol
+        return symbol
+
+    def _get_state(self, node: RegexNode) -> int:
+        """ The function returns the number of state of the derivative, the state is created if it is new """
+        if node is EMPTY:
+            return -1
+        state = self._numbers.get(node)
+        if state is None:
+            state = len(self.states)
+            self.states.append(node)
+            self._numbers[node] = state
+            self._transitions.append({})
+            stats = instrumentation.active
+            if stats is not None:
+                stats.add('match.derivative_dfsm.states_created')
+        return state
+
+    def _add_transition(self, state: int, symbol) -> int:
+        """ The function computes the transition from the state with the symbol """
+        to_state = self._get_state(derivative(self.states[state], symbol, self._caches[symbol]))
+        self._transitions[state][symbol] = to_state
+        return to_state
+
+
+if __name__ == '__main__':
+    """
+        Testing of the DFSM built by derivatives
+        Testing regular expression is ((a|b*)*.((d*.e)|c)).(b|a)*
+    """
+    from .EilenbergMachine import get_data_from_json_file
+    from .regexConversions import conversion_reg_expr_to_json
+
+    print(union(atom('a'), atom('b')) is union(atom('b'), union(atom('a'), atom('a'))))  # True
+
+    lazy_machine = DerivativeDFSM(get_data_from_json_file("reg_expr.json"))
+    for expr in ["ac", "bbbda", "abab", "abbddeaaab", "bdea", "bbcbb"]:
+        print(expr, lazy_machine.accept(expr))  # False False False True True True
+    machine = lazy_machine.to_dfsm()
+    print(lazy_machine.number_states, machine.number_states)
+
+    machine = DerivativeDFSM(conversion_reg_expr_to_json("[a-z]*.[0-9]")).to_dfsm()
+    print(machine.number_states, machine.accept("abc7"), machine.accept("abc"))  # 3 True False
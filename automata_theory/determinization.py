@@ -0,0 +1,196 @@
+""" Subset construction turning an Eilenberg machine into a deterministic finite state machine.
+    Two modes are implemented:
+        eager -- the function determinize builds the full transition table of the DFSM
+        lazy -- the class LazyDFSM creates states of the DFSM only when matching first reaches them
+"""
+from itertools import chain, islice
+
+from . import instrumentation
+from .DFSM import DFSM
+from .EilenbergMachine import EilenbergMachine
+from .charClasses import split_labels
+
+
+def determinize(e_machine: EilenbergMachine) -> DFSM:
+    """ The function builds the deterministic finite state machine
+        accepting exactly the words accepted by the Eilenberg machine.
+        :param e_machine: EilenbergMachine -- the Eilenberg machine
+        :return: DFSM -- resulting deterministic finite state machine
+    """
+    return subset_construction(e_machine)[0]
+
+
+def subset_construction(e_machine: EilenbergMachine) -> tuple:
+    """ The function builds the deterministic finite state machine by the subset construction.
+        Only subsets reachable from the set of initial states are built, the empty subset
+        is not a state (there is no transition instead of a transition to the dead state).
+        Overlapping labels (characters and character classes) are split into disjoint pieces,
+        which are the symbols of the DFSM, so classes are not expanded into characters.
+        :param e_machine: EilenbergMachine -- the Eilenberg machine
+        :return: tuple (DFSM, list) -- resulting deterministic finite state machine and the list,
+            whose i-th item is the frozenset of states of the Eilenberg machine corresponding to state i
+    """
+    symbol_index = e_machine._get_symbol_index()
+    class_index = e_machine._class_index
+    acceptable_set = e_machine._get_acceptable_set()
+
+    # the dictionary contains pairs: the label of transitions and the list of its disjoint pieces
+    pieces = split_labels(character for transitions in e_machine.transitions_between_states
+                          for (state, character) in transitions)
+
+    # the list of symbols in order of their first appearance
+    alphabet = []
+    known_symbols = set()
+
+    subsets = [frozenset(e_machine.initial_states)]
+    # The dictionary contains pairs: the subset of states and the number of state in the resulting DFSM
+    numbers = {subsets[0]: 0}
+    transitions_between_states = []
+
+    number = 0
+    while number < len(subsets):
+        # all transitions from the subset grouped by symbol
+        moves = {}
+        for state in subsets[number]:
+            for label, targets in chain(symbol_index[state].items(), class_index[state] if class_index else ()):
+                for char in pieces[label]:
+                    moves.setdefault(char, set()).update(targets)
+
+        transitions = []
+        for char, targets in moves.items():
+            if char not in known_symbols:
+                known_symbols.add(char)
+                alphabet.append(char)
+            targets = frozenset(targets)
+            to_state = numbers.get(targets)
+            if to_state is None:
+                to_state = len(subsets)
+                numbers[targets] = to_state
+                subsets.append(targets)
+            transitions.append((to_state, char))
+        transitions_between_states.append(transitions)
+        number += 1
+
+    acceptable_states = [i for i, subset in enumerate(subsets) if not subset.isdisjoint(acceptable_set)]
+
+    stats = instrumentation.active
+    if stats is not None:
+        stats.add('determinize.states', len(subsets))
+        stats.add('determinize.transitions', sum(len(transitions) for transitions in transitions_between_states))
+    return DFSM(alphabet, len(subsets), transitions_between_states, 0, acceptable_states), subsets
+
+
+class LazyDFSM:
+    """ Class representing deterministic finite state machine built from an Eilenberg machine
+        on demand: a state is created when matching first reaches it.
+        Constructor parameters are
+            1.e_machine: EilenbergMachine -- the Eilenberg machine
+            2.max_states: int -- the bound on the number of states of the DFSM.
+                When the bound is reached, new states are not created any more
+                and matching continues by simulation of the Eilenberg machine.
+        States are numbered starting at 0 in order of their creation, 0 is the initial state.
+    """
+
+    def __init__(self, e_machine: EilenbergMachine, max_states: int = 10000):
+        self.e_machine = e_machine
+        self.max_states = max_states
+        # the number of inputs finished by simulation of the Eilenberg machine
+        self.fallbacks = 0
+
+        # subsets[i] -- the frozenset of states of the Eilenberg machine corresponding to state i
+        self._subsets = []
+        # The dictionary contains pairs: the subset of states and the number of state
+        self._numbers = {}
+        # transitions[i] -- dict, mapping a symbol to the state to which it is possible to go from state i.
+        # -1 corresponds to the empty subset (the dead state).
+        self._transitions = []
+        self._acceptable = []
+
+        self.initial_state = self._add_state(frozenset(e_machine.initial_states))
+
+    @property
+    def number_states(self) -> int:
+        """ The number of states created so far """
+        return len(self._subsets)
+
+    def accept(self, expr: str) -> bool:
+        """ The function distinguishes acceptable and non-acceptable input strings
+            :param expr: str -- input string
+            :return: acceptable and non-acceptable input strings
+        """
+        state = self.initial_state
+        for i, char in enumerate(expr):
+            to_state = self._transitions[state].get(char)
+            if to_state is None:
+                to_state, subset = self._add_transition(state, char)
+                if to_state is None:
+                    # the bound on the number of states is reached, the simulation continues
+                    # from the subset already computed for the symbol
+                    self.fallbacks += 1
+                    if instrumentation.active is not None:
+                        instrumentation.active.add('match.lazy_dfsm.fallbacks')
+                    return self._simulate(subset, expr, i + 1)
+            if to_state == -1:
+                return False
+            state = to_state
+        return self._acceptable[state]
+
+    def _add_state(self, subset: frozenset) -> int:
+        """ The function creates the state corresponding to the subset and returns its number """
+        number = len(self._subsets)
+        self._subsets.append(subset)
+        self._numbers[subset] = number
+        self._transitions.append({})
+        self._acceptable.append(not subset.isdisjoint(self.e_machine._get_acceptable_set()))
+        stats = instrumentation.active
+        if stats is not None:
+            stats.add('match.lazy_dfsm.states_created')
+        return number
+
+    def _add_transition(self, state: int, char: str):
+        """ The function computes the transition from the state with the symbol 'char'.
+            :return: tuple (to_state, subset) -- the number of the state to which it is possible to go,
+                -1 for the dead state or None if the state is not created because the bound on the number
+                of states is reached, and the subset of states of the Eilenberg machine corresponding to it
+        """
+        subset = frozenset(self.e_machine._step(self._subsets[state], char))
+        if not subset:
+            to_state = -1
+        else:
+            to_state = self._numbers.get(subset)
+            if to_state is None:
+                if len(self._subsets) >= self.max_states:
+                    return None, subset
+                to_state = self._add_state(subset)
+        self._transitions[state][char] = to_state
+        return to_state, subset
+
+    def _simulate(self, states: frozenset, expr: str, position: int) -> bool:
+        """ The function finishes matching of the input string from the position by simulation
+            of the Eilenberg machine starting at the set of states 'states'
+        """
+        for char in islice(expr, position, None):
+            states = self.e_machine._step(states, char)
+            if not states:
+                return False
+        return not states.isdisjoint(self.e_machine._get_acceptable_set())
+
+
+if __name__ == '__main__':
+    """
+        Testing of the subset construction
+        Testing regular expression is ((a|b*)*.((d*.e)|c)).(b|a)*
+    """
+    from .EilenbergMachine import get_data_from_json_file
+
+    e_machine = EilenbergMachine.get_Eilenberg_machine(get_data_from_json_file("reg_expr.json"))
+
+    machine = determinize(e_machine)
+    print(machine.number_states)
+    print(machine.transitions_between_states)
+    print(machine.acceptable_states)
+
+    lazy_machine = LazyDFSM(e_machine, max_states=4)
+    for expr in ["ac", "bbbda", "abab", "abbddeaaab", "aca", "bdea", "bbcbb"]:
+        print(expr, machine.accept(expr), lazy_machine.accept(expr))  # False False False True True True True
+    print(lazy_machine.number_states, lazy_machine.fallbacks)
@@ -0,0 +1,219 @@
+""" The position (Glushkov) automaton of a regular expression with bit-parallel simulation.
+    Every atom of the regular expression is a position, the states of the automaton are the positions
+    and the start. The automaton is built directly from the regular expression in JSON format
+    by computing the sets first, last and follow of positions.
+    A set of states is one int used as a bitmask (the bit p is the position p, the bit 0 is the start),
+    so one step of matching is follow(mask) & char_mask(char) without loops over states.
+    Positions are numbered from left to right, so most of them are followed by the next position:
+    such transitions are done for all states at once by the shift of the mask, only other transitions
+    are looked up in tables of follow sets built for blocks of bits.
+    As in EilenbergMachine, the operation '*' means one or more repetitions, so no expression accepts
+    the empty word and the start is never acceptable. Unlike EilenbergMachine, which merges all initial
+    states of the second argument of '.', the position automaton accepts exactly the words of the expression:
+    "aca" is not accepted for (a*|b).(a|c*).
+"""
+from . import instrumentation
+from .EilenbergMachine import EilenbergMachine
+from .charClasses import CharClass, get_atom_label
+
+# the number of bits of a block of the mask, follow sets are united by blocks
+BLOCK_BITS = 8
+_BLOCK_MASK = (1 << BLOCK_BITS) - 1
+
+
+class GlushkovMachine:
+    """ Class representing position (Glushkov) automaton.
+        Constructor parameters are
+            1.labels: list -- labels[p - 1] is the label of the position p (a character or CharClass),
+                positions are numbered starting at 1, the state 0 is the start.
+            2.follow: list -- follow[p] is the bitmask of positions which can follow the position p,
+                follow[0] is the bitmask of first positions.
+            3.last: int -- the bitmask of last positions, they are acceptable states.
+    """
+
+    def __init__(self, labels: list, follow: list, last: int):
+        self.labels = labels
+        self.follow = follow
+        self.last = last
+
+        # the dictionary contains pairs: the character and the bitmask of positions labelled by it
+        self._char_masks = {}
+        # pairs (CharClass, bitmask of positions labelled by it)
+        class_masks = {}
+        for p, label in enumerate(labels, 1):
+            if isinstance(label, CharClass):
+                class_masks[label] = class_masks.get(label, 0) | (1 << p)
+            else:
+                self._char_masks[label] = self._char_masks.get(label, 0) | (1 << p)
+        self._class_masks = list(class_masks.items())
+        # masks of characters belonging to classes are computed on the first use
+        self._class_char_masks = {}
+
+        # shift_mask -- the bitmask of states p followed by the position p + 1,
+        # jumps[p] -- the follow set of p without the position p + 1,
+        # jump_mask -- the bitmask of states p with non-empty jumps[p]
+        self._shift_mask = 0
+        self._jumps = []
+        self._jump_mask = 0
+        for p, follow_set in enumerate(follow):
+            next_position = 1 << (p + 1)
+            if follow_set & next_position:
+                self._shift_mask |= 1 << p
+            self._jumps.append(follow_set & ~next_position)
+            if self._jumps[p]:
+                self._jump_mask |= 1 << p
+        # block_jumps[k][b] is the union of jumps of states BLOCK_BITS * k + i for bits i of b,
+        # items are computed on the first use
+        self._block_jumps = [{} for _ in range((len(follow) + BLOCK_BITS - 1) // BLOCK_BITS)]
+
+    @property
+    def number_positions(self) -> int:
+        """ The number of positions (atoms of the regular expression) """
+        return len(self.labels)
+
+    def accept(self, expr: str) -> bool:
+        """ The function distinguishes acceptable and non-acceptable input strings
+            :param expr: str -- input string
+            :return: acceptable and non-acceptable input strings
+        """
+        stats = instrumentation.active
+        if stats is not None:
+            return self._accept_instrumented(expr, stats)
+        mask = 1
+        for char in expr:
+            mask = self._follow_mask(mask) & self._get_char_mask(char)
+            if not mask:
+                return False
+        return mask & self.last != 0
+
+    def _accept_instrumented(self, expr: str, stats) -> bool:
+        """ The function accept recording steps and the peak number of active positions (see instrumentation) """
+        mask = 1
+        peak_active = 1
+        for char in stats.count_steps('glushkov', expr):
+            mask = self._follow_mask(mask) & self._get_char_mask(char)
+            peak_active = max(peak_active, bin(mask).count('1'))
+            if not mask:
+                break
+        stats.peak('match.glushkov.peak_active', peak_active)
+        return mask & self.last != 0
+
+    def _follow_mask(self, mask: int) -> int:
+        """ The function returns the union of follow sets of the states of the bitmask.
+            Only non-zero blocks of states having jumps are visited.
+        """
+        block_jumps = self._block_jumps
+        result = (mask & self._shift_mask) << 1
+        mask &= self._jump_mask
+        while mask:
+            k = ((mask & -mask).bit_length() - 1) // BLOCK_BITS
+            shift = k * BLOCK_BITS
+            bits = (mask >> shift) & _BLOCK_MASK
+            mask ^= bits << shift
+            jumps = block_jumps[k].get(bits)
+            if jumps is None:
+                jumps = 0
+                for i in range(BLOCK_BITS):
+                    if bits >> i & 1:
+                        jumps |= self._jumps[shift + i]
+                block_jumps[k][bits] = jumps
+            result |= jumps
+        return result
+
+    def _get_char_mask(self, char: str) -> int:
+        """ The function returns the bitmask of positions, whose label matches the character """
+        if not self._class_masks:
+            return self._char_masks.get(char, 0)
+        mask = self._class_char_masks.get(char)
+        if mask is None:
+            mask = self._char_masks.get(char, 0)
+            for char_class, class_mask in self._class_masks:
+                if char in char_class:
+                    mask |= class_mask
+            self._class_char_masks[char] = mask
+        return mask
+
+    def to_Eilenberg_machine(self) -> EilenbergMachine:
+        """ The function returns the Eilenberg machine with the same states and transitions:
+            the state p goes to the position q labelled by a if q follows p, the transition is labelled by a.
+            :return: EilenbergMachine -- the Eilenberg machine accepting the same words
+        """
+        transitions_between_states = []
+        for p in range(len(self.follow)):
+            transitions_between_states.append([(q, self.labels[q - 1]) for q in _get_bits(self.follow[p])])
+        return EilenbergMachine(len(self.follow), transitions_between_states, [0], _get_bits(self.last))
+
+    @staticmethod
+    def get_Glushkov_machine(reg_expr: dict):
+        """ Static function that returned the position automaton accepting exactly words
+            corresponding to the input regular expression.
+            The expression is traversed in postorder with an explicit stack.
+            :param reg_expr: dict - the regular expression represented in JSON format in dict.
+            :return: GlushkovMachine -- resulting position automaton
+        """
+        labels = []
+        # follow[p] for positions p, follow[0] is set at the end
+        follow = [0]
+        # pairs (first, last) of bitmasks of built sub-expressions, arguments of an operation are on the top
+        first_last = []
+        stack = [(reg_expr, False)]
+        while stack:
+            node, visited = stack.pop()
+            key = node['key']
+            value = node['val']
+
+            if key == 'atm':
+                labels.append(get_atom_label(value))
+                follow.append(0)
+                position = 1 << len(labels)
+                first_last.append((position, position))
+            elif not visited:
+                stack.append((node, True))
+                if key == '*':
+                    stack.append((value, False))
+                else:
+                    stack.append((value['snd'], False))
+                    stack.append((value['fst'], False))
+            elif key == '*':
+                # the last positions of the argument can be followed by its first positions
+                first, last = first_last[-1]
+                for p in _get_bits(last):
+                    follow[p] |= first
+            else:
+                first_snd, last_snd = first_last.pop()
+                first_fst, last_fst = first_last.pop()
+                if key == '.':
+                    # expressions do not accept the empty word, so first and last come from one argument
+                    for p in _get_bits(last_fst):
+                        follow[p] |= first_snd
+                    first_last.append((first_fst, last_snd))
+                else:
+                    first_last.append((first_fst | first_snd, last_fst | last_snd))
+
+        first, last = first_last.pop()
+        follow[0] = first
+        return GlushkovMachine(labels, follow, last)
+
+
+def _get_bits(mask: int) -> list:
+    """ The function returns the numbers of set bits of the bitmask in increasing order """
+    bits = []
+    while mask:
+        low = mask & -mask
+        bits.append(low.bit_length() - 1)
+        mask ^= low
+    return bits
+
+
+if __name__ == '__main__':
+    """
+        Testing of the position automaton
+        Testing regular expression is ((a|b*)*.((d*.e)|c)).(b|a)*
+    """
+    from .EilenbergMachine import get_data_from_json_file
+
+    machine = GlushkovMachine.get_Glushkov_machine(get_data_from_json_file("reg_expr.json"))
+    print(machine.number_positions)  # 7
+    for expr in ["ac", "bbbda", "", "abab", "abbddeaaab", "bdea", "bbcbb"]:
+        print(expr, machine.accept(expr))  # False False False False True True True
+    print(machine.to_Eilenberg_machine().accept("bbcbb"))  # True
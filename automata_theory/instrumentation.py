@@ -0,0 +1,159 @@
+""" Instrumentation of hot paths of the engines: construction, matching, reduction and the cache.
+    Counters are recorded only inside profile(). The recording Stats object is the module variable 'active',
+    an instrumented function reads it once into a local variable and records counters only if it is not None,
+    so the disabled instrumentation costs one lookup per call and nothing per symbol of the input.
+    Counters (names are 'area.counter'):
+        build.<operation>.calls, build.<operation>.states, build.<operation>.edges -- builders of Eilenberg
+            machines (operation is atom, asterisk, concat or or): states and transitions added to the machine
+            of the first argument by the operation
+        determinize.states, determinize.transitions -- the size of DFSMs built by the subset construction
+        match.<engine>.inputs, match.<engine>.steps -- the number of matched strings and of symbols matched
+            before the decision (engine is eilenberg, glushkov, dfsm, compiled_dfsm, derivative_dfsm)
+        match.<engine>.peak_active -- the maximal number of active states (eilenberg, glushkov)
+        match.<engine>.states_created -- states created by lazy DFSMs (lazy_dfsm, derivative_dfsm),
+        match.lazy_dfsm.fallbacks -- inputs finished by simulation of the Eilenberg machine
+        match.stream.chunks, match.stream.steps -- chunks and symbols fed to StreamMatchers
+        reduce.calls, reduce.rounds, reduce.splits, reduce.states_before, reduce.states_after -- reduce_dfsm:
+            rounds are splitters taken from the waiting set, splits are classes split by them
+        nfa_reduction.states_before, nfa_reduction.states_after, nfa_reduction.edges_before,
+        nfa_reduction.edges_after, nfa_reduction.duplicate_edges, nfa_reduction.trimmed_states,
+        nfa_reduction.merged_forward, nfa_reduction.merged_backward -- reduce_Eilenberg_machine
+        cache.hits, cache.misses, cache.evictions -- RegexCache
+    Stats.as_dict adds derived values: match.<engine>.steps_per_input and cache.hit_rate.
+    The variable 'active' is global for the process, so threads profiled at the same time share counters.
+"""
+import time
+
+# the Stats object recording counters, None if the instrumentation is disabled
+active = None
+
+
+class Stats:
+    """ Class representing counters recorded by the instrumentation.
+        Attributes are
+            counters: dict -- mapping names of counters to sums of recorded values
+            peaks: dict -- mapping names of counters to maximums of recorded values
+            elapsed: float -- the time in seconds spent inside profile() with this object
+    """
+
+    def __init__(self):
+        self.counters = {}
+        self.peaks = {}
+        self.elapsed = 0.0
+
+    def add(self, name: str, value: int = 1):
+        """ The function adds the value to the counter """
+        self.counters[name] = self.counters.get(name, 0) + value
+
+    def peak(self, name: str, value: int):
+        """ The function records the value of the counter keeping the maximum """
+        if value > self.peaks.get(name, 0):
+            self.peaks[name] = value
+
+    def count_steps(self, engine: str, expr):
+        """ The generator of symbols of the input counting them as steps of the engine.
+            It replaces the input of the loop of matching, so symbols are counted only when they are matched.
+            :param engine: str -- the name of the engine
+            :param expr: iterable of symbols -- the input
+        """
+        counters = self.counters
+        self.add('match.' + engine + '.inputs')
+        name = 'match.' + engine + '.steps'
+        counters.setdefault(name, 0)
+        for char in expr:
+            counters[name] += 1
+            yield char
+
+    def merge(self, other):
+        """ The function adds counters of other Stats object to the counters """
+        for name, value in other.counters.items():
+            self.add(name, value)
+        for name, value in other.peaks.items():
+            self.peak(name, value)
+
+    def reset(self):
+        """ The function removes all counters """
+        self.counters.clear()
+        self.peaks.clear()
+        self.elapsed = 0.0
+
+    def get(self, name: str, default: int = 0):
+        """ The function returns the value of the counter or the derived value (see as_dict) """
+        return self.as_dict().get(name, default)
+
+    def as_dict(self) -> dict:
+        """ The function returns counters, peaks and derived values in one dictionary sorted by names """
+        result = dict(self.counters)
+        result.update(self.peaks)
+        for name, value in self.counters.items():
+            if name.startswith('match.') and name.endswith('.inputs') and value > 0:
+                engine = name[:-len('.inputs')]
+                result[engine + '.steps_per_input'] = self.counters.get(engine + '.steps', 0) / value
+        lookups = self.counters.get('cache.hits', 0) + self.counters.get('cache.misses', 0)
+        if lookups > 0:
+            result['cache.hit_rate'] = self.counters.get('cache.hits', 0) / lookups
+        result['elapsed'] = self.elapsed
+        return dict(sorted(result.items()))
+
+    def __repr__(self) -> str:
+        return 'Stats(' + repr(self.as_dict()) + ')'
+
+
+class Profiler:
+    """ Context manager enabling the instrumentation, counters are recorded into its Stats object.
+        Constructor parameters are
+            1.stats: Stats -- the object recording counters, a new one by default
+        Profilers can be nested: counters of the inner profiler are added to the outer one at the exit.
+    """
+
+    def __init__(self, stats: Stats = None):
+        self.stats = stats if stats is not None else Stats()
+        self._previous = None
+        self._start = 0.0
+
+    def __enter__(self) -> Stats:
+        global active
+        self._previous = active
+        active = self.stats
+        self._start = time.perf_counter()
+        return self.stats
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        global active
+        self.stats.elapsed += time.perf_counter() - self._start
+        active = self._previous
+        if self._previous is not None:
+            self._previous.merge(self.stats)
+        return False
+
+
+def profile(stats: Stats = None) -> Profiler:
+    """ The function returns the context manager recording counters of the engines:
+            with profile() as stats:
+                machine.accept(expr)
+            print(stats.as_dict())
+        :param stats: Stats -- the object recording counters, a new one by default
+        :return: Profiler -- the context manager, its value is the Stats object
+    """
+    return Profiler(stats)
+
+
+def get_stats() -> Stats:
+    """ The function returns the Stats object of the innermost active profiler or None """
+    return active
+
+
+if __name__ == '__main__':
+    """
+        Testing of the instrumentation
+        Testing regular expression is ((a|b*)*.((d*.e)|c)).(b|a)*
+    """
+    # engines record counters into the module imported by the package, not into the module __main__
+    from . import instrumentation
+    from .EilenbergMachine import EilenbergMachine, get_data_from_json_file
+
+    with instrumentation.profile() as stats:
+        machine = EilenbergMachine.get_Eilenberg_machine(get_data_from_json_file("reg_expr.json"))
+        machine.accept("abbddeaaab")
+    print(stats.get('build.atom.calls'), stats.get('match.eilenberg.steps'))  # 7 10
+    print(instrumentation.active is None, machine.accept("bdea"), stats.get('match.eilenberg.inputs'))  # True True 1
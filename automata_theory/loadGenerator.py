@@ -0,0 +1,118 @@
+""" Load generator of the matching service (see matchingService).
+    Connections send requests concurrently, every connection keeps at most 'pipeline' requests without responses.
+    The latency of a request is the time from sending it to reading its response, so it includes
+    the time of waiting for a batch and of matching it.
+"""
+import asyncio
+import collections
+import time
+
+
+def get_percentile(sorted_values: list, percent: float) -> float:
+    """ The function returns the percentile of the sorted values by the nearest-rank method
+        :param sorted_values: list -- the sorted values
+        :param percent: float -- the percent from 0 to 100
+        :return: float -- the value, 0.0 for empty list
+    """
+    if not sorted_values:
+        return 0.0
+    rank = max(int(-(-percent * len(sorted_values) // 100)), 1)
+    return sorted_values[min(rank, len(sorted_values)) - 1]
+
+
+async def run_load(strings: list, host: str = '127.0.0.1', port: int = None, path: str = None,
+                   connections: int = 8, requests: int = 10000, pipeline: int = 16) -> dict:
+    """ The function sends requests to the matching service and returns the report.
+        :param strings: list -- input strings, they are sent in turn
+        :param host: str -- the host of the TCP server
+        :param port: int -- the port of the TCP server
+        :param path: str -- the path of the Unix socket, it is used instead of TCP if it is given
+        :param connections: int -- the number of concurrent connections
+        :param requests: int -- the total number of requests
+        :param pipeline: int -- the maximal number of requests without responses on a connection
+        :return: dict -- the numbers of requests and accepted ones (non-empty responses),
+            the duration in seconds, the throughput in requests per second and latencies in milliseconds:
+            p50, p90, p99, max and mean
+    """
+    if not strings:
+        raise ValueError("no input strings")
+    latencies = []
+    accepted = [0]
+
+    async def run_connection(number: int, number_requests: int):
+        if path is not None:
+            reader, writer = await asyncio.open_unix_connection(path, limit=1 << 20)
+        else:
+            reader, writer = await asyncio.open_connection(host, port, limit=1 << 20)
+        # sending times of requests without responses
+        sent = collections.deque()
+        slots = asyncio.Semaphore(pipeline)
+
+        async def send():
+            for i in range(number_requests):
+                await slots.acquire()
+                expr = strings[(number + i * connections) % len(strings)]
+                sent.append(time.perf_counter())
+                writer.write(expr.encode('utf-8', errors='surrogateescape') + b'\n')
+                await writer.drain()
+
+        sending = asyncio.get_running_loop().create_task(send())
+        try:
+            for _ in range(number_requests):
+                line = await reader.readline()
+                if not line:
+                    raise ConnectionError("the service closed the connection")
+                latencies.append(time.perf_counter() - sent.popleft())
+                slots.release()
+                accepted[0] += line != b'\n'
+            await sending
+        finally:
+            sending.cancel()
+            writer.close()
+            await writer.wait_closed()
+
+    start = time.perf_counter()
+    await asyncio.gather(*(run_connection(number, requests // connections + (number < requests % connections))
+                           for number in range(connections)))
+    duration = time.perf_counter() - start
+
+    latencies.sort()
+    return {'requests': len(latencies), 'accepted': accepted[0], 'connections': connections, 'pipeline': pipeline,
+            'duration': duration, 'throughput': len(latencies) / duration if duration > 0 else 0.0,
+            'latency_ms': {'p50': get_percentile(latencies, 50) * 1000, 'p90': get_percentile(latencies, 90) * 1000,
+                           'p99': get_percentile(latencies, 99) * 1000,
+                           'max': latencies[-1] * 1000 if latencies else 0.0,
+                           'mean': sum(latencies) / len(latencies) * 1000 if latencies else 0.0}}
+
+
+if __name__ == '__main__':
+    """
+        Testing of the matching service with the load generator
+        Testing regular expressions are a.b* and (a|b)*.c
+    """
+    import os
+    import random
+    import tempfile
+
+    from .benchmarks import get_random_strings
+    from .matchingService import MatchingService
+    from .patternSet import PatternSet
+
+    async def main():
+        name_file = os.path.join(tempfile.mkdtemp(), 'patterns.atm')
+        PatternSet(["a.b*", "(a|b)*.c"]).save(name_file)
+        service = MatchingService(name_file, max_batch_size=64, max_latency=0.001)
+        host, port = await service.start()
+
+        reader, writer = await asyncio.open_connection(host, port)
+        writer.write(b'abb\nabc\nba\n')
+        await writer.drain()
+        print([(await reader.readline()).decode() for _ in range(3)])  # ['0\n', '1\n', '\n']
+        writer.close()
+
+        strings = get_random_strings(1000, 8, ['a', 'b', 'c'], random.Random(0))
+        report = await run_load(strings, host, port, connections=4, requests=5000, pipeline=32)
+        print(report['requests'], service.requests > service.batches)  # 5000 True
+        await service.close()
+
+    asyncio.run(main())
@@ -0,0 +1,289 @@
+""" Binary files of compiled machines.
+    A compiled DFSM (with IDs of patterns of its states, if any) or an Eilenberg machine is saved
+    in the versioned binary format. The file is loaded by mmap: the transition table and the bitmap
+    of acceptable states of a compiled DFSM are used in place through memoryview, nothing is parsed,
+    so many processes loading one file share one copy of it in the page cache.
+    The file consists of the header and sections of little-endian 32-bit integers:
+        header -- MAGIC, VERSION (16 bits), the kind of the machine (16 bits) and HEADER_FIELDS
+        alphabet -- records of symbols: the number of the column (the symbol), the type of the symbol
+            (0 -- string, 1 -- CharClass), the length and the code points of the string
+            or the pairs (first, last) of ranges of the class
+    compiled DFSM:
+        table -- number_states * number_columns states (as CompiledDFSM.table)
+        acceptable -- number_states bytes, 1 for acceptable states (as CompiledDFSM.acceptable)
+        pattern sets (if number_pattern_sets > 0) -- the number of the set of IDs of patterns of every state,
+            offsets of sets in the list of IDs (number_pattern_sets + 1 items) and the list of IDs
+    Eilenberg machine:
+        offsets of transitions of states (number_states + 1 items), pairs (the state, the symbol)
+        of transitions, initial states and acceptable (number_states bytes)
+    Sections are aligned to 4 bytes.
+"""
+import mmap
+import os
+import struct
+import sys
+from array import array
+
+from .DFSM import DFSM, CompiledDFSM
+from .EilenbergMachine import EilenbergMachine
+from .charClasses import CharClass
+
+MAGIC = b'ATMF'
+VERSION = 1
+
+# kinds of machines
+KIND_COMPILED_DFSM = 1
+KIND_EILENBERG_MACHINE = 2
+
+HEADER_FIELDS = ('number_states', 'number_symbols', 'alphabet_length', 'number_columns', 'initial_state',
+                 'number_transitions', 'number_initial_states', 'number_pattern_sets', 'number_pattern_ids')
+_HEADER = struct.Struct('<4sHH' + 'i' * len(HEADER_FIELDS))
+
+_SYMBOL_STRING = 0
+_SYMBOL_CLASS = 1
+
+
+class StatePatterns:
+    """ Class representing IDs of patterns of states of the DFSM loaded from the file.
+        Constructor parameters are
+            1.state_sets -- sequence of integers, state_sets[state] is the number of the set of IDs of 'state'
+            2.pattern_sets: list -- distinct sets of IDs (frozensets)
+        state_patterns[state] is the frozenset of IDs of patterns accepting in 'state',
+        only the distinct sets are built, the numbers of sets are used in place.
+    """
+
+    def __init__(self, state_sets, pattern_sets: list):
+        self.state_sets = state_sets
+        self.pattern_sets = pattern_sets
+
+    def __len__(self) -> int:
+        return len(self.state_sets)
+
+    def __getitem__(self, state: int) -> frozenset:
+        return self.pattern_sets[self.state_sets[state]]
+
+
+def save_machine(machine, name_file: str, state_patterns: list = None):
+    """ The function saves the machine in the binary format.
+        :param machine: CompiledDFSM, DFSM (it is compiled) or EilenbergMachine
+        :param name_file: str -- the name of the file
+        :param state_patterns: list -- state_patterns[state] is the set of integer IDs of patterns
+            accepting in 'state' (see PatternSet), only for DFSMs
+    """
+    if isinstance(machine, DFSM):
+        machine = machine.compile()
+    if isinstance(machine, CompiledDFSM):
+        header, sections = _get_compiled_dfsm_sections(machine, state_patterns)
+        kind = KIND_COMPILED_DFSM
+    elif isinstance(machine, EilenbergMachine):
+        if state_patterns is not None:
+            raise ValueError("IDs of patterns can be saved only for DFSMs")
+        header, sections = _get_Eilenberg_machine_sections(machine)
+        kind = KIND_EILENBERG_MACHINE
+    else:
+        raise TypeError("Unsupported machine: " + type(machine).__name__)
+
+    # the file is written under a temporary name and replaces the old file at once,
+    # so processes which mapped the old file continue to use it
+    temporary_name = name_file + '.tmp'
+    with open(temporary_name, 'wb') as write_file:
+        write_file.write(_HEADER.pack(MAGIC, VERSION, kind, *(header.get(field, 0) for field in HEADER_FIELDS)))
+        for section in sections:
+            if isinstance(section, array) and sys.byteorder != 'little':
+                section = array(section.typecode, section)
+                section.byteswap()
+            data = bytes(section)
+            write_file.write(data)
+            write_file.write(bytes(-len(data) % 4))
+    os.replace(temporary_name, name_file)
+
+
+def load_machine(name_file: str):
+    """ The function loads the machine saved by save_machine.
+        :param name_file: str -- the name of the file
+        :return: CompiledDFSM or EilenbergMachine
+    """
+    return read_machine_file(name_file)[0]
+
+
+def read_machine_file(name_file: str) -> tuple:
+    """ The function loads the machine and IDs of patterns of its states saved by save_machine.
+        The file is mapped into memory, the table and the bitmap of a compiled DFSM refer to the mapping.
+        :param name_file: str -- the name of the file
+        :return: tuple (CompiledDFSM or EilenbergMachine, StatePatterns or None)
+    """
+    with open(name_file, 'rb') as read_file:
+        data = memoryview(mmap.mmap(read_file.fileno(), 0, access=mmap.ACCESS_READ))
+    if len(data) < _HEADER.size:
+        raise ValueError("The file is too short: " + name_file)
+    magic, version, kind, *fields = _HEADER.unpack_from(data)
+    if magic != MAGIC:
+        raise ValueError("The file is not a machine file: " + name_file)
+    if version != VERSION:
+        raise ValueError("Unsupported version of the machine file: " + str(version))
+    header = dict(zip(HEADER_FIELDS, fields))
+
+    reader = _SectionReader(data, _HEADER.size)
+    symbols, symbol_numbers = _decode_alphabet(reader.read_integers(header['alphabet_length']),
+                                               header['number_symbols'])
+    number_states = header['number_states']
+
+    if kind == KIND_COMPILED_DFSM:
+        table = reader.read_integers(number_states * header['number_columns'])
+        acceptable = reader.read_bytes(number_states)
+        machine = CompiledDFSM(symbols, number_states, table, header['initial_state'], acceptable, symbol_numbers)
+        state_patterns = None
+        if header['number_pattern_sets'] > 0:
+            state_sets = reader.read_integers(number_states)
+            offsets = reader.read_integers(header['number_pattern_sets'] + 1)
+            ids = reader.read_integers(header['number_pattern_ids'])
+            pattern_sets = [frozenset(ids[offsets[i]:offsets[i + 1]]) for i in range(len(offsets) - 1)]
+            state_patterns = StatePatterns(state_sets, pattern_sets)
+        return machine, state_patterns
+
+    if kind == KIND_EILENBERG_MACHINE:
+        offsets = reader.read_integers(number_states + 1)
+        transitions = reader.read_integers(2 * header['number_transitions'])
+        initial_states = list(reader.read_integers(header['number_initial_states']))
+        acceptable = reader.read_bytes(number_states)
+        transitions_between_states = []
+        for s in range(number_states):
+            transitions_between_states.append([(transitions[k], symbols[transitions[k + 1]])
+                                               for k in range(2 * offsets[s], 2 * offsets[s + 1], 2)])
+        acceptable_states = [s for s in range(number_states) if acceptable[s]]
+        return EilenbergMachine(number_states, transitions_between_states, initial_states, acceptable_states), None
+
+    raise ValueError("Unsupported kind of the machine file: " + str(kind))
+
+
+class _SectionReader:
+    """ Reader of consecutive sections of the mapped file, sections are aligned to 4 bytes """
+
+    def __init__(self, data: memoryview, offset: int):
+        self.data = data
+        self.offset = offset
+
+    def read_bytes(self, size: int) -> memoryview:
+        """ The function returns the view of the next section of 'size' bytes """
+        if size < 0 or self.offset + size > len(self.data):
+            raise ValueError("The machine file is truncated or corrupted")
+        section = self.data[self.offset:self.offset + size]
+        self.offset += size + (-size % 4)
+        return section
+
+    def read_integers(self, number: int):
+        """ The function returns the next section of 'number' 32-bit integers:
+            the view of the file or its copy if the byte order of the machine is big-endian
+        """
+        section = self.read_bytes(4 * number).cast('i')
+        if sys.byteorder != 'little':
+            section = array('i', section)
+            section.byteswap()
+        return section
+
+
+def _get_compiled_dfsm_sections(machine: CompiledDFSM, state_patterns) -> tuple:
+    """ The function returns the fields of the header and the sections of the compiled DFSM """
+    alphabet = _encode_alphabet(machine.symbols, machine.symbol_columns)
+    header = {'number_states': machine.number_states, 'number_symbols': machine.number_symbols,
+              'alphabet_length': len(alphabet), 'number_columns': machine.number_columns,
+              'initial_state': machine.initial_state}
+    sections = [alphabet, array('i', machine.table), bytes(machine.acceptable)]
+
+    if state_patterns is not None:
+        # the dictionary contains pairs: the set of IDs and its number
+        set_numbers = {}
+        state_sets = array('i')
+        for ids in state_patterns:
+            ids = frozenset(ids)
+            if not all(isinstance(i, int) for i in ids):
+                raise ValueError("Only integer IDs of patterns can be saved")
+            state_sets.append(set_numbers.setdefault(ids, len(set_numbers)))
+        offsets = array('i', [0])
+        pattern_ids = array('i')
+        for ids in set_numbers:
+            pattern_ids.extend(sorted(ids))
+            offsets.append(len(pattern_ids))
+        header['number_pattern_sets'] = len(set_numbers)
+        header['number_pattern_ids'] = len(pattern_ids)
+        sections += [state_sets, offsets, pattern_ids]
+    return header, sections
+
+
+def _get_Eilenberg_machine_sections(e_machine: EilenbergMachine) -> tuple:
+    """ The function returns the fields of the header and the sections of the Eilenberg machine """
+    # the dictionary contains pairs: the symbol and its number
+    symbol_numbers = {}
+    offsets = array('i', [0])
+    transitions = array('i')
+    for s in range(e_machine.number_states):
+        for (state, character) in e_machine.transitions_between_states[s]:
+            transitions.append(state)
+            transitions.append(symbol_numbers.setdefault(character, len(symbol_numbers)))
+        offsets.append(len(transitions) // 2)
+
+    alphabet = _encode_alphabet(list(symbol_numbers), list(symbol_numbers.values()))
+    acceptable = bytearray(e_machine.number_states)
+    for s in e_machine.acceptable_states:
+        acceptable[s] = 1
+    header = {'number_states': e_machine.number_states, 'number_symbols': len(symbol_numbers),
+              'alphabet_length': len(alphabet), 'number_transitions': len(transitions) // 2,
+              'number_initial_states': len(e_machine.initial_states)}
+    return header, [alphabet, offsets, transitions, array('i', e_machine.initial_states), acceptable]
+
+
+def _encode_alphabet(symbols, numbers) -> array:
+    """ The function writes the records of symbols (see the format of the file) """
+    alphabet = array('i')
+    for symbol, number in zip(symbols, numbers):
+        if isinstance(symbol, CharClass):
+            alphabet.extend((number, _SYMBOL_CLASS, len(symbol.ranges)))
+            for first, last in symbol.ranges:
+                alphabet.extend((first, last))
+        else:
+            alphabet.extend((number, _SYMBOL_STRING, len(symbol)))
+            alphabet.extend(map(ord, symbol))
+    return alphabet
+
+
+def _decode_alphabet(alphabet, number_symbols: int) -> tuple:
+    """ The function reads the records of symbols
+        :return: tuple (list, list) -- symbols and their numbers (columns)
+    """
+    symbols = []
+    numbers = []
+    k = 0
+    for _ in range(number_symbols):
+        number, symbol_type, length = alphabet[k:k + 3]
+        k += 3
+        if symbol_type == _SYMBOL_CLASS:
+            symbols.append(CharClass(zip(alphabet[k:k + 2 * length:2], alphabet[k + 1:k + 2 * length:2])))
+            k += 2 * length
+        else:
+            symbols.append(''.join(map(chr, alphabet[k:k + length])))
+            k += length
+        numbers.append(number)
+    return symbols, numbers
+
+
+if __name__ == '__main__':
+    """
+        Testing of binary files of machines
+        Testing regular expression is ((a|b*)*.((d*.e)|c)).(b|a)*
+    """
+    import tempfile
+
+    from .EilenbergMachine import get_data_from_json_file
+    from .determinization import subset_construction
+
+    e_machine = EilenbergMachine.get_Eilenberg_machine(get_data_from_json_file("reg_expr.json"))
+    machine = subset_construction(e_machine)[0].compile()
+    with tempfile.TemporaryDirectory() as directory:
+        name_file = os.path.join(directory, "machine.bin")
+        save_machine(machine, name_file)
+        loaded_machine = load_machine(name_file)
+        print(loaded_machine.number_states == machine.number_states, os.path.getsize(name_file))
+        print([loaded_machine.accept(expr) for expr in ["ac", "abbddeaaab", "bdea"]])  # [False, True, True]
+
+        save_machine(e_machine, name_file)
+        print(load_machine(name_file).accept("bbcbb"))  # True
@@ -0,0 +1,318 @@
+""" Asyncio matching service. The compiled DFSM is loaded once from the binary file (see machineSerialization),
+    clients connect by localhost TCP or a Unix socket and send line-delimited requests.
+    Protocol: every request is one line -- the input string; for every request the service sends one line
+    in the same order: an empty line if the input is not accepted, otherwise '1' for a DFSM or the comma-separated
+    sorted IDs of accepting patterns for a set of patterns (see PatternSet.save).
+    A client may send many requests without waiting for responses.
+    Concurrent requests of all connections are coalesced into micro-batches: a batch is dispatched
+    when it has max_batch_size requests or when its first request has waited max_latency seconds.
+    Batches are matched on a pool of threads or processes (every process maps the file once),
+    so the event loop only reads requests and writes responses.
+"""
+import asyncio
+import concurrent.futures
+import sys
+
+from .machineSerialization import read_machine_file
+
+# the matcher of a process of the process pool, it is set by _init_worker
+_worker_matcher = None
+
+
+class BatchMatcher:
+    """ Class representing matcher of batches of input strings by the machine of the binary file.
+        Constructor parameters are
+            1.name_file: str -- the name of the binary file made by save_machine or PatternSet.save
+    """
+
+    def __init__(self, name_file: str):
+        self.machine, self.state_patterns = read_machine_file(name_file)
+
+    def match_batch(self, strings: list) -> list:
+        """ The function returns responses to the batch of input strings (see the protocol).
+            Final states of all strings are found at once (see CompiledDFSM.get_final_states),
+            the response of every distinct final state is made once.
+        """
+        machine = self.machine
+        states = machine.get_final_states(strings)
+        if not isinstance(states, list):
+            states = states.tolist()
+        dead_state = machine.DEAD_STATE
+        # the dictionary contains pairs: the final state and the response
+        responses = {dead_state: ''}
+        result = []
+        for state in states:
+            response = responses.get(state)
+            if response is None:
+                if self.state_patterns is not None:
+                    response = ','.join(map(str, sorted(self.state_patterns[state])))
+                else:
+                    response = '1' if machine.acceptable[state] == 1 else ''
+                responses[state] = response
+            result.append(response)
+        return result
+
+
+def _init_worker(name_file: str):
+    """ The function loads the machine in the process of the pool. Every pool has its own processes,
+        so the matcher inherited from the parent process (by fork) is replaced.
+    """
+    global _worker_matcher
+    _worker_matcher = BatchMatcher(name_file)
+
+
+def _match_batch_in_worker(strings: list) -> list:
+    """ The function matches the batch in the process of the pool """
+    return _worker_matcher.match_batch(strings)
+
+
+class MatchingService:
+    """ Class representing asyncio service matching line-delimited requests in micro-batches.
+        Constructor parameters are
+            1.name_file: str -- the name of the binary file of the machine
+            2.max_batch_size: int -- the maximal number of requests in a batch
+            3.max_latency: float -- the maximal time in seconds, for which the first request of a batch
+                waits for other requests
+            4.executor: str -- 'thread' or 'process', the pool matching batches
+            5.workers: int -- the number of workers of the pool, at most so many batches are matched at once
+        Counters of requests and batches are attributes of the service.
+    """
+
+    def __init__(self, name_file: str, max_batch_size: int = 256, max_latency: float = 0.002,
+                 executor: str = 'thread', workers: int = 2):
+        if executor not in ('thread', 'process'):
+            raise ValueError("Unknown executor: " + executor)
+        self.name_file = name_file
+        self.max_batch_size = max_batch_size
+        self.max_latency = max_latency
+        self.executor = executor
+        self.workers = workers
+        self.requests = 0
+        self.batches = 0
+        self.connections = 0
+
+        self._matcher = None
+        self._pool = None
+        self._server = None
+        self._batcher = None
+        # requests waiting for a batch: pairs (input string, future of the response)
+        self._pending = []
+        self._not_empty = None
+        self._full = None
+        self._slots = None
+        # tasks matching batches
+        self._tasks = set()
+        # tasks handling open connections and their writers
+        self._connections = {}
+
+    async def start(self, host: str = '127.0.0.1', port: int = 0, path: str = None):
+        """ The function loads the machine into the pool and starts listening.
+            :param host: str -- the host of the TCP server
+            :param port: int -- the port of the TCP server, 0 means any free port
+            :param path: str -- the path of the Unix socket, it is used instead of TCP if it is given
+            :return: the address of the server: (host, port) or the path
+        """
+        # the file is loaded before the pool is created, so a bad file raises the error without leaking the pool.
+        # Threads share the matcher of the service, every process of the process pool loads the file itself.
+        self._matcher = BatchMatcher(self.name_file)
+        if self.executor == 'thread':
+            self._pool = concurrent.futures.ThreadPoolExecutor(self.workers)
+        else:
+            self._pool = concurrent.futures.ProcessPoolExecutor(self.workers, initializer=_init_worker,
+                                                                initargs=(self.name_file,))
+
+        self._not_empty = asyncio.Event()
+        self._full = asyncio.Event()
+        self._slots = asyncio.Semaphore(self.workers)
+        self._batcher = asyncio.get_running_loop().create_task(self._run_batcher())
+        if path is not None:
+            self._server = await asyncio.start_unix_server(self._handle_connection, path, limit=1 << 20)
+            return path
+        self._server = await asyncio.start_server(self._handle_connection, host, port, limit=1 << 20)
+        return self._server.sockets[0].getsockname()[:2]
+
+    async def serve_forever(self):
+        """ The function serves clients until the task is cancelled """
+        try:
+            await self._server.serve_forever()
+        finally:
+            await self.close()
+
+    async def close(self):
+        """ The function closes connections and stops the server, the batcher and the pool """
+        if self._server is not None:
+            self._server.close()
+            for writer in self._connections.values():
+                writer.close()
+            await asyncio.gather(*self._connections, return_exceptions=True)
+            await self._server.wait_closed()
+            self._server = None
+        if self._batcher is not None:
+            self._batcher.cancel()
+            self._batcher = None
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
+
+    def stats(self) -> dict:
+        """ The function returns counters of the service """
+        return {'connections': self.connections, 'requests': self.requests, 'batches': self.batches,
+                'mean_batch_size': self.requests / self.batches if self.batches else 0.0}
+
+    def submit(self, expr: str) -> asyncio.Future:
+        """ The function adds the request to the next batch and returns the future of the response """
+        future = asyncio.get_running_loop().create_future()
+        self._pending.append((expr, future))
+        self._not_empty.set()
+        if len(self._pending) >= self.max_batch_size:
+            self._full.set()
+        return future
+
+    async def _handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        """ The function reads requests of the connection, responses are written by _write_responses
+            in order of requests
+        """
+        self.connections += 1
+        self._connections[asyncio.current_task()] = writer
+        responses = asyncio.Queue()
+        writing = asyncio.get_running_loop().create_task(self._write_responses(responses, writer))
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                if line.endswith(b'\n'):
+                    line = line[:-1]
+                responses.put_nowait(self.submit(line.decode('utf-8', errors='surrogateescape')))
+        except (ConnectionError, asyncio.LimitOverrunError, ValueError):
+            pass
+        except asyncio.CancelledError:
+            writing.cancel()
+            raise
+        finally:
+            del self._connections[asyncio.current_task()]
+        # responses to read requests are written before the connection is closed
+        responses.put_nowait(None)
+        await writing
+        writer.close()
+
+    @staticmethod
+    async def _write_responses(responses: asyncio.Queue, writer: asyncio.StreamWriter):
+        """ The function writes responses of the connection as they are ready, None ends the connection """
+        try:
+            while True:
+                future = await responses.get()
+                if future is None:
+                    break
+                response = await future
+                writer.write(response.encode('utf-8', errors='surrogateescape') + b'\n')
+                if responses.empty():
+                    await writer.drain()
+            await writer.drain()
+        except ConnectionError:
+            pass
+
+    async def _run_batcher(self):
+        """ The function forms batches of pending requests and dispatches them to the pool.
+            At most 'workers' batches are matched at once, requests coming meanwhile join the next batch.
+        """
+        while True:
+            await self._not_empty.wait()
+            if len(self._pending) < self.max_batch_size and self.max_latency > 0:
+                try:
+                    await asyncio.wait_for(self._full.wait(), self.max_latency)
+                except asyncio.TimeoutError:
+                    pass
+            await self._slots.acquire()
+            batch = self._pending[:self.max_batch_size]
+            del self._pending[:self.max_batch_size]
+            if not self._pending:
+                self._not_empty.clear()
+            if len(self._pending) < self.max_batch_size:
+                self._full.clear()
+            task = asyncio.get_running_loop().create_task(self._match_batch(batch))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    async def _match_batch(self, batch: list):
+        """ The function matches the batch in the pool and sets responses of its requests """
+        try:
+            self.requests += len(batch)
+            self.batches += 1
+            strings = [expr for expr, future in batch]
+            try:
+                match_batch = self._matcher.match_batch if self.executor == 'thread' else _match_batch_in_worker
+                results = await asyncio.get_running_loop().run_in_executor(self._pool, match_batch, strings)
+            except Exception as error:
+                for expr, future in batch:
+                    if not future.done():
+                        future.set_exception(error)
+                return
+            for (expr, future), result in zip(batch, results):
+                if not future.done():
+                    future.set_result(result)
+        finally:
+            self._slots.release()
+
+
+def run_service(name_file: str, host: str = '127.0.0.1', port: int = 0, path: str = None, **options):
+    """ The function runs the matching service until it is interrupted (Ctrl+C).
+        The address of the server is printed to stderr.
+        :param name_file: str -- the name of the binary file of the machine
+        :param host: str -- the host of the TCP server
+        :param port: int -- the port of the TCP server, 0 means any free port
+        :param path: str -- the path of the Unix socket, it is used instead of TCP if it is given
+        :param options: parameters of MatchingService (max_batch_size, max_latency, executor, workers)
+    """
+    async def main():
+        service = MatchingService(name_file, **options)
+        address = await service.start(host, port, path)
+        print("serving on " + str(address), file=sys.stderr)
+        await service.serve_forever()
+
+    try:
+        asyncio.run(main())
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == '__main__':
+    """
+        Testing of the matching service with the file made by the command compile
+        Testing regular expressions are a.b* and (a|b)*.c
+    """
+    import os
+    import tempfile
+
+    from .cli import main as cli_main
+
+    async def main():
+        name_file = os.path.join(tempfile.mkdtemp(), 'patterns.atm')
+        cli_main(['compile', '-e', 'a.b*', '-e', '(a|b)*.c', '-o', name_file])
+        service = MatchingService(name_file, max_batch_size=64, max_latency=0.01)
+        host, port = await service.start()
+
+        reader, writer = await asyncio.open_connection(host, port)
+        expressions = ["abb", "abc", "ba", "x", "bbc"] * 20
+        writer.write(''.join(expr + '\n' for expr in expressions).encode())
+        await writer.drain()
+        responses = [(await reader.readline()).decode()[:-1] for _ in expressions]
+        print(responses[:5])  # ['0', '1', '', '', '1']
+        # all requests sent at once are matched in two batches
+        print(service.stats()['batches'])  # 2
+        writer.close()
+        await service.close()
+
+        # the next service in the process matches by its own file
+        other_name_file = os.path.join(tempfile.mkdtemp(), 'other.atm')
+        cli_main(['compile', '-e', 'b', '-o', other_name_file])
+        service = MatchingService(other_name_file)
+        host, port = await service.start()
+        reader, writer = await asyncio.open_connection(host, port)
+        writer.write(b'a\nb\n')
+        await writer.drain()
+        print([(await reader.readline()).decode() for _ in range(2)])  # ['\n', '0\n']
+        writer.close()
+        await service.close()
+
+    asyncio.run(main())
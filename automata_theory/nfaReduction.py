@@ -0,0 +1,199 @@
+""" Reduction of Eilenberg machines before matching or the subset construction.
+    Builders of Eilenberg machines add duplicate transitions (the operation '*' adds a transition
+    for every pair of a transition to an acceptable state and an initial state) and keep redundant states
+    (the operation '|' keeps both copies of identical sub-machines). The reduction
+        1. removes duplicate transitions;
+        2. trims states, which are not reachable from initial states or from which no acceptable state
+            is reachable;
+        3. merges forward bisimilar states (states with the same acceptance going with every symbol
+            to the same classes of states), they accept the same words;
+        4. merges backward bisimilar states (states with the same "initial" flag, to which the same classes
+            of states go with every symbol), they are reached by the same words.
+    Steps 3 and 4 are repeated while they merge states. The reduced machine accepts the same words.
+    Labels of transitions are compared as they are (a character and a CharClass containing it are different),
+    so the reduction is safe, but it may not find all equivalent states.
+"""
+from . import instrumentation
+from .EilenbergMachine import EilenbergMachine
+
+
+def reduce_Eilenberg_machine(e_machine: EilenbergMachine) -> tuple:
+    """ The function returns the reduced Eilenberg machine accepting the same words, the machine
+        is not changed (so frozen machines of the cache can be reduced).
+        Every round of merging takes O(number of transitions) time, the number of rounds is at most
+        the number of states, it is small for machines of regular expressions.
+        :param e_machine: EilenbergMachine -- the Eilenberg machine
+        :return: tuple (EilenbergMachine, dict) -- the reduced Eilenberg machine and the report:
+            the numbers of states and transitions before and after the reduction, the number of removed
+            duplicate transitions, trimmed states, states merged by forward and backward bisimulation,
+            state_ratio and edge_ratio -- the ratios of the numbers after the reduction to the numbers before it
+    """
+    edges_before = sum(len(transitions) for transitions in e_machine.transitions_between_states)
+    report = {'states_before': e_machine.number_states, 'edges_before': edges_before}
+
+    # duplicate transitions are removed, the order of the first occurrences is kept
+    transitions_between_states = [list(dict.fromkeys(transitions))
+                                  for transitions in e_machine.transitions_between_states]
+    report['duplicate_edges'] = edges_before - _count_edges(transitions_between_states)
+    initial_states = list(dict.fromkeys(e_machine.initial_states))
+    acceptable_states = set(e_machine.acceptable_states)
+
+    useful = _get_useful_states(transitions_between_states, initial_states, acceptable_states)
+    report['trimmed_states'] = e_machine.number_states - sum(useful)
+    new_state_numbers = []
+    number = 0
+    for s in range(e_machine.number_states):
+        new_state_numbers.append(number if useful[s] else -1)
+        number += useful[s]
+    machine = _merge_states(transitions_between_states, initial_states, acceptable_states, new_state_numbers)
+
+    report['merged_forward'] = 0
+    report['merged_backward'] = 0
+    merged = True
+    while merged:
+        merged = False
+        for direction in ('forward', 'backward'):
+            transitions_between_states, initial_states, acceptable_states = machine
+            number_states = len(transitions_between_states)
+            if direction == 'forward':
+                classes = _get_bisimulation_classes(transitions_between_states,
+                                                    [s in acceptable_states for s in range(number_states)])
+            else:
+                inverse_transitions = [[] for _ in range(number_states)]
+                for s in range(number_states):
+                    for (state, character) in transitions_between_states[s]:
+                        inverse_transitions[state].append((s, character))
+                initial_set = set(initial_states)
+                classes = _get_bisimulation_classes(inverse_transitions,
+                                                    [s in initial_set for s in range(number_states)])
+            number_merged = number_states - (max(classes, default=-1) + 1)
+            if number_merged > 0:
+                machine = _merge_states(transitions_between_states, initial_states, acceptable_states, classes)
+                report['merged_' + direction] += number_merged
+                merged = True
+
+    transitions_between_states, initial_states, acceptable_states = machine
+    result = EilenbergMachine(len(transitions_between_states), transitions_between_states,
+                              initial_states, sorted(acceptable_states))
+    report['states_after'] = result.number_states
+    report['edges_after'] = _count_edges(transitions_between_states)
+    report['state_ratio'] = report['states_after'] / max(report['states_before'], 1)
+    report['edge_ratio'] = report['edges_after'] / max(report['edges_before'], 1)
+
+    stats = instrumentation.active
+    if stats is not None:
+        for name in ('states_before', 'states_after', 'edges_before', 'edges_after', 'duplicate_edges',
+                     'trimmed_states', 'merged_forward', 'merged_backward'):
+            stats.add('nfa_reduction.' + name, report[name])
+    return result, report
+
+
+def _count_edges(transitions_between_states: list) -> int:
+    """ The function returns the number of transitions """
+    return sum(len(transitions) for transitions in transitions_between_states)
+
+
+def _get_useful_states(transitions_between_states: list, initial_states: list, acceptable_states: set) -> list:
+    """ The function returns the list, whose i-th item is True if state i is reachable from an initial state
+        and an acceptable state is reachable from it
+    """
+    number_states = len(transitions_between_states)
+    inverse_transitions = [[] for _ in range(number_states)]
+    for s in range(number_states):
+        for (state, character) in transitions_between_states[s]:
+            inverse_transitions[state].append(s)
+
+    reachable = _get_reachable(number_states, initial_states,
+                               lambda s: (state for (state, character) in transitions_between_states[s]))
+    coreachable = _get_reachable(number_states, acceptable_states, lambda s: inverse_transitions[s])
+    return [reachable[s] and coreachable[s] for s in range(number_states)]
+
+
+def _get_reachable(number_states: int, start_states, get_next_states) -> list:
+    """ The function returns the list, whose i-th item is True if state i is reachable from start states
+        by the search in depth with an explicit stack
+        :param get_next_states: function returning the states to which it is possible to go from the state
+    """
+    used = [False] * number_states
+    stack = list(start_states)
+    for s in stack:
+        used[s] = True
+    while stack:
+        s = stack.pop()
+        for state in get_next_states(s):
+            if not used[state]:
+                used[state] = True
+                stack.append(state)
+    return used
+
+
+def _get_bisimulation_classes(transitions_between_states: list, flags: list) -> list:
+    """ The function returns the coarsest splitting of states refining the splitting by flags, such that
+        states of a class go with every symbol to the same set of classes.
+        Every round splits classes by signatures of states: the class and the set of pairs
+        (the symbol, the class of the state to which it is possible to go).
+        :param transitions_between_states: list -- transitions (forward or inverse ones)
+        :param flags: list -- flags[i] is the value splitting states initially (acceptance or the initial flag)
+        :return: list -- the number of class of every state, classes are numbered in order of their first states
+    """
+    classes = _renumber([bool(flag) for flag in flags])
+    number_classes = max(classes, default=-1) + 1
+    while True:
+        signatures = [(classes[s], frozenset((character, classes[state])
+                                             for (state, character) in transitions_between_states[s]))
+                      for s in range(len(classes))]
+        classes = _renumber(signatures)
+        if max(classes, default=-1) + 1 == number_classes:
+            return classes
+        number_classes = max(classes) + 1
+
+
+def _renumber(keys: list) -> list:
+    """ The function numbers distinct keys in order of their first occurrence and returns the numbers of keys """
+    numbers = {}
+    return [numbers.setdefault(key, len(numbers)) for key in keys]
+
+
+def _merge_states(transitions_between_states: list, initial_states: list, acceptable_states: set,
+                  new_state_numbers: list) -> tuple:
+    """ The function merges states: the state i becomes the state new_state_numbers[i],
+        states with new number -1 are removed. Duplicate transitions of merged states are removed.
+        :return: tuple (list, list, set) -- transitions, initial states and acceptable states
+    """
+    number_states = max(new_state_numbers, default=-1) + 1
+    new_transitions = [{} for _ in range(number_states)]
+    for s, transitions in enumerate(transitions_between_states):
+        new_s = new_state_numbers[s]
+        if new_s == -1:
+            continue
+        for (state, character) in transitions:
+            if new_state_numbers[state] != -1:
+                new_transitions[new_s][(new_state_numbers[state], character)] = None
+    new_initial_states = list(dict.fromkeys(new_state_numbers[s] for s in initial_states
+                                            if new_state_numbers[s] != -1))
+    new_acceptable_states = {new_state_numbers[s] for s in acceptable_states if new_state_numbers[s] != -1}
+    return [list(transitions) for transitions in new_transitions], new_initial_states, new_acceptable_states
+
+
+if __name__ == '__main__':
+    """
+        Testing of the reduction of Eilenberg machines
+        Testing regular expression is ((a|b*)*.((d*.e)|c)).(b|a)*
+    """
+    from .EilenbergMachine import get_data_from_json_file
+    from .regexConversions import conversion_reg_expr_to_json
+
+    e_machine = EilenbergMachine.get_Eilenberg_machine(get_data_from_json_file("reg_expr.json"))
+    reduced_machine, report = reduce_Eilenberg_machine(e_machine)
+    print(report['states_before'], report['states_after'], report['edges_before'], report['edges_after'])  # 9 5 26 12
+    print([reduced_machine.accept(expr) for expr in ["ac", "abbddeaaab", "aca", "bdea"]])  # [False, True, True, True]
+
+    # both copies of a.b* are merged
+    e_machine = EilenbergMachine.get_Eilenberg_machine(conversion_reg_expr_to_json("(a.b*|a.b*)*"))
+    reduced_machine, report = reduce_Eilenberg_machine(e_machine)
+    print(report['states_before'], report['states_after'])  # 6 3
+
+    # duplicate transitions added by the stars of both alternatives are removed
+    e_machine = EilenbergMachine.get_Eilenberg_machine(conversion_reg_expr_to_json("(a|a)*.(a|a)*"))
+    reduced_machine, report = reduce_Eilenberg_machine(e_machine)
+    print(report['duplicate_edges'], report['states_after'], round(report['edge_ratio'], 2))  # 6 3 0.22
@@ -0,0 +1,239 @@
+""" Matching of huge inputs by a deterministic finite state machine on a pool of processes.
+    The input is split into chunks. For every chunk a worker computes the mapping of states:
+    the state at the end of the chunk for every possible state at the beginning of it.
+    The mappings are composed in order of chunks, which gives exactly the final state of the DFSM.
+    Workers get the transition table through shared memory, so it is not pickled for every task.
+"""
+import mmap
+import multiprocessing
+import os
+from array import array
+from multiprocessing import shared_memory
+
+from .DFSM import CompiledDFSM
+
+# the number of symbols after which the states in the same state are merged by a worker
+_MERGE_PERIOD = 64
+
+# globals of a worker process, they are set by _init_worker
+_worker_table_memory = None
+_worker_table = None
+_worker_width = 0
+_worker_number_states = 0
+_worker_byte_columns = b''
+_worker_sources = {}
+
+
+class ParallelMatcher:
+    """ Class representing matcher of bytes-like inputs, which splits the input into chunks
+        and matches them on a pool of processes.
+        Constructor parameters are
+            1.machine: CompiledDFSM -- the compiled deterministic finite state machine.
+                The byte b of the input is matched as the symbol chr(b).
+            2.processes: int -- the number of worker processes, by default the number of CPUs
+            3.chunk_size: int -- the number of bytes in one chunk
+            4.min_parallel_size: int -- inputs shorter than this are matched serially in the current process
+        The matcher has to be closed by close() or used in the 'with' statement.
+    """
+
+    def __init__(self, machine: CompiledDFSM, processes: int = None, chunk_size: int = 1 << 22,
+                 min_parallel_size: int = 1 << 24):
+        self.machine = machine
+        self.processes = processes or multiprocessing.cpu_count()
+        self.chunk_size = chunk_size
+        self.min_parallel_size = min_parallel_size
+
+        machine_byte_columns = machine.byte_columns
+        # columns of the DFSM matching bytes, they are columns of the table with the last column for all other bytes
+        byte_symbol_columns = sorted(set(machine_byte_columns) - {-1})
+        self._width = len(byte_symbol_columns) + 1
+        columns = {c: i for i, c in enumerate(byte_symbol_columns)}
+        self._byte_columns = bytes(columns.get(c, len(byte_symbol_columns)) for c in machine_byte_columns)
+
+        # The table of the DFSM extended with the dead state (the last row).
+        # A state is stored as the offset of its row, state * width.
+        self._number_states = machine.number_states + 1
+        dead_state = machine.number_states
+        table = array('i', [dead_state * self._width]) * (self._number_states * self._width)
+        for s in range(machine.number_states):
+            for i, c in enumerate(byte_symbol_columns):
+                to_state = machine.table[s * machine.number_columns + c]
+                if to_state != CompiledDFSM.DEAD_STATE:
+                    table[s * self._width + i] = to_state * self._width
+        self._table = table
+
+        self._table_memory = None
+        self._pool = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def close(self):
+        """ The function stops worker processes and frees the shared memory """
+        if self._pool is not None:
+            self._pool.close()
+            self._pool.join()
+            self._pool = None
+        if self._table_memory is not None:
+            self._table_memory.close()
+            self._table_memory.unlink()
+            self._table_memory = None
+
+    def accept(self, data) -> bool:
+        """ The function distinguishes acceptable and non-acceptable inputs
+            :param data: bytes-like input
+            :return: acceptable and non-acceptable inputs
+        """
+        return self._is_acceptable(self.final_state(data))
+
+    def accept_file(self, name_file: str) -> bool:
+        """ The function distinguishes acceptable and non-acceptable files.
+            Every worker maps the file into memory itself, the file is not copied.
+            :param name_file: str -- the name of the file
+            :return: acceptable and non-acceptable files
+        """
+        return self._is_acceptable(self.final_state_file(name_file))
+
+    def final_state(self, data) -> int:
+        """ The function returns the state of the DFSM after the input or DEAD_STATE
+            :param data: bytes-like input
+        """
+        data = memoryview(data).cast('B')
+        if len(data) == 0 or len(data) < self.min_parallel_size:
+            return self._final_state_serial(data)
+
+        data_memory = shared_memory.SharedMemory(create=True, size=len(data))
+        try:
+            data_memory.buf[:len(data)] = data
+            return self._final_state_parallel(('memory', data_memory.name), len(data))
+        finally:
+            data_memory.close()
+            data_memory.unlink()
+
+    def final_state_file(self, name_file: str) -> int:
+        """ The function returns the state of the DFSM after the content of the file or DEAD_STATE
+            :param name_file: str -- the name of the file
+        """
+        with open(name_file, 'rb') as file:
+            status = os.fstat(file.fileno())
+            size = status.st_size
+            if size == 0:
+                return self._final_state_serial(b'')
+            if size < self.min_parallel_size:
+                with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as data:
+                    return self._final_state_serial(data)
+        # workers keep the file mapped between calls, so the source is identified by the version of the file too:
+        # a rewritten file gets another key and is mapped again
+        return self._final_state_parallel(('file', name_file, status.st_dev, status.st_ino, size,
+                                           status.st_mtime_ns), size)
+
+    def _is_acceptable(self, state: int) -> bool:
+        """ The function checks whether the state is acceptable """
+        return state != CompiledDFSM.DEAD_STATE and self.machine.acceptable[state] == 1
+
+    def _final_state_serial(self, data) -> int:
+        """ The function matches the input in the current process """
+        table = self._table
+        dead_state = self.machine.number_states * self._width
+        state = self.machine.initial_state * self._width
+        for start in range(0, len(data), self.chunk_size):
+            for column in bytes(data[start:start + self.chunk_size]).translate(self._byte_columns):
+                state = table[state + column]
+            if state == dead_state:
+                break
+        return self._from_offset(state)
+
+    def _final_state_parallel(self, source: tuple, size: int) -> int:
+        """ The function matches the input on the pool of processes and composes the mappings of chunks """
+        pool = self._get_pool()
+        tasks = [(source, start, min(start + self.chunk_size, size)) for start in range(0, size, self.chunk_size)]
+        state = self.machine.initial_state
+        for mapping in pool.imap(_chunk_mapping, tasks):
+            state = mapping[state]
+        return state if state != self.machine.number_states else CompiledDFSM.DEAD_STATE
+
+    def _from_offset(self, offset: int) -> int:
+        """ The function converts the offset of the row of the table to the number of state """
+        state = offset // self._width
+        return state if state != self.machine.number_states else CompiledDFSM.DEAD_STATE
+
+    def _get_pool(self):
+        """ The function creates the pool of processes and the shared memory with the table on the first call """
+        if self._pool is None:
+            self._table_memory = shared_memory.SharedMemory(create=True, size=max(len(self._table), 1) * 4)
+            self._table_memory.buf[:len(self._table) * 4] = self._table.tobytes()
+            self._pool = multiprocessing.Pool(
+                self.processes, _init_worker,
+                (self._table_memory.name, self._width, self._number_states, self._byte_columns))
+        return self._pool
+
+
+def _init_worker(table_name: str, width: int, number_states: int, byte_columns: bytes):
+    """ The function attaches the table of the DFSM in a worker process """
+    global _worker_table_memory, _worker_table, _worker_width, _worker_number_states, _worker_byte_columns
+    _worker_table_memory = shared_memory.SharedMemory(name=table_name)
+    _worker_table = _worker_table_memory.buf.cast('i')
+    _worker_width = width
+    _worker_number_states = number_states
+    _worker_byte_columns = byte_columns
+
+
+def _get_source(source: tuple):
+    """ The function returns the input of the task: shared memory or the file mapped into memory """
+    if source not in _worker_sources:
+        # the input of the previous call is not used any more
+        for memory, data in _worker_sources.values():
+            memory.close()
+        _worker_sources.clear()
+
+        kind, name = source[:2]
+        if kind == 'memory':
+            memory = shared_memory.SharedMemory(name=name)
+            data = memory.buf
+        else:
+            with open(name, 'rb') as file:
+                memory = data = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        _worker_sources[source] = (memory, data)
+    return _worker_sources[source][1]
+
+
+def _chunk_mapping(task: tuple) -> array:
+    """ The function computes the mapping of states of the chunk: mapping[i] is the state at the end
+        of the chunk if the state at the beginning of it is i.
+        Only distinct live current states are moved forward, they are merged every _MERGE_PERIOD symbols.
+    """
+    source, start, end = task
+    table = _worker_table
+    dead_state = (_worker_number_states - 1) * _worker_width
+    columns = bytes(_get_source(source)[start:end]).translate(_worker_byte_columns)
+
+    # active -- distinct live current states (the dead state is never left, so it is not moved forward),
+    # origin[i] is the index in 'active' of the current state for state i or -1 for the dead state
+    active = [s * _worker_width for s in range(_worker_number_states - 1)]
+    origin = list(range(_worker_number_states - 1)) + [-1]
+    # the number of symbols of the chunk matched so far
+    matched = 0
+    while matched < len(columns):
+        for column in columns[matched:matched + _MERGE_PERIOD]:
+            active = [table[state + column] for state in active]
+        matched += _MERGE_PERIOD
+        indexes = {dead_state: -1}
+        for state in active:
+            indexes.setdefault(state, len(indexes) - 1)
+        if len(indexes) - 1 < len(active):
+            origin = [indexes[active[i]] if i != -1 else -1 for i in origin]
+            del indexes[dead_state]
+            active = list(indexes)
+        if len(active) <= 1:
+            break
+    if len(active) == 1:
+        # all live states are merged, the rest of the chunk is matched from one state
+        state = active[0]
+        for column in columns[matched:]:
+            state = table[state + column]
+        active = [state]
+    active.append(dead_state)
+    return array('i', [active[i] // _worker_width for i in origin])
@@ -0,0 +1,164 @@
+""" Multi-pattern matching: a set of regular expressions is compiled into one deterministic finite state machine,
+    whose acceptable states are labelled by the set of IDs of patterns accepting the input.
+    One pass over the input reports every pattern that accepts it.
+"""
+from .EilenbergMachine import EilenbergMachine
+from .determinization import subset_construction
+from .machineSerialization import read_machine_file, save_machine
+from .regexConversions import conversion_reg_expr_to_json
+
+
+class PatternSet:
+    """ Class representing set of regular expressions compiled into one deterministic finite state machine.
+        Constructor parameters are
+            1.patterns -- list of regular expressions (pattern i gets ID i)
+                or dict, mapping IDs to regular expressions.
+                A regular expression is represented in JSON format in dict or in string format.
+            2.minimize: bool -- if True, the DFSM is reduced, only states with the same set of IDs are merged
+        Attributes are
+            machine: DFSM -- the deterministic finite state machine accepting words matched by any pattern
+            state_patterns: list -- state_patterns[i] is the frozenset of IDs of patterns accepting in state i
+        A set of patterns with integer IDs can be saved to the binary file and loaded by PatternSet.load,
+        the loaded set has only the compiled DFSM (machine and patterns are None).
+    """
+
+    def __init__(self, patterns, minimize: bool = True):
+        if not isinstance(patterns, dict):
+            patterns = dict(enumerate(patterns))
+        self.patterns = patterns
+
+        e_machines = []
+        for reg_expr in patterns.values():
+            if isinstance(reg_expr, str):
+                reg_expr = conversion_reg_expr_to_json(reg_expr)
+            e_machines.append(EilenbergMachine.get_Eilenberg_machine(reg_expr))
+        e_machine, state_labels = union_Eilenberg_machines(e_machines, list(patterns))
+
+        self.machine, subsets = subset_construction(e_machine)
+        self.state_patterns = [frozenset(state_labels[s] for s in subset if s in state_labels)
+                               for subset in subsets]
+
+        if minimize:
+            self._reduce()
+        self._compiled_machine = self.machine.compile()
+
+    @property
+    def number_states(self) -> int:
+        """ The number of states of the DFSM """
+        return self._compiled_machine.number_states
+
+    @property
+    def compiled_machine(self):
+        """ The compiled DFSM (CompiledDFSM) accepting words matched by any pattern """
+        return self._compiled_machine
+
+    def match(self, expr: str) -> frozenset:
+        """ The function returns IDs of all patterns accepting the input string
+            :param expr: str -- input string
+            :return: frozenset of IDs of patterns
+        """
+        machine = self._compiled_machine
+        state = machine.initial_state
+        for char in expr:
+            state = machine.transition(state, char)
+            if state == machine.DEAD_STATE:
+                return frozenset()
+        return self.state_patterns[state]
+
+    def match_many(self, strings: list) -> list:
+        """ The function returns IDs of patterns accepting every input string of the batch.
+            Final states of all strings are found at once (see CompiledDFSM.get_final_states).
+            :param strings: list -- input strings
+            :return: list of frozensets of IDs of patterns
+        """
+        machine = self._compiled_machine
+        states = machine.get_final_states(strings)
+        if not isinstance(states, list):
+            states = states.tolist()
+        dead_state = machine.DEAD_STATE
+        return [frozenset() if state == dead_state else self.state_patterns[state] for state in states]
+
+    def save(self, name_file: str):
+        """ The function saves the compiled DFSM and IDs of patterns of its states in the binary format
+            (see machineSerialization), IDs must be integers
+            :param name_file: str -- the name of the file
+        """
+        save_machine(self._compiled_machine, name_file, self.state_patterns)
+
+    @staticmethod
+    def load(name_file: str):
+        """ Static function that returned the set of patterns saved by save().
+            The file is mapped into memory and used in place, so processes loading it share one copy.
+            :param name_file: str -- the name of the file
+            :return: PatternSet -- the set of patterns, which can only match input strings
+        """
+        compiled_machine, state_patterns = read_machine_file(name_file)
+        if state_patterns is None:
+            raise ValueError("The file contains no IDs of patterns: " + name_file)
+        pattern_set = PatternSet.__new__(PatternSet)
+        pattern_set.patterns = None
+        pattern_set.machine = None
+        pattern_set.state_patterns = state_patterns
+        pattern_set._compiled_machine = compiled_machine
+        return pattern_set
+
+    def _reduce(self):
+        """ The function reduces the DFSM, the initial splitting of states is by sets of IDs of patterns """
+        classes = {}
+        for state, ids in enumerate(self.state_patterns):
+            classes.setdefault(ids, []).append(state)
+        new_state_numbers = self.machine.reduce_dfsm(list(classes.values()))
+
+        state_patterns = [frozenset()] * self.machine.number_states
+        for state, ids in enumerate(self.state_patterns):
+            state_patterns[new_state_numbers[state]] = ids
+        self.state_patterns = state_patterns
+
+
+def union_Eilenberg_machines(e_machines: list, labels: list) -> tuple:
+    """ The function returns the Eilenberg machine accepting exactly words accepted by any of the machines
+        (the machines are placed side by side as in the operation |).
+        :param e_machines: list -- Eilenberg machines
+        :param labels: list -- labels[i] is the label of acceptable states of the machine e_machines[i]
+        :return: tuple (EilenbergMachine, dict) -- resulting Eilenberg machine and the dictionary,
+            mapping acceptable states of the resulting machine to the labels
+    """
+    transitions_between_states = []
+    initial_states = []
+    acceptable_states = []
+    state_labels = {}
+    for e_machine, label in zip(e_machines, labels):
+        # the states of the machine are renumbered by adding 'offset'
+        offset = len(transitions_between_states)
+        for s in range(e_machine.number_states):
+            transitions_between_states.append([(state + offset, character)
+                                               for (state, character) in e_machine.transitions_between_states[s]])
+        initial_states.extend(s + offset for s in e_machine.initial_states)
+        for s in e_machine.acceptable_states:
+            acceptable_states.append(s + offset)
+            state_labels[s + offset] = label
+
+    e_machine = EilenbergMachine(len(transitions_between_states), transitions_between_states,
+                                 initial_states, acceptable_states)
+    return e_machine, state_labels
+
+
+if __name__ == '__main__':
+    """
+        Testing of the set of patterns
+    """
+    pattern_set = PatternSet({'abc': "a.b.c", 'ab*c': "a.b*.c", 'a(b|c)*': "a.(b|c)*", 'c': "c"})
+    print(pattern_set.number_states)
+    print(sorted(pattern_set.match("abc")))  # ['a(b|c)*', 'ab*c', 'abc']
+    print(sorted(pattern_set.match("abbc")))  # ['a(b|c)*', 'ab*c']
+    print(sorted(pattern_set.match("acb")))  # ['a(b|c)*']
+    print(sorted(pattern_set.match("ca")))  # []
+
+    import os
+    import tempfile
+    with tempfile.TemporaryDirectory() as directory:
+        name_file = os.path.join(directory, "patterns.bin")
+        PatternSet(["a.b.c", "a.b*.c", "a.(b|c)*", "c"]).save(name_file)
+        loaded_pattern_set = PatternSet.load(name_file)
+        print(sorted(loaded_pattern_set.match("abc")), sorted(loaded_pattern_set.match("ca")))  # [0, 1, 2] []
+        print([sorted(ids) for ids in loaded_pattern_set.match_many(["abc", "ca", "ac"])])  # [[0, 1, 2], [], [2]]
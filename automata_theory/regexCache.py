@@ -0,0 +1,193 @@
+""" Cache of compiled regular expressions.
+    A regular expression (in string format or in JSON format in dict) is reduced to the canonical form,
+    which is mapped to its Eilenberg machine. Entries are evicted in LRU order when the number of entries
+    or the approximate size of machines exceeds the budget. Cached machines are frozen (immutable),
+    so they can be shared, use EilenbergMachine.copy() to get a machine which can be changed.
+"""
+from collections import OrderedDict
+
+from . import instrumentation
+from .EilenbergMachine import EilenbergMachine
+from .regexConversions import conversion_reg_expr_to_json
+
+
+class RegexCache:
+    """ Class representing cache of compiled regular expressions with LRU eviction.
+        Constructor parameters are
+            1.max_entries: int -- the maximal number of cached machines
+            2.max_bytes: int -- the memory budget, the maximal approximate size of cached machines in bytes
+        Counters of hits, misses and evictions are attributes of the cache.
+    """
+
+    def __init__(self, max_entries: int = 256, max_bytes: int = 64 << 20):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        # the approximate size of cached machines in bytes
+        self.current_bytes = 0
+        # the dictionary contains pairs: the canonical form and the pair (machine, size)
+        self._machines = OrderedDict()
+        # the dictionary contains pairs: the regular expression in string format and its canonical form
+        self._canonical_forms = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._machines)
+
+    def get(self, reg_expr) -> EilenbergMachine:
+        """ The function returns the frozen Eilenberg machine accepting exactly words corresponding
+            to the regular expression, the machine is built on a miss.
+            :param reg_expr: the regular expression represented in string format or in JSON format in dict
+            :return: EilenbergMachine -- the frozen Eilenberg machine
+        """
+        if isinstance(reg_expr, str):
+            canonical_form = self._canonical_forms.get(reg_expr)
+            if canonical_form is not None and canonical_form in self._machines:
+                self._canonical_forms.move_to_end(reg_expr)
+                return self._hit(canonical_form)
+            string_form = reg_expr
+            reg_expr = conversion_reg_expr_to_json(reg_expr)
+        else:
+            string_form = None
+
+        shared_reg_expr, canonical_form, repeated_nodes = get_shared_reg_expr(reg_expr)
+        if string_form is not None:
+            self._canonical_forms[string_form] = canonical_form
+            if len(self._canonical_forms) > self.max_entries:
+                self._canonical_forms.popitem(last=False)
+        if canonical_form in self._machines:
+            return self._hit(canonical_form)
+
+        self.misses += 1
+        if instrumentation.active is not None:
+            instrumentation.active.add('cache.misses')
+        memo = {id(node): None for node in repeated_nodes}
+        e_machine = EilenbergMachine.get_Eilenberg_machine(shared_reg_expr, memo).freeze()
+        size = get_machine_size(e_machine) + len(canonical_form)
+        if size <= self.max_bytes:
+            self._machines[canonical_form] = (e_machine, size)
+            self.current_bytes += size
+            while len(self._machines) > self.max_entries or self.current_bytes > self.max_bytes:
+                self._evict()
+        return e_machine
+
+    def stats(self) -> dict:
+        """ The function returns counters of the cache """
+        return {'hits': self.hits, 'misses': self.misses, 'evictions': self.evictions,
+                'entries': len(self._machines), 'bytes': self.current_bytes}
+
+    def clear(self):
+        """ The function removes all machines from the cache, counters are not reset """
+        self._machines.clear()
+        self._canonical_forms.clear()
+        self.current_bytes = 0
+
+    def _hit(self, canonical_form: str) -> EilenbergMachine:
+        """ The function returns the cached machine and marks it as the most recently used """
+        self.hits += 1
+        if instrumentation.active is not None:
+            instrumentation.active.add('cache.hits')
+        self._machines.move_to_end(canonical_form)
+        return self._machines[canonical_form][0]
+
+    def _evict(self):
+        """ The function removes the least recently used machine """
+        canonical_form, (e_machine, size) = self._machines.popitem(last=False)
+        self.current_bytes -= size
+        self.evictions += 1
+        if instrumentation.active is not None:
+            instrumentation.active.add('cache.evictions')
+
+
+def get_shared_reg_expr(reg_expr: dict) -> tuple:
+    """ The function builds the copy of the regular expression, in which identical sub-expressions
+        are represented by one object, and the canonical form of the regular expression.
+        The canonical form is the list of distinct sub-expressions in postorder, every sub-expression
+        is written as the operation and the numbers of its arguments in this list.
+        :param reg_expr: dict -- the regular expression represented in JSON format in dict.
+        :return: tuple (dict, str, list) -- the regular expression with shared sub-expressions,
+            its canonical form and the list of sub-expressions, which are arguments of several operations
+    """
+    # the dictionary contains pairs: the sub-expression written with numbers of arguments and its number
+    numbers = {}
+    shared_nodes = []
+    # the dictionary contains pairs: id of the sub-expression of reg_expr and its number
+    node_numbers = {}
+    # uses[i] -- the number of occurrences of the sub-expression number i as an argument
+    uses = []
+
+    stack = [(reg_expr, False)]
+    while stack:
+        node, visited = stack.pop()
+        if id(node) in node_numbers:
+            continue
+        key = node['key']
+        value = node['val']
+        if key == 'atm':
+            arguments = []
+        elif key == '*':
+            arguments = [value]
+        else:
+            arguments = [value['fst'], value['snd']]
+
+        if not visited and arguments:
+            stack.append((node, True))
+            for argument in reversed(arguments):
+                stack.append((argument, False))
+            continue
+
+        if key == 'atm':
+            description = (key, value)
+        else:
+            description = (key,) + tuple(node_numbers[id(argument)] for argument in arguments)
+        number = numbers.get(description)
+        if number is None:
+            number = len(shared_nodes)
+            numbers[description] = number
+            uses.append(0)
+            if key == 'atm':
+                shared_nodes.append({'key': key, 'val': value})
+            elif key == '*':
+                shared_nodes.append({'key': key, 'val': shared_nodes[description[1]]})
+            else:
+                shared_nodes.append({'key': key, 'val': {'fst': shared_nodes[description[1]],
+                                                         'snd': shared_nodes[description[2]]}})
+        node_numbers[id(node)] = number
+        for argument in arguments:
+            uses[node_numbers[id(argument)]] += 1
+
+    repeated_nodes = [node for node, count in zip(shared_nodes, uses) if count > 1 and node['key'] != 'atm']
+    return shared_nodes[node_numbers[id(reg_expr)]], repr(list(numbers)), repeated_nodes
+
+
+def get_machine_size(e_machine: EilenbergMachine) -> int:
+    """ The function returns the approximate size of the Eilenberg machine in bytes """
+    number_transitions = sum(len(t) for t in e_machine.transitions_between_states)
+    return 200 + 250 * e_machine.number_states + 150 * number_transitions
+
+
+# the cache used by compile_reg_expr
+default_cache = RegexCache()
+
+
+def compile_reg_expr(reg_expr) -> EilenbergMachine:
+    """ The function returns the frozen Eilenberg machine for the regular expression from the default cache
+        :param reg_expr: the regular expression represented in string format or in JSON format in dict
+        :return: EilenbergMachine -- the frozen Eilenberg machine
+    """
+    return default_cache.get(reg_expr)
+
+
+if __name__ == '__main__':
+    """
+        Testing of the cache of compiled regular expressions
+    """
+    cache = RegexCache(max_entries=2)
+    machine = cache.get("(a|b)*.(a|b)*")
+    print(machine.accept("abba"))  # True
+    print(cache.get("(a|b)* . (a|b)*") is machine)  # True
+    cache.get("a.b")
+    cache.get("c")
+    print(cache.get("(a|b)*.(a|b)*") is machine)  # False
+    print(cache.stats())  # {'hits': 1, 'misses': 4, 'evictions': 2, 'entries': 2, 'bytes': ...}
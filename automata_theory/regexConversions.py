@@ -11,34 +11,49 @@
     is implemented.
     2. The function transforming a correct string presentation for a regular expression into the data structure
     described above is implemented.
+    A token of an atom is a character, an escaped character \\c (the character c, for writing operators)
+    or a character class: [a-z], [^0-9] (see charClasses).
 """
 
-import json
+from .charClasses import SPECIAL_CHARACTERS, get_tokens
 
 
 def conversion_reg_expr_to_str(reg_expr: dict) -> str:
-    """ The function convert regular expression to string representation
+    """ The function convert regular expression to string representation.
+        The expression is traversed with an explicit stack and the output is joined once at the end,
+        so the running time is linear and the depth of the expression is not limited by the recursion limit.
         :param reg_expr: dict -- the regular expression represented in JSON format in dict.
         :return: regular expression represented in string representation.
     """
-    key = reg_expr['key']
-    value = reg_expr['val']
-    if key == 'atm':
-        return value
-    elif key == '*':
-        if value['key'] == 'atm':
-            return conversion_reg_expr_to_str(value) + '*'
-        return '(' + conversion_reg_expr_to_str(value) + ')*'
-    elif key == '.':
-        fst = conversion_reg_expr_to_str(value['fst'])
-        snd = conversion_reg_expr_to_str(value['snd'])
-        if value['fst']['key'] == '|':
-            fst = '(' + fst + ')'
-        if value['snd']['key'] == '|':
-            snd = '(' + snd + ')'
-        return fst + '.' + snd
-    elif key == '|':
-        return conversion_reg_expr_to_str(value['fst']) + '|' + conversion_reg_expr_to_str(value['snd'])
+    # parts of the resulting string
+    parts = []
+    # the stack contains sub-expressions (dict) to be printed and ready parts of the string (str)
+    # in reverse order of printing
+    stack = [reg_expr]
+    while stack:
+        item = stack.pop()
+        if isinstance(item, str):
+            parts.append(item)
+            continue
+        key = item['key']
+        value = item['val']
+        if key == 'atm':
+            parts.append('\\' + value if value in SPECIAL_CHARACTERS else value)
+        elif key == '*':
+            if value['key'] == 'atm':
+                stack.extend(('*', value))
+            else:
+                stack.extend((')*', value, '('))
+        elif key == '.':
+            # an argument of the operation '.' is put in brackets if it is the operation '|'
+            for argument in (value['snd'], '.', value['fst']):
+                if isinstance(argument, dict) and argument['key'] == '|':
+                    stack.extend((')', argument, '('))
+                else:
+                    stack.append(argument)
+        elif key == '|':
+            stack.extend((value['snd'], '|', value['fst']))
+    return ''.join(parts)
 
 
 def conversion_reg_expr_to_json(reg_expr: str) -> dict:
@@ -63,32 +78,33 @@ def conversion_reg_expr_to_json(reg_expr: str) -> dict:
                 it is placed on the top of the stack.
         result of evaluating the expression lies on top of the stack
     """
-    for char in reg_expr:
-        if char == '*':
+    for token in get_tokens(reg_expr):
+        if token == '*':
             value = stack.pop()
             new_value = {"key": "*", "val": value}
             stack.append(new_value)
-        elif char == '.' or char == '|':
+        elif token == '.' or token == '|':
             second = stack.pop()
             first = stack.pop()
-            new_value = {"key": char, "val": {"fst": first, "snd": second}}
+            new_value = {"key": token, "val": {"fst": first, "snd": second}}
             stack.append(new_value)
         else:
-            new_value = {"key": "atm", "val": char}
+            new_value = {"key": "atm", "val": token}
             stack.append(new_value)
     return stack.pop()
 
 
 def conversion_to_postfix_expr(reg_expr: str) -> str:
-    """ The function transforming an infix regular expression to postfix one
+    """ The function transforming an infix regular expression to postfix one.
+        Atoms are written in the postfix regular expression as in the infix one.
         :param reg_expr: str -- the infix regular expression represented in string format
         :return: postfix regular expression represented in string format
     """
     # priority of operations
     priority_operations = {'*': 1, '.': 2, '|': 3, '(': 4, ')': 4}
 
-    # resulting postfix regular expression
-    postfix_reg_expr = ""
+    # tokens of resulting postfix regular expression, they are joined once at the end
+    postfix_reg_expr = []
     stack = []
     """
         for each token in the infix expression:
@@ -105,22 +121,22 @@ def conversion_to_postfix_expr(reg_expr: str) -> str:
                     push the top element of the stack into the resulting string.
         push all the characters from the stack to the resulting string.
     """
-    for char in reg_expr:
-        if char == '(':
+    for token in get_tokens(reg_expr):
+        if token == '(':
             stack.append('(')
-        elif char == ')':
+        elif token == ')':
             while stack[-1] != '(':
-                postfix_reg_expr += stack.pop()
+                postfix_reg_expr.append(stack.pop())
             stack.pop()
-        elif char == '.' or char == '|':
-            while len(stack) > 0 and priority_operations[char] > priority_operations[stack[-1]]:
-                postfix_reg_expr += stack.pop()
-            stack.append(char)
-        elif char == '*' or char != ' ':
-            postfix_reg_expr += char
+        elif token == '.' or token == '|':
+            while len(stack) > 0 and priority_operations[token] > priority_operations[stack[-1]]:
+                postfix_reg_expr.append(stack.pop())
+            stack.append(token)
+        else:
+            postfix_reg_expr.append(token)
     while len(stack) > 0:
-        postfix_reg_expr += stack.pop()
-    return postfix_reg_expr
+        postfix_reg_expr.append(stack.pop())
+    return ''.join(postfix_reg_expr)
 
 
 def get_data_from_json_file(name_file: str) -> dict:
@@ -128,6 +144,8 @@ def get_data_from_json_file(name_file: str) -> dict:
         :param name_file: str -- the name of the file
         :return: decoded regular expression
     """
+    # json is imported here, it is not needed for importing the module
+    import json
     with open(name_file, "r") as read_file:
         return json.load(read_file)
 
@@ -141,16 +159,17 @@ def get_data_from_txt_file(name_file: str) -> str:
         return read_file.readline()
 
 
-'''
- Printing the corresponding regular expression in string representation
- from regular expression in JSON representation.
-'''
-reg_expr_str = conversion_reg_expr_to_str(get_data_from_json_file("reg_expr.json"))
-print(reg_expr_str)
+if __name__ == '__main__':
+    '''
+     Printing the corresponding regular expression in string representation
+     from regular expression in JSON representation.
+    '''
+    reg_expr_str = conversion_reg_expr_to_str(get_data_from_json_file("reg_expr.json"))
+    print(reg_expr_str)
 
-'''
- Printing the corresponding regular expression in JSON representation 
- from regular expression in string representation.
-'''
-reg_expr_json = conversion_reg_expr_to_json(get_data_from_txt_file("reg_expr.txt"))
-print(reg_expr_json)
+    '''
+     Printing the corresponding regular expression in JSON representation 
+     from regular expression in string representation.
+    '''
+    reg_expr_json = conversion_reg_expr_to_json(get_data_from_txt_file("reg_expr.txt"))
+    print(reg_expr_json)
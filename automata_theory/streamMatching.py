@@ -0,0 +1,175 @@
+""" Matching of an input coming by chunks, for example a file read piece by piece or a network stream.
+    The state of the matcher can be saved as a snapshot and restored later,
+    so a long-running ingest can be resumed without matching the processed data once more.
+"""
+import mmap
+
+from . import instrumentation
+from .DFSM import DFSM, CompiledDFSM
+from .EilenbergMachine import EilenbergMachine
+
+
+class StreamMatcher:
+    """ Class representing matcher of an input coming by chunks.
+        Constructor parameters are
+            1.machine -- DFSM, CompiledDFSM or EilenbergMachine. DFSM is compiled by the constructor.
+        Chunks are str or bytes-like objects, the byte b is matched as the symbol chr(b).
+    """
+
+    def __init__(self, machine):
+        if isinstance(machine, DFSM):
+            machine = machine.compile()
+        self.machine = machine
+        self._deterministic = isinstance(machine, CompiledDFSM)
+        if self._deterministic:
+            # byte_columns[b] -- the number of column of the symbol chr(b) or -1 if it is not a symbol
+            self._byte_columns = machine.byte_columns
+        self.reset()
+
+    def reset(self):
+        """ The function returns the matcher to the beginning of the input """
+        # the number of symbols (characters or bytes) fed so far
+        self.position = 0
+        if self._deterministic:
+            self._state = self.machine.initial_state
+        else:
+            self._state = frozenset(self.machine.initial_states)
+
+    @property
+    def state(self):
+        """ The current state: the number of state (DEAD_STATE if there is no way to an acceptable state)
+            for a DFSM, the frozenset of current states for an Eilenberg machine
+        """
+        return self._state
+
+    def is_accepting(self) -> bool:
+        """ The function checks whether the input fed so far is acceptable """
+        if self._deterministic:
+            return self._state != CompiledDFSM.DEAD_STATE and self.machine.acceptable[self._state] == 1
+        return not self._state.isdisjoint(self.machine._get_acceptable_set())
+
+    def feed(self, chunk):
+        """ The function moves the matcher forward by the chunk of the input.
+            Bytes-like chunks are read through memoryview, they are not copied.
+            :param chunk: str or bytes-like object -- the next chunk of the input
+        """
+        if not isinstance(chunk, str):
+            chunk = memoryview(chunk).cast('B')
+        if self._deterministic:
+            self._feed_deterministic(chunk)
+        else:
+            self._feed_nondeterministic(chunk)
+        self.position += len(chunk)
+        stats = instrumentation.active
+        if stats is not None:
+            stats.add('match.stream.chunks')
+            stats.add('match.stream.steps', len(chunk))
+
+    def _feed_deterministic(self, chunk):
+        """ The function moves the compiled DFSM forward by the chunk """
+        state = self._state
+        if state == CompiledDFSM.DEAD_STATE:
+            return
+        table = self.machine.table
+        number_columns = self.machine.number_columns
+        dead_state = CompiledDFSM.DEAD_STATE
+        if isinstance(chunk, str):
+            symbol_numbers = self.machine.symbol_numbers
+            column = self.machine.column
+            for char in chunk:
+                i = symbol_numbers.get(char)
+                if i is None:
+                    i = column(char)
+                if i == -1:
+                    state = dead_state
+                    break
+                state = table[state * number_columns + i]
+                if state == dead_state:
+                    break
+        else:
+            byte_columns = self._byte_columns
+            for byte in chunk:
+                i = byte_columns[byte]
+                if i == -1:
+                    state = dead_state
+                    break
+                state = table[state * number_columns + i]
+                if state == dead_state:
+                    break
+        self._state = state
+
+    def _feed_nondeterministic(self, chunk):
+        """ The function moves the set of current states of the Eilenberg machine forward by the chunk """
+        states = self._state
+        for symbol in chunk:
+            if not states:
+                break
+            states = self.machine._step(states, symbol if isinstance(symbol, str) else chr(symbol))
+        self._state = frozenset(states)
+
+    def snapshot(self) -> dict:
+        """ The function returns the state of the matcher, which can be stored in JSON format
+            and passed to restore()
+        """
+        state = self._state if self._deterministic else sorted(self._state)
+        return {'position': self.position, 'state': state}
+
+    def restore(self, snapshot: dict):
+        """ The function restores the state of the matcher saved by snapshot()
+            :param snapshot: dict -- the result of snapshot()
+        """
+        self.position = snapshot['position']
+        if self._deterministic:
+            self._state = snapshot['state']
+        else:
+            self._state = frozenset(snapshot['state'])
+
+
+def match_file(machine, name_file: str, chunk_size: int = 1 << 20, snapshot: dict = None,
+               checkpoint=None) -> StreamMatcher:
+    """ The function matches the content of the file mapped into memory chunk by chunk.
+        :param machine -- DFSM, CompiledDFSM or EilenbergMachine
+        :param name_file: str -- the name of the file
+        :param chunk_size: int -- the number of bytes in one chunk
+        :param snapshot: dict -- the snapshot of the matcher, matching is continued from the saved position
+        :param checkpoint -- the function called with the snapshot of the matcher after every chunk
+        :return: StreamMatcher -- the matcher after the end of the file
+    """
+    matcher = StreamMatcher(machine)
+    if snapshot is not None:
+        matcher.restore(snapshot)
+    with open(name_file, 'rb') as file:
+        size = file.seek(0, 2)
+        if matcher.position >= size:
+            return matcher
+        with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            view = memoryview(data)
+            try:
+                for start in range(matcher.position, size, chunk_size):
+                    matcher.feed(view[start:start + chunk_size])
+                    if checkpoint is not None:
+                        checkpoint(matcher.snapshot())
+            finally:
+                view.release()
+    return matcher
+
+
+if __name__ == '__main__':
+    """
+        Testing of the stream matcher
+        Testing regular expression is ((a|b*)*.((d*.e)|c)).(b|a)*
+    """
+    from .EilenbergMachine import get_data_from_json_file
+    from .determinization import determinize
+
+    e_machine = EilenbergMachine.get_Eilenberg_machine(get_data_from_json_file("reg_expr.json"))
+    for machine in [e_machine, determinize(e_machine)]:
+        matcher = StreamMatcher(machine)
+        matcher.feed("abbd")
+        saved = matcher.snapshot()
+        matcher.feed(b"deaa")
+        print(matcher.is_accepting())  # True
+        matcher.restore(saved)
+        matcher.feed(memoryview(b"dea"))
+        matcher.feed("c")
+        print(matcher.position, matcher.is_accepting())  # 8 False